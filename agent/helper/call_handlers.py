@@ -174,7 +174,7 @@ async def handle_inbound_call(ctx, agent_name: str, call_state: CallState) -> rt
     
     # Use async database operation for inbound calls
     await insert_call_start_async(
-        ctx.room.name, agent_name, "started", {},
+        call_state.room_name, agent_name, "started", {},
         "Inbound Call",
         participant.identity,
         CALLING_NUMBER,
@@ -32,6 +32,7 @@ logger, transcript_logger = setup_logging()
 OUTBOUND_AGENT_NAME = "Mysyara Outbound Agent"
 INBOUND_AGENT_NAME = "Mysyara Inbound Agent"
 CALLING_NUMBER = 00000000000
+WARM_POOL_CLAIM_TIMEOUT = 600  # Seconds a warm-pool agent waits for a call if the dispatch does not say
 
 # Load configuration
 config = config_manager.config
@@ -158,6 +159,26 @@ async def handle_console_mode(call_state: CallState):
 #         logger.error(f"Error processing job metadata: {e}")
 #         raise
 
+async def wait_for_call_metadata(ctx: JobContext, timeout: float):
+    """Wait until the bridge claims this warm-pool room and writes the call context into room metadata.
+
+    Returns None if no call claims the room within timeout (e.g. the pool shrank or the bridge restarted).
+    """
+    if ctx.room.metadata:
+        return ctx.room.metadata
+
+    claimed = asyncio.get_running_loop().create_future()
+
+    @ctx.room.on("room_metadata_changed")
+    def on_room_metadata_changed(old_metadata: str, metadata: str):
+        if metadata and not claimed.done():
+            claimed.set_result(metadata)
+
+    try:
+        return await asyncio.wait_for(claimed, timeout)
+    except asyncio.TimeoutError:
+        return None
+
 async def parse_job_metadata(ctx: JobContext):
     """Parse and validate job metadata"""
     try:
@@ -178,6 +199,16 @@ async def parse_job_metadata(ctx: JobContext):
             metadata = json.loads(ctx.job.metadata)
             logger.info(f"Parsed metadata: {metadata}")
             
+            # Warm-pool dispatch: idle until a call claims the room, then use the call's context
+            if metadata.get("warm_pool"):
+                timeout = metadata.get("empty_timeout", WARM_POOL_CLAIM_TIMEOUT)
+                logger.info(f"Warm-pool agent waiting up to {timeout}s for call context")
+                call_metadata = await wait_for_call_metadata(ctx, timeout)
+                if call_metadata is None:
+                    return None
+                metadata = json.loads(call_metadata)
+                logger.info(f"Claimed by call, metadata: {metadata}")
+            
             # Check if this is an inbound call with metadata
             if metadata.get("call_type") == "inbound" or metadata.get("direction") == "inbound":
                 logger.info("Handling inbound call")
@@ -217,19 +248,23 @@ async def handle_entrypoint(ctx: JobContext):
     """Handle the main entrypoint logic"""
     await ctx.connect()
     
-    # Initialize call state
-    call_state = CallState()
-    call_state.room_name = ctx.room.name
-    
     task_refs = {"idle_watcher": None}
 
     # Parse job metadata
     job_data = await parse_job_metadata(ctx)
+    if job_data is None:
+        logger.info(f"Warm-pool room {ctx.room.name} was never claimed, ending job")
+        ctx.shutdown()
+        return
     required_fields = job_data["required_fields"]
     agent_name = job_data["agent_name"]
     metadata = job_data["metadata"]
     dial_info = job_data["dial_info"]
     logger.info(f"Job metadata parsed: {job_data}")
+
+    # Initialize call state; a warm-pool room carries the call's own name as room_label
+    call_state = CallState()
+    call_state.room_name = metadata.get("room_label") or ctx.room.name
     # dial_info["phone"] = metadata["phone"]
     # dial_info["phone"] = metadata.get("phone", dial_info.get("phone", "unknown"))
 
@@ -258,7 +293,7 @@ async def handle_entrypoint(ctx: JobContext):
     # Setup transcript persistence if enabled
     if config["store_transcription"]['switch']:
         finish_queue = transcript_manager.setup_transcript_persistence(
-            session, ctx.room.name, config
+            session, call_state.room_name, config
         )
         if finish_queue:
             ctx.add_shutdown_callback(finish_queue)
@@ -294,7 +329,7 @@ async def handle_entrypoint(ctx: JobContext):
     await setup_background_audio(config, ctx.room, session)
 
     # Setup audio recording if enabled
-    await setup_audio_recording(config, ctx.room.name)
+    await setup_audio_recording(config, ctx.room.name, call_state.room_name)
 
     # Setup idle call monitoring if enabled - AFTER session is started
     if config.get("idle_call_hungup", False):
@@ -112,8 +112,8 @@ async def setup_background_audio(config: Dict[str, Any], room, session: AgentSes
         logger.warning(f"Failed to start background audio: {e}")
         return None
 
-async def setup_audio_recording(config: Dict[str, Any], room_name: str):
-    """Setup audio recording if enabled in config"""
+async def setup_audio_recording(config: Dict[str, Any], room_name: str, recording_name: str = None):
+    """Setup audio recording if enabled in config (the file is named recording_name, default the room name)"""
     if not config.get("record_audio", False):
         logger.info("^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^")
         logger.info("Recording is not set")
@@ -130,7 +130,7 @@ async def setup_audio_recording(config: Dict[str, Any], room_name: str):
                 file_outputs=[
                     api.EncodedFileOutput(
                         file_type=api.EncodedFileType.OGG,
-                        filepath=f"{path}/{room_name}.ogg",
+                        filepath=f"{path}/{recording_name or room_name}.ogg",
                         s3=api.S3Upload(
                             access_key=os.getenv("AWS_ACCESS_KEY"),
                             secret=os.getenv("AWS_SECRET_KEY"),
@@ -180,7 +180,7 @@ async def setup_audio_recording(config: Dict[str, Any], room_name: str):
                 file_outputs=[
                     api.EncodedFileOutput(
                         file_type=api.EncodedFileType.OGG,
-                        filepath=f"{path}/{room_name}.ogg",
+                        filepath=f"{path}/{recording_name or room_name}.ogg",
                         azure=api.AzureBlobUpload(
                             account_name=account_name,
                             account_key=account_key,
@@ -483,7 +483,7 @@ async def create_dispatch(fastapi_request: Request, db: Session = Depends(get_da
             "agent_name": model.model_name,
         }
         
-        result = run_livekit_dispatch(
+        result = await run_livekit_dispatch(
             metadata=metadata_,
             contact_number=request_body['contact_number'],
             agent_name=model.model_name,
@@ -491,12 +491,8 @@ async def create_dispatch(fastapi_request: Request, db: Session = Depends(get_da
         if not result["success"]:
             raise HTTPException(status_code=500, detail=result["error"])
         
-        # Parse the result output to extract the room ID
-        
-        
-        # Extract room ID
-        room_match = re.search(r'room:"(.*?)"', result["output"])
-        room_id = room_match.group(1) if room_match else None
+        # Room the agent was dispatched into
+        room_id = result["room"]
         
         # Create a new call record with proper field mapping
         new_call = models.Call(
@@ -16,17 +16,35 @@ import logging
 import uuid
 import os
 import base64
-from livekit import rtc, api
-import subprocess
+import binascii
+from livekit import rtc
+from utils.metrics import (LatencyHistogram, render_counter, render_gauge, render_histogram,
+                           render_histogram_family)
+from utils.livekit_client import (get_livekit_api, close_livekit_api, create_agent_dispatch,
+                                  create_room as create_livekit_room, delete_room as delete_livekit_room,
+                                  update_room_metadata as update_livekit_room_metadata,
+                                  get_participant_token, control_plane_counters,
+                                  dispatch_latency, room_create_latency)
 import time
 import audioop
 from aiohttp import web
-from collections import defaultdict, deque
+from collections import OrderedDict, defaultdict, deque
 import threading
 from concurrent.futures import ThreadPoolExecutor
-import wave
 import struct
-import array
+import signal
+import zlib
+import multiprocessing
+import mmap
+import select
+import socket
+import subprocess
+import hashlib
+import hmac
+import math
+import sys
+import traceback
+import numpy as np
 
 # Environment variables
 LIVEKIT_URL = os.environ.get("LIVEKIT_URL", "wss://setupforretell-hk7yl5xf.livekit.cloud")
@@ -41,21 +59,93 @@ agent_name = "Mysyara Agent"
 BACKGROUND_AUDIO_FILE = "bg.mp3"  # or bg.wav
 BACKGROUND_VOLUME_RATIO = 0.15  # 15% of agent volume
 ENABLE_BACKGROUND_AUDIO = True
+BACKGROUND_RING_PAD_SAMPLES = 800  # 100ms wrap padding so chunks are contiguous zero-copy slices
+# Named background beds selectable per call by the context's BACKGROUND_BED_CONTEXT_KEY field ("none"
+# turns background off). "default" is BACKGROUND_AUDIO_FILE; more come from
+# MAQSAM_BACKGROUND_BEDS="office=office.mp3,cafe=cafe.wav"
+DEFAULT_BACKGROUND_BED = "default"
+BACKGROUND_BED_CONTEXT_KEY = "background_bed"
+BACKGROUND_BEDS = {DEFAULT_BACKGROUND_BED: BACKGROUND_AUDIO_FILE, **{
+    name.strip(): path.strip()
+    for name, _, path in (entry.partition("=") for entry in os.environ.get("MAQSAM_BACKGROUND_BEDS", "").split(","))
+    if name.strip() and path.strip()
+}}
+BACKGROUND_CACHE_DIR = os.environ.get("MAQSAM_BACKGROUND_CACHE_DIR", ".background_cache")  # Converted loops, keyed by source hash
+BACKGROUND_CONVERT_TIMEOUT = 30        # Seconds allowed for one ffmpeg conversion
+BACKGROUND_CACHE_POLL_INTERVAL = 2     # Workers other than 0 poll for the loop worker 0 is converting...
+BACKGROUND_CACHE_POLL_TIMEOUT = 120    # ...for at most this long
 
 # Maqsam Authentication
 VALID_AUTH_TOKEN = os.environ.get("MAQSAM_AUTH_TOKEN", "maqsam_secure_token_123")
 
 # ULTRA LOW LATENCY OPTIMIZATIONS
-AUDIO_FRAME_SIZE = 80   # 10ms at 8kHz (80 samples) - reduced from 160
-MAX_BUFFER_SIZE = 1     # Minimal buffering - reduced from 3
+MAX_BUFFER_SIZE = 8     # Inbound ring capacity (frames); the pump wakes on data, so this only bounds bursts
+OUTPUT_FRAME_MS = 20    # Outbound clock period / aggregation - one message per tick (20, 40 or 60ms)
+OUTPUT_FRAME_SAMPLES = TELEPHONY_SAMPLE_RATE * OUTPUT_FRAME_MS // 1000
+OUTPUT_CLOCK_RESYNC_FRAMES = 5    # Skip ahead instead of bursting if the loop stalls longer than this
+AGENT_AUDIO_BUFFER_MAX_MS = 400   # Cap on agent audio queued ahead of the output clock
+JITTER_BUFFER_MIN_MS = 20         # Adaptive agent playout depth bounds
+JITTER_BUFFER_MAX_MS = 200
+JITTER_BUFFER_JITTER_FACTOR = 3   # Target depth = factor x observed agent interarrival jitter
+JITTER_BUFFER_OVERRUN_MS = 100    # Drop frames when this far above the target depth
+JITTER_BUFFER_IDLE_RESET = 0.5    # Seconds without agent audio that start a new talkspurt
+BARGE_IN_RMS_THRESHOLD = 1200     # Inbound energy VAD: minimum RMS (16-bit) for caller speech...
+BARGE_IN_NOISE_RATIO = 4          # ...and this many times the tracked line noise floor
+BARGE_IN_MIN_SPEECH_MS = 60       # Consecutive caller speech over agent audio that counts as barge-in
+BARGE_IN_SUPPRESS_MS = 300        # After a flush, agent audio still in flight is discarded this long
+AGENT_AUDIBLE_RMS = 300           # Agent frames above this RMS count as the agent talking (not silence)
+AGENT_AUDIBLE_HOLD_MS = 200       # ...and keep barge-in armed this long after the last one
+SEND_QUEUE_MAX_FRAMES = 10        # Outbound audio frames queued per call (200ms) before dropping
+SEND_COALESCE_MAX_FRAMES = 5      # When behind, up to this many queued frames go out as one message
+AGENT_STATE_ATTRIBUTE = "lk.agent.state"  # Published by LiveKit agents: listening/thinking/speaking
+# While the agent is quiet: "continuous" sends every frame as usual; "aggregate" sends background
+# IDLE_AGGREGATE_FRAMES at a time (nothing at all without background); "comfort_noise" is aggregate
+# plus locally generated noise when there is no background
+IDLE_OUTPUT_MODE = os.environ.get("MAQSAM_IDLE_OUTPUT_MODE", "continuous")
+IDLE_OUTPUT_AFTER_MS = 500        # Agent quiet this long (and not thinking/speaking) before idle output starts
+IDLE_AGGREGATE_FRAMES = 3         # Frames per idle message; the clock also wakes this many times less often
+COMFORT_NOISE_RMS = 30            # Comfort noise level (16-bit RMS, about -60 dBov)
+COMFORT_NOISE_LOOP_SECONDS = 2
 PROCESS_POOL_SIZE = 4   # For parallel audio processing
 ENABLE_AUDIO_OPTIMIZATION = True
+INLINE_CONVERSION_MAX_BYTES = 960  # Up to 120ms of μ-law converts inline; only bigger batches go to the pool
 USE_FASTER_RESAMPLING = True
+INBOUND_FRAME_MS = 20            # Caller audio reaches LiveKit in whole frames of this size (10 or 20ms)
+USE_POLYPHASE_UPSAMPLER = False  # Integer-ratio (x6) FIR upsampler for 8k->48k instead of rtc.AudioResampler
+POLYPHASE_TAPS_PER_PHASE = 8
 
 # Production settings
 MAX_CONNECTIONS = 500
-RATE_LIMIT_PER_IP = 10
-RATE_LIMIT_WINDOW = 60
+RATE_LIMIT_PER_IP = 10   # Token bucket per IP: bursts of this many connections...
+RATE_LIMIT_WINDOW = 60   # ...refilled at RATE_LIMIT_PER_IP per this many seconds
+RATE_LIMIT_MAX_IPS = 4096       # Per-IP buckets kept in a worker; the least recently seen is dropped beyond this
+RATE_LIMIT_EVICT_INTERVAL = 30  # Seconds between sweeps of buckets that have refilled completely
+BRIDGE_WORKERS = int(os.environ.get("MAQSAM_BRIDGE_WORKERS", "1"))  # >1 forks workers sharing 8765 via SO_REUSEPORT
+SHARED_RATE_LIMIT_SLOTS = 4096  # Fixed-size per-IP token-bucket table shared by workers
+METRICS_PUBLISH_INTERVAL = 1            # Seconds between a worker's metrics reports to the stats process
+METRICS_REPORT_SLOT_BYTES = 256 * 1024  # Shared memory per worker for its JSON metrics report
+DRAIN_TIMEOUT = float(os.environ.get("MAQSAM_DRAIN_TIMEOUT", "3600"))  # Longest a draining process waits for live calls
+DRAIN_LOG_INTERVAL = 30          # Seconds between "still draining" log lines
+HOT_RESTART_READY_TIMEOUT = 60   # Seconds a successor gets to start serving before a hot restart is abandoned
+SUPERVISOR_POLL_INTERVAL = 0.1   # Seconds between the supervisor's checks for exited children and restart requests
+ADMIN_TOKEN = os.environ.get("MAQSAM_ADMIN_TOKEN")  # /admin/drain and /admin/restart exist only when this is set
+
+# Warm room pool: pre-connected rooms with an idle agent, claimed by incoming calls (per worker)
+WARM_ROOM_POOL_MIN = int(os.environ.get("MAQSAM_WARM_ROOM_POOL", "0"))  # 0 disables the pool
+WARM_ROOM_POOL_MAX = int(os.environ.get("MAQSAM_WARM_ROOM_POOL_MAX", "10"))
+WARM_ROOM_MAX_AGE = 600            # Seconds an unclaimed room is kept before it is recycled
+WARM_POOL_ARRIVAL_WINDOW = 300     # Seconds of call arrivals used to estimate the arrival rate
+WARM_POOL_CHECK_INTERVAL = 5       # Seconds between pool size checks when no call arrives
+
+# Event-loop lag monitor: sampled every few ms; a watchdog thread captures the stack of slow callbacks
+LOOP_LAG_SAMPLE_INTERVAL = 0.005
+LOOP_LAG_WINDOW = 1.0               # Admission control looks at the worst lag over this many seconds
+SLOW_CALLBACK_MS = 50               # A loop stall this long is logged with the blocking task and stack
+LOOP_LAG_REJECT_MS = float(os.environ.get("MAQSAM_LOOP_LAG_REJECT_MS", "200"))  # Refuse new calls above this (0 disables)
+
+# Call-setup waterfall: set MAQSAM_CALL_TIMELINE_LOG to a path to append finished per-call timelines
+# as JSON lines. Disabled by default; the file is not rotated, so point it at logrotate-managed storage
+CALL_TIMELINE_LOG = os.environ.get("MAQSAM_CALL_TIMELINE_LOG", "")
 
 # Configure logging with less verbose output for production
 logging.basicConfig(
@@ -67,13 +157,86 @@ logger = logging.getLogger(__name__)
 # Global thread pool for audio processing
 audio_processor_pool = ThreadPoolExecutor(max_workers=PROCESS_POOL_SIZE)
 
-# Global background audio manager - load once at startup
-global_background_audio_manager = None
+# Background beds by name, loaded once at startup (cold ones become ready once converted)
+background_beds = {}
+
+# Cross-worker counters when running under the multi-process supervisor (None in single-process mode)
+shared_state = None
+
+# Pre-connected room pool (None unless MAQSAM_WARM_ROOM_POOL > 0)
+warm_room_pool = None
+
+# Drain / hot restart (SIGTERM or POST /admin/drain drains; SIGUSR2 or POST /admin/restart hands off first)
+maqsam_server = None      # websockets Server of this process
+http_listen_socket = None
+http_site = None
+draining = False
+shutdown_event = asyncio.Event()  # Set once drained; the WebSocket server then returns
 
 # Connection tracking
 active_connections = 0
+active_handlers = set()  # Live handlers, for aggregate per-call metrics
 connections_per_ip = defaultdict(int)
-connection_attempts = defaultdict(lambda: deque())
+
+# Process-wide metrics for /metrics. Only the event loop writes them (plain ints and
+# fixed-bucket histograms, no locks); a scrape just reads them.
+mix_time_histogram = LatencyHistogram("mix_time", "Per-frame outbound mix/encode time",
+                                      buckets_ms=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5))
+loop_lag_histogram = LatencyHistogram("event_loop_lag", "Event-loop scheduling lag",
+                                      buckets_ms=(0.5, 1, 2, 5, 10, 20, 50, 100, 250, 500, 1000))
+call_jitter_histogram = LatencyHistogram("call_inbound_jitter", "Final inbound interarrival jitter per call",
+                                         buckets_ms=(1, 2, 5, 10, 20, 40, 80, 160, 320))
+send_blocked_histogram = LatencyHistogram("send_blocked", "Time a WebSocket send waited on the peer",
+                                          buckets_ms=(0.1, 0.5, 1, 5, 10, 20, 50, 100, 250, 1000))
+barge_in_histograms = {
+    source: LatencyHistogram(f"barge_in_{source}", "Caller speech onset to agent audio flushed",
+                             buckets_ms=(25, 50, 75, 100, 150, 200, 300, 500, 1000))
+    for source in ("vad", "agent_state")
+}
+finished_call_totals = defaultdict(int)  # Counters of calls that already ended
+
+# Prebuilt response.stream template - the base64 payload is spliced in, so json.dumps never runs per frame.
+# Byte-identical to json.dumps({"type": "response.stream", "data": {"audio": ...}}).
+RESPONSE_STREAM_PREFIX = b'{"type": "response.stream", "data": {"audio": "'
+RESPONSE_STREAM_SUFFIX = b'"}}'
+
+def encode_response_stream(mulaw_data) -> bytes:
+    """Build a response.stream message for μ-law audio without building a dict"""
+    return RESPONSE_STREAM_PREFIX + binascii.b2a_base64(mulaw_data, newline=False) + RESPONSE_STREAM_SUFFIX
+
+# Inbound fast path: the exact audio.input layouts Maqsam sends (spaced and compact JSON).
+# Audio frames matching one skip json.loads and dict dispatch; everything else takes the JSON path.
+AUDIO_INPUT_PREFIXES = (
+    '{"type": "audio.input", "data": {"audio": "',
+    '{"type":"audio.input","data":{"audio":"',
+)
+AUDIO_INPUT_SUFFIXES = ('"}}', '"}}\n')
+AUDIO_INPUT_BYTES_PREFIXES = tuple(prefix.encode() for prefix in AUDIO_INPUT_PREFIXES)
+AUDIO_INPUT_BYTES_SUFFIXES = tuple(suffix.encode() for suffix in AUDIO_INPUT_SUFFIXES)
+
+def parse_audio_input_fast(message):
+    """Return the decoded μ-law payload of an audio.input message, or None if it needs the generic path"""
+    is_text = isinstance(message, str)
+    prefixes = AUDIO_INPUT_PREFIXES if is_text else AUDIO_INPUT_BYTES_PREFIXES
+    suffixes = AUDIO_INPUT_SUFFIXES if is_text else AUDIO_INPUT_BYTES_SUFFIXES
+    
+    if not message.endswith(suffixes):
+        return None
+    for prefix in prefixes:
+        if message.startswith(prefix):
+            break
+    else:
+        return None
+    
+    start = len(prefix)
+    end = message.rindex('"' if is_text else b'"')
+    payload = message[start:end] if is_text else memoryview(message)[start:end]
+    
+    try:
+        # Strict mode rejects anything that is not pure base64 (e.g. extra keys), which falls back to JSON
+        return binascii.a2b_base64(payload, strict_mode=True)
+    except binascii.Error:
+        return None
 
 def validate_auth_token(token: str) -> bool:
     """Validate Maqsam authentication token"""
@@ -81,6 +244,13 @@ def validate_auth_token(token: str) -> bool:
         return False
     return True
 
+def validate_admin_token(authorization: str) -> bool:
+    """Validate an admin request's Authorization header ("Bearer <token>" or the bare token)"""
+    if not ADMIN_TOKEN or not authorization:
+        return False
+    token = authorization.removeprefix("Bearer ").strip()
+    return hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode())
+
 def create_room_from_context(context: dict) -> str:
     """Create room ID from Maqsam context with enhanced error handling"""
     try:
@@ -103,211 +273,806 @@ def create_room_from_context(context: dict) -> str:
         return fallback_room
 
 def process_mulaw_to_pcm(mulaw_data):
-    """Process μ-law conversion in thread pool for better performance"""
+    """Convert μ-law to 16-bit PCM"""
     try:
         return audioop.ulaw2lin(mulaw_data, 2)
     except Exception as e:
         logger.error(f"❌ μ-law conversion error: {e}")
         return None
 
-def process_pcm_to_mulaw(pcm_data):
-    """Process PCM to μ-law conversion in thread pool"""
-    try:
-        return audioop.lin2ulaw(pcm_data, 2)
-    except Exception as e:
-        logger.error(f"❌ PCM to μ-law conversion error: {e}")
-        return None
+_comfort_noise_loop = None
+
+def comfort_noise_chunk(position, num_samples):
+    """μ-law comfort noise starting at `position` in a shared loop built once per process"""
+    global _comfort_noise_loop
+    if _comfort_noise_loop is None:
+        loop_samples = TELEPHONY_SAMPLE_RATE * COMFORT_NOISE_LOOP_SECONDS
+        noise = os.urandom(loop_samples * 2)
+        noise = audioop.mul(noise, 2, COMFORT_NOISE_RMS / max(1, audioop.rms(noise, 2)))
+        mulaw = audioop.lin2ulaw(noise, 2)
+        # Padded with its own start so any chunk up to one second is a contiguous slice
+        _comfort_noise_loop = memoryview(mulaw + mulaw[:TELEPHONY_SAMPLE_RATE])
+    
+    loop_samples = len(_comfort_noise_loop) - TELEPHONY_SAMPLE_RATE
+    start = position % loop_samples
+    return _comfort_noise_loop[start:start + num_samples]
 
-def mix_audio_samples(agent_mulaw, bg_mulaw, bg_volume_ratio=BACKGROUND_VOLUME_RATIO):
-    """Mix agent audio with background audio at μ-law level"""
+def mix_with_attenuated_background(agent_pcm, bg_pcm):
+    """Mix agent PCM with background PCM that is already attenuated and the same length, to μ-law"""
     try:
-        if not agent_mulaw or not bg_mulaw:
-            return agent_mulaw or bg_mulaw
-        
-        # Convert both to PCM for mixing
-        agent_pcm = audioop.ulaw2lin(agent_mulaw, 2)
-        bg_pcm = audioop.ulaw2lin(bg_mulaw, 2)
-        
-        # Ensure same length (pad or truncate background)
-        agent_len = len(agent_pcm)
-        bg_len = len(bg_pcm)
-        
-        if bg_len < agent_len:
-            # Repeat background if too short
-            repetitions = (agent_len // bg_len) + 1
-            bg_pcm = (bg_pcm * repetitions)[:agent_len]
-        elif bg_len > agent_len:
-            # Truncate background if too long
-            bg_pcm = bg_pcm[:agent_len]
-        
-        # Convert to sample arrays for mixing
-        agent_samples = array.array('h')
-        bg_samples = array.array('h')
-        
-        agent_samples.frombytes(agent_pcm)
-        bg_samples.frombytes(bg_pcm)
-        
-        # Mix samples with volume control
-        mixed_samples = array.array('h')
-        for i in range(len(agent_samples)):
-            # Mix: agent at full volume + background at reduced volume
-            agent_sample = agent_samples[i]
-            bg_sample = int(bg_samples[i] * bg_volume_ratio)
-            
-            # Ensure no clipping
-            mixed_sample = agent_sample + bg_sample
-            mixed_sample = max(-32768, min(32767, mixed_sample))
-            mixed_samples.append(mixed_sample)
-        
-        # Convert back to μ-law
-        mixed_pcm = mixed_samples.tobytes()
-        mixed_mulaw = audioop.lin2ulaw(mixed_pcm, 2)
-        
-        return mixed_mulaw
-        
+        return audioop.lin2ulaw(audioop.add(agent_pcm, bg_pcm, 2), 2)
     except Exception as e:
         logger.error(f"❌ Error mixing audio: {e}")
-        return agent_mulaw  # Return agent audio if mixing fails
+        return audioop.lin2ulaw(agent_pcm, 2)  # Return agent audio if mixing fails
 
 class BackgroundAudioManager:
-    """Manages continuous background audio for user"""
+    """One background bed: the converted loop, cached on disk and shared read-only across all calls.
+    
+    The loop is stored in BACKGROUND_CACHE_DIR under the SHA-256 of the source file plus the
+    settings baked into it, and memory-mapped from there, so later starts (and forked workers)
+    share one page-cached copy without running ffmpeg. A cold cache is filled by convert(),
+    which runs ffmpeg as an asyncio subprocess while the bridge is already taking calls.
+    """
     
-    def __init__(self, audio_file_path):
+    def __init__(self, audio_file_path, name=DEFAULT_BACKGROUND_BED):
+        self.name = name
         self.audio_file_path = audio_file_path
-        self.background_audio_data = None
-        self.current_position = 0
-        self.is_running = False
-        self.lock = threading.Lock()
+        self.background_audio_data = None  # Read-only μ-law loop (background-only frames)
+        self.background_pcm = None         # Read-only int16 loop, pre-attenuated by BACKGROUND_VOLUME_RATIO
+        self.loop_samples = 0
+        self._shared_buffer = None
+        self.cache_path = None
+        self.loaded_from_cache = False
+    
+    @property
+    def ready(self):
+        return self.background_audio_data is not None
+    
+    def _cache_key(self):
+        """SHA-256 of the source file and of every setting the cached loop depends on"""
+        digest = hashlib.sha256()
+        with open(self.audio_file_path, 'rb') as source:
+            for block in iter(lambda: source.read(1 << 20), b''):
+                digest.update(block)
+        digest.update(f"{TELEPHONY_SAMPLE_RATE}/{BACKGROUND_VOLUME_RATIO}/{BACKGROUND_RING_PAD_SAMPLES}".encode())
+        return digest.hexdigest()
+    
+    def load_cached(self):
+        """Map this bed's cached loop if there is one; returns whether the bed is ready"""
+        if not os.path.exists(self.audio_file_path):
+            logger.warning(f"⚠️ Background audio file not found: {self.audio_file_path} (bed '{self.name}' disabled)")
+            return False
         
-        logger.info(f"🎵 Initializing background audio manager")
-        self._load_background_audio()
+        try:
+            self.cache_path = os.path.join(BACKGROUND_CACHE_DIR, f"{self._cache_key()}.loop")
+            if not os.path.exists(self.cache_path):
+                logger.info(f"🧊 Background bed '{self.name}' not cached yet, will convert {self.audio_file_path}")
+                return False
+            
+            with open(self.cache_path, 'rb') as cached:
+                self._install(mmap.mmap(cached.fileno(), 0, access=mmap.ACCESS_READ))
+            self.loaded_from_cache = True
+            logger.info(f"✅ Background bed '{self.name}' mapped from cache: {self.loop_samples} samples, "
+                       f"{self.loop_samples / TELEPHONY_SAMPLE_RATE:.1f}s")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Error loading cached background audio '{self.name}': {e}")
+            return False
     
-    def _load_background_audio(self):
-        """Load and convert background audio to telephony format"""
+    async def convert(self):
+        """Convert the source with ffmpeg, write it to the cache and map it; returns whether the bed is ready"""
+        logger.info(f"📂 Converting background audio in the background: {self.audio_file_path}")
         try:
-            if not os.path.exists(self.audio_file_path):
-                logger.warning(f"⚠️ Background audio file not found: {self.audio_file_path}")
-                logger.warning("🔇 Background audio disabled")
-                return
+            process = await asyncio.create_subprocess_exec(
+                'ffmpeg', '-v', 'error', '-i', self.audio_file_path,
+                '-ar', str(TELEPHONY_SAMPLE_RATE), '-ac', '1', '-f', 's16le', '-',
+                stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+            try:
+                pcm_data, stderr = await asyncio.wait_for(process.communicate(), BACKGROUND_CONVERT_TIMEOUT)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                logger.error("❌ FFmpeg conversion timed out")
+                return False
             
-            logger.info(f"📂 Loading background audio: {self.audio_file_path}")
+            if process.returncode != 0:
+                logger.error(f"❌ FFmpeg conversion failed: {stderr.decode(errors='replace')}")
+                return False
             
-            # Use ffmpeg to convert to telephony format
-            import tempfile
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
-                temp_path = temp_file.name
+            loop_data = self._build_loop(pcm_data)
+            if loop_data is None:
+                return False
+            
+            shared = await asyncio.get_running_loop().run_in_executor(None, self._write_cache, loop_data)
+            self._install(shared)
+            logger.info(f"✅ Background bed '{self.name}' converted: {self.loop_samples} samples, "
+                       f"{self.loop_samples / TELEPHONY_SAMPLE_RATE:.1f}s ({len(loop_data)} bytes shared)")
+            return True
             
-            try:
-                # Convert to 8kHz mono PCM using ffmpeg
-                result = subprocess.run([
-                    'ffmpeg', '-i', self.audio_file_path,
-                    '-ar', str(TELEPHONY_SAMPLE_RATE),
-                    '-ac', '1',
-                    '-f', 'wav',
-                    '-y',  # Overwrite output file
-                    temp_path
-                ], capture_output=True, text=True, timeout=30)
-                
-                if result.returncode != 0:
-                    logger.error(f"❌ FFmpeg conversion failed: {result.stderr}")
-                    return
-                
-                # Read the converted WAV file
-                with wave.open(temp_path, 'rb') as wav_file:
-                    if wav_file.getnchannels() != 1:
-                        logger.error("❌ Background audio must be mono")
-                        return
-                    
-                    if wav_file.getframerate() != TELEPHONY_SAMPLE_RATE:
-                        logger.error(f"❌ Background audio must be {TELEPHONY_SAMPLE_RATE}Hz")
-                        return
-                    
-                    # Read PCM data
-                    pcm_data = wav_file.readframes(wav_file.getnframes())
-                    
-                    # Convert PCM to μ-law for telephony
-                    self.background_audio_data = audioop.lin2ulaw(pcm_data, 2)
-                    
-                    duration = len(pcm_data) / (2 * TELEPHONY_SAMPLE_RATE)  # 2 bytes per sample
-                    logger.info(f"✅ Background audio loaded: {len(self.background_audio_data)} bytes, {duration:.1f}s")
-                
-            finally:
-                # Clean up temp file
-                try:
-                    os.unlink(temp_path)
-                except:
-                    pass
-                    
-        except subprocess.TimeoutExpired:
-            logger.error("❌ FFmpeg conversion timed out")
         except FileNotFoundError:
             logger.error("❌ FFmpeg not found. Please install ffmpeg")
             logger.error("   Ubuntu/Debian: sudo apt install ffmpeg")
             logger.error("   macOS: brew install ffmpeg")
         except Exception as e:
-            logger.error(f"❌ Error loading background audio: {e}")
+            logger.error(f"❌ Error loading background audio '{self.name}': {e}")
+        return False
     
-    def get_audio_chunk(self, chunk_size):
-        """Get a chunk of background audio data"""
-        if not self.background_audio_data:
+    async def wait_for_cache(self):
+        """Poll for a cache file another worker is converting, then map it"""
+        deadline = time.monotonic() + BACKGROUND_CACHE_POLL_TIMEOUT
+        while time.monotonic() < deadline:
+            await asyncio.sleep(BACKGROUND_CACHE_POLL_INTERVAL)
+            if self.cache_path and os.path.exists(self.cache_path):
+                return self.load_cached()
+        logger.warning(f"⚠️ Background bed '{self.name}' was not converted within {BACKGROUND_CACHE_POLL_TIMEOUT}s")
+        return False
+    
+    def _build_loop(self, pcm_data):
+        """Decode and attenuate the loop once into the cached layout.
+        
+        Layout: [attenuated int16 PCM | pad][μ-law | pad]. The pad repeats the start of
+        the loop so any chunk up to BACKGROUND_RING_PAD_SAMPLES is one contiguous slice.
+        """
+        loop_samples = len(pcm_data) // 2
+        if loop_samples == 0:
+            logger.error(f"❌ Background audio '{self.name}' is empty")
             return None
         
-        with self.lock:
-            data_len = len(self.background_audio_data)
-            
-            if self.current_position >= data_len:
-                self.current_position = 0  # Loop back to start
-            
-            # Get chunk, handle wrap-around
-            if self.current_position + chunk_size <= data_len:
-                chunk = self.background_audio_data[self.current_position:self.current_position + chunk_size]
-                self.current_position += chunk_size
-            else:
-                # Need to wrap around
-                first_part = self.background_audio_data[self.current_position:]
-                remaining = chunk_size - len(first_part)
-                second_part = self.background_audio_data[:remaining]
-                chunk = first_part + second_part
-                self.current_position = remaining
-            
-            return chunk
+        pcm_data = pcm_data[:loop_samples * 2]
+        padded_samples = loop_samples + BACKGROUND_RING_PAD_SAMPLES
+        repetitions = padded_samples // loop_samples + 1
+        
+        attenuated_pcm = audioop.mul(pcm_data, 2, BACKGROUND_VOLUME_RATIO)
+        padded_pcm = (attenuated_pcm * repetitions)[:padded_samples * 2]
+        padded_mulaw = (audioop.lin2ulaw(pcm_data, 2) * repetitions)[:padded_samples]
+        return padded_pcm + padded_mulaw
+    
+    def _write_cache(self, loop_data):
+        """Write the loop to the cache atomically and map it; falls back to an anonymous mapping.
+        
+        Either way the mapping is MAP_SHARED, so forked workers inherit a single copy.
+        """
+        try:
+            os.makedirs(BACKGROUND_CACHE_DIR, exist_ok=True)
+            temp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+            with open(temp_path, 'wb') as cached:
+                cached.write(loop_data)
+            os.replace(temp_path, self.cache_path)
+            with open(self.cache_path, 'rb') as cached:
+                return mmap.mmap(cached.fileno(), 0, access=mmap.ACCESS_READ)
+        except OSError as e:
+            logger.warning(f"⚠️ Could not cache background audio in {BACKGROUND_CACHE_DIR}: {e}")
+            shared = mmap.mmap(-1, len(loop_data))
+            shared[:] = loop_data
+            return shared
+    
+    def _install(self, shared):
+        """Point the read views at a mapped loop laid out as in _build_loop"""
+        padded_samples = len(shared) // 3
+        view = memoryview(shared).toreadonly()
+        self._shared_buffer = shared
+        self.loop_samples = padded_samples - BACKGROUND_RING_PAD_SAMPLES
+        self.background_pcm = view[:padded_samples * 2]
+        self.background_audio_data = view[padded_samples * 2:]
+    
+    def read_audio(self, start, chunk_size):
+        """Read μ-law loop audio starting at sample offset `start` (memoryview into the shared loop)"""
+        return self._ring_slice(self.background_audio_data, 1, start, chunk_size)
+    
+    def read_pcm(self, start, num_samples):
+        """Read pre-attenuated loop PCM starting at sample offset `start` (memoryview into the shared loop)"""
+        return self._ring_slice(self.background_pcm, 2, start, num_samples)
+    
+    def _ring_slice(self, ring, bytes_per_sample, start, num_samples):
+        """Zero-copy slice of a padded ring; only chunks longer than the pad are copied"""
+        if num_samples <= BACKGROUND_RING_PAD_SAMPLES:
+            return ring[start * bytes_per_sample:(start + num_samples) * bytes_per_sample]
+        
+        chunk = bytearray()
+        while len(chunk) < num_samples * bytes_per_sample:
+            take = min(num_samples - len(chunk) // bytes_per_sample, self.loop_samples - start)
+            chunk += ring[start * bytes_per_sample:(start + take) * bytes_per_sample]
+            start = 0
+        return bytes(chunk)
+    
+    def create_cursor(self):
+        """Create an independent playhead for one call"""
+        return BackgroundAudioCursor(self)
+
+class BackgroundAudioCursor:
+    """Per-call playhead over the shared background loop.
+    
+    Owned by a single handler on the event loop, so it needs no lock and other
+    calls' reads never move it.
+    """
+    
+    def __init__(self, manager):
+        self.manager = manager
+        self.loop_samples = manager.loop_samples
+        self.position = 0
+        self.is_running = False
+    
+    def _advance(self, num_samples):
+        """Advance the playhead with wraparound and return the offset to read from"""
+        start = self.position
+        self.position = (start + num_samples) % self.loop_samples
+        return start
+    
+    def get_audio_chunk(self, chunk_size):
+        """Get the next chunk of background μ-law audio"""
+        return self.manager.read_audio(self._advance(chunk_size), chunk_size)
+    
+    def get_pcm_chunk(self, num_samples):
+        """Get the next chunk of pre-attenuated background PCM"""
+        return self.manager.read_pcm(self._advance(num_samples), num_samples)
     
     def start(self):
-        """Start background audio"""
+        """Start background audio for this call"""
         self.is_running = True
         logger.info("🎵 Background audio started")
     
     def stop(self):
-        """Stop background audio"""
+        """Stop background audio for this call"""
         self.is_running = False
         logger.info("🔇 Background audio stopped")
 
 class OptimizedAudioBuffer:
-    """Ultra low-latency audio buffer with minimal buffering"""
+    """Bounded drop-oldest frame ring for one event loop; consumers await data instead of polling"""
     
     def __init__(self, max_size=MAX_BUFFER_SIZE):
         self.buffer = deque(maxlen=max_size)
-        self.lock = threading.Lock()
+        self.data_available = asyncio.Event()
         self.dropped_frames = 0
+        self.closed = False
     
     def push(self, data):
-        """Push data with overflow protection"""
-        with self.lock:
-            if len(self.buffer) >= self.buffer.maxlen:
-                self.buffer.popleft()  # Drop oldest frame
-                self.dropped_frames += 1
-            self.buffer.append(data)
+        """Push data, dropping the oldest frame on overflow"""
+        if len(self.buffer) == self.buffer.maxlen:
+            self.dropped_frames += 1  # deque(maxlen) evicts the oldest on append
+        self.buffer.append(data)
+        self.data_available.set()
     
     def pop_all(self):
         """Pop all available data"""
-        with self.lock:
-            data = list(self.buffer)
-            self.buffer.clear()
-            return data
+        data = list(self.buffer)
+        self.buffer.clear()
+        self.data_available.clear()
+        return data
+    
+    async def wait_pop_all(self):
+        """Wait until data is available, then pop all of it (empty list once closed)"""
+        while not self.buffer:
+            if self.closed:
+                return []
+            await self.data_available.wait()
+        return self.pop_all()
+    
+    def close(self):
+        """Wake any waiter so it can exit"""
+        self.closed = True
+        self.data_available.set()
     
     def size(self):
-        with self.lock:
-            return len(self.buffer)
+        return len(self.buffer)
+
+class InterArrivalJitter:
+    """RFC 3550-style interarrival jitter: EWMA (gain 1/16) of |arrival spacing - media duration|"""
+    
+    def __init__(self, sample_rate=TELEPHONY_SAMPLE_RATE):
+        self.sample_rate = sample_rate
+        self.last_arrival = None
+        self.last_duration = 0.0
+        self.jitter = 0.0  # Seconds
+    
+    def observe(self, num_samples):
+        now = time.monotonic()
+        if self.last_arrival is not None:
+            deviation = abs((now - self.last_arrival) - self.last_duration)
+            self.jitter += (deviation - self.jitter) / 16
+        self.last_arrival = now
+        self.last_duration = num_samples / self.sample_rate
+
+class AgentAudioJitterBuffer:
+    """Adaptive playout buffer for agent PCM between the LiveKit stream and the output clock.
+    
+    The target depth follows the observed interarrival jitter of agent frames
+    (JITTER_BUFFER_JITTER_FACTOR x jitter, within [JITTER_BUFFER_MIN_MS, JITTER_BUFFER_MAX_MS]).
+    Each talkspurt is held until the target depth is buffered; an underrun (stream active
+    but buffer empty) returns None so the clock sends background only, and re-buffers.
+    Above target + JITTER_BUFFER_OVERRUN_MS one frame is dropped per tick until it catches up.
+    
+    Storage is a ring preallocated once per call: pushes copy straight from the resampled
+    frame into it and pops hand out a memoryview, so the steady state allocates no buffers.
+    """
+    
+    def __init__(self, max_ms=AGENT_AUDIO_BUFFER_MAX_MS):
+        self.max_bytes = TELEPHONY_SAMPLE_RATE * max_ms // 1000 * 2
+        self.ring = bytearray(self.max_bytes)
+        self.ring_view = memoryview(self.ring)
+        self.read_pos = 0
+        self.size = 0
+        self.frame_scratch = memoryview(bytearray(OUTPUT_FRAME_SAMPLES * 2))  # Frames that wrap the ring end
+        self.last_push_time = 0.0
+        self.arrival_jitter = InterArrivalJitter()
+        self.target_ms = JITTER_BUFFER_MIN_MS
+        self.playing = False       # False while (re)buffering a talkspurt up to the target depth
+        self.dropped_bytes = 0     # Trimmed at the hard cap
+        self.overrun_frames = 0    # Dropped to pull the depth back towards the target
+        self.underruns = 0
+    
+    def push(self, pcm_data):
+        """Append agent PCM (bytes or a frame's memoryview), update the jitter estimate and drop the oldest audio past the hard cap"""
+        num_bytes = pcm_data.nbytes if isinstance(pcm_data, memoryview) else len(pcm_data)
+        self._observe_arrival(num_bytes // 2)
+        
+        if num_bytes > self.max_bytes:
+            pcm_data = memoryview(pcm_data).cast('B')[num_bytes - self.max_bytes:]
+            self.dropped_bytes += num_bytes - self.max_bytes
+            num_bytes = self.max_bytes
+        overflow = self.size + num_bytes - self.max_bytes
+        if overflow > 0:
+            self._consume(overflow)
+            self.dropped_bytes += overflow
+        
+        write_pos = (self.read_pos + self.size) % self.max_bytes
+        if write_pos + num_bytes <= self.max_bytes:
+            self.ring[write_pos:write_pos + num_bytes] = pcm_data
+        else:
+            pcm = memoryview(pcm_data).cast('B')
+            first = self.max_bytes - write_pos
+            self.ring[write_pos:] = pcm[:first]
+            self.ring[:num_bytes - first] = pcm[first:]
+        self.size += num_bytes
+    
+    def _observe_arrival(self, num_samples):
+        """Update the interarrival jitter estimate and the target depth that follows it"""
+        now = time.monotonic()
+        if now - self.last_push_time > JITTER_BUFFER_IDLE_RESET:
+            self.arrival_jitter.last_arrival = None  # Gap between utterances, not jitter
+        self.arrival_jitter.observe(num_samples)
+        self.last_push_time = now
+        
+        jitter_ms = self.arrival_jitter.jitter * 1000 * JITTER_BUFFER_JITTER_FACTOR
+        self.target_ms = min(JITTER_BUFFER_MAX_MS, max(JITTER_BUFFER_MIN_MS, jitter_ms))
+    
+    def _consume(self, num_bytes):
+        self.read_pos = (self.read_pos + num_bytes) % self.max_bytes
+        self.size -= num_bytes
+    
+    def _read(self, num_bytes, out):
+        """Return the next num_bytes as a view: straight into the ring, or copied into `out` across the wrap"""
+        start = self.read_pos
+        self._consume(num_bytes)
+        if start + num_bytes <= self.max_bytes:
+            return self.ring_view[start:start + num_bytes]
+        first = self.max_bytes - start
+        out[:first] = self.ring_view[start:]
+        out[first:num_bytes] = self.ring_view[:num_bytes - first]
+        return out[:num_bytes]
+    
+    def pop_frame(self, num_samples, idle_after):
+        """Pop one frame of PCM as a memoryview, or None while buffering or on underrun.
+        
+        The view is only valid until the next push, so the caller must consume it in the same tick.
+        Once nothing has been pushed for `idle_after` seconds whatever is left plays out,
+        a trailing partial frame padded with silence, so an utterance's end is not held back.
+        """
+        frame_bytes = num_samples * 2
+        idle = time.monotonic() - self.last_push_time >= idle_after
+        scratch = self.frame_scratch if frame_bytes <= len(self.frame_scratch) else memoryview(bytearray(frame_bytes))
+        
+        if not self.playing:
+            if not self.size or (self.size_ms() < self.target_ms and not idle):
+                return None
+            self.playing = True
+        
+        if self.size >= frame_bytes:
+            if self.size_ms() > self.target_ms + JITTER_BUFFER_OVERRUN_MS and self.size >= 2 * frame_bytes:
+                self._consume(frame_bytes)
+                self.overrun_frames += 1
+            return self._read(frame_bytes, scratch)
+        
+        if self.size and idle:
+            remaining = self.size
+            scratch[:remaining] = self._read(remaining, scratch)
+            scratch[remaining:frame_bytes] = bytes(frame_bytes - remaining)  # Once per utterance
+            self.playing = False
+            return scratch[:frame_bytes]
+        
+        # Stream went quiet (end of utterance) or fell behind the clock
+        if not idle:
+            self.underruns += 1
+        self.playing = False
+        return None
+    
+    def clear(self):
+        self.read_pos = 0
+        self.size = 0
+        self.playing = False
+    
+    def peak_frame_rms(self, frame_bytes=OUTPUT_FRAME_SAMPLES * 2):
+        """Loudest per-frame RMS over what is buffered, so silence around a quiet onset does not average it away"""
+        peak = 0
+        for offset in range(0, self.size, frame_bytes):
+            start = (self.read_pos + offset) % self.max_bytes
+            length = min(frame_bytes, self.size - offset)
+            if start + length <= self.max_bytes:
+                frame = self.ring_view[start:start + length]
+            else:
+                first = self.max_bytes - start
+                self.frame_scratch[:first] = self.ring_view[start:]
+                self.frame_scratch[first:length] = self.ring_view[:length - first]
+                frame = self.frame_scratch[:length]
+            peak = max(peak, audioop.rms(frame, 2))
+        return peak
+    
+    def size_ms(self):
+        return self.size / 2 / TELEPHONY_SAMPLE_RATE * 1000
+
+class OutputClock:
+    """Drift-corrected monotonic ticker that paces one outbound frame per period"""
+    
+    def __init__(self, period_ms=OUTPUT_FRAME_MS):
+        self.period = period_ms / 1000
+        self.next_deadline = None
+        self.ticks = 0
+        self.late_ticks = 0       # Woke more than half a period late
+        self.skipped_ticks = 0    # Dropped to resync after a long stall
+        self.max_error = 0.0
+        self.total_abs_error = 0.0
+    
+    async def wait_next(self):
+        """Sleep until the next tick deadline and record how far off it woke"""
+        now = time.monotonic()
+        if self.next_deadline is None:
+            self.next_deadline = now
+        
+        delay = self.next_deadline - now
+        if delay > 0:
+            await asyncio.sleep(delay)
+            now = time.monotonic()
+        
+        error = now - self.next_deadline
+        self.ticks += 1
+        self.total_abs_error += abs(error)
+        self.max_error = max(self.max_error, error)
+        if error > self.period / 2:
+            self.late_ticks += 1
+        
+        # Deadlines advance by exact periods so sleep overshoot never accumulates
+        self.next_deadline += self.period
+        behind = now - self.next_deadline
+        if behind > OUTPUT_CLOCK_RESYNC_FRAMES * self.period:
+            skipped = int(behind / self.period)
+            self.skipped_ticks += skipped
+            self.next_deadline += skipped * self.period
+    
+    def restart(self):
+        """Start again from the next wait (after a pause) instead of catching up on missed ticks"""
+        self.next_deadline = None
+    
+    def advance(self, periods):
+        """Push the next deadline out by `periods` more periods (this tick's output already covers them)"""
+        self.next_deadline += periods * self.period
+    
+    def metrics(self):
+        """Pacing-error summary in milliseconds"""
+        return {
+            "ticks": self.ticks,
+            "late_ticks": self.late_ticks,
+            "skipped_ticks": self.skipped_ticks,
+            "mean_abs_error_ms": (self.total_abs_error / self.ticks * 1000) if self.ticks else 0.0,
+            "max_error_ms": self.max_error * 1000,
+        }
+
+class OutboundSendQueue:
+    """Bounded per-connection send queue drained by a single writer task.
+    
+    Control messages go out ahead of audio. Audio frames that pile up while the peer is
+    slow are coalesced into one response.stream message (up to SEND_COALESCE_MAX_FRAMES).
+    When the queue is full a background-only frame is dropped first; agent speech is
+    dropped only when there is no background frame left to drop.
+    """
+    
+    def __init__(self, websocket, max_frames=SEND_QUEUE_MAX_FRAMES):
+        self.websocket = websocket
+        self.max_frames = max_frames
+        self.control = deque()
+        self.audio = deque()       # (mulaw_frame, has_agent_audio)
+        self.wakeup = asyncio.Event()
+        self.closed = False
+        self.messages_sent = 0
+        self.frames_sent = 0
+        self.bytes_sent = 0
+        self.coalesced_frames = 0  # Frames that went out inside another frame's message
+        self.dropped_background_frames = 0
+        self.dropped_agent_frames = 0
+        self.peak_depth = 0
+        self.blocked_seconds = 0.0
+        # Reused by every audio message: coalesced μ-law goes into one buffer and is base64-encoded
+        # into a prebuilt [prefix][payload][suffix] message, sent as a view of the used length.
+        self.coalesce_buffer = memoryview(bytearray(SEND_COALESCE_MAX_FRAMES * OUTPUT_FRAME_SAMPLES))
+        max_payload = 4 * -(-len(self.coalesce_buffer) // 3)
+        self.message_buffer = memoryview(bytearray(RESPONSE_STREAM_PREFIX + bytes(max_payload) + RESPONSE_STREAM_SUFFIX))
+        self.message_view = self.message_buffer[:0]  # Frames are all one size, so the sized view is reused
+    
+    def put_audio(self, mulaw_frame, has_agent_audio):
+        if len(self.audio) >= self.max_frames:
+            self._drop_one()
+        self.audio.append((mulaw_frame, has_agent_audio))
+        self.peak_depth = max(self.peak_depth, len(self.audio))
+        self.wakeup.set()
+    
+    def put_control(self, message):
+        self.control.append(message)
+        self.wakeup.set()
+    
+    def flush_agent_audio(self):
+        """Drop queued agent speech (barge-in); background frames stay"""
+        kept = [entry for entry in self.audio if not entry[1]]
+        flushed = len(self.audio) - len(kept)
+        self.audio = deque(kept)
+        return flushed
+    
+    def depth(self):
+        return len(self.audio) + len(self.control)
+    
+    def _drop_one(self):
+        for i, (_, has_agent_audio) in enumerate(self.audio):
+            if not has_agent_audio:
+                del self.audio[i]
+                self.dropped_background_frames += 1
+                return
+        self.audio.popleft()
+        self.dropped_agent_frames += 1
+    
+    def close(self):
+        self.closed = True
+        self.wakeup.set()
+    
+    def _coalesce_audio(self):
+        """Pop up to SEND_COALESCE_MAX_FRAMES queued frames into the reusable coalesce buffer"""
+        if len(self.audio) == 1 or len(self.audio[0][0]) * 2 > len(self.coalesce_buffer):
+            return self.audio.popleft()[0], 1
+        
+        count = 0
+        length = 0
+        while self.audio and count < SEND_COALESCE_MAX_FRAMES:
+            frame = self.audio[0][0]
+            if length + len(frame) > len(self.coalesce_buffer):
+                break
+            self.coalesce_buffer[length:length + len(frame)] = frame
+            self.audio.popleft()
+            length += len(frame)
+            count += 1
+        return self.coalesce_buffer[:length], count
+    
+    def _encode_audio(self, mulaw_data):
+        """response.stream message for mulaw_data, as a view of the reusable message buffer"""
+        payload = binascii.b2a_base64(mulaw_data, newline=False)
+        start = len(RESPONSE_STREAM_PREFIX)
+        end = start + len(payload)
+        if end + len(RESPONSE_STREAM_SUFFIX) > len(self.message_buffer):
+            return encode_response_stream(mulaw_data)
+        self.message_buffer[start:end] = payload
+        self.message_buffer[end:end + len(RESPONSE_STREAM_SUFFIX)] = RESPONSE_STREAM_SUFFIX
+        if len(self.message_view) != end + len(RESPONSE_STREAM_SUFFIX):
+            self.message_view = self.message_buffer[:end + len(RESPONSE_STREAM_SUFFIX)]
+        return self.message_view
+    
+    async def run(self):
+        """Writer task: the only coroutine that sends on this connection"""
+        try:
+            while True:
+                if self.control:
+                    message = self.control.popleft()
+                elif self.audio:
+                    mulaw_data, count = self._coalesce_audio()
+                    message = self._encode_audio(mulaw_data)
+                    self.frames_sent += max(count, len(mulaw_data) // OUTPUT_FRAME_SAMPLES)
+                    self.coalesced_frames += count - 1
+                    self.bytes_sent += len(mulaw_data)
+                elif self.closed:
+                    return
+                else:
+                    self.wakeup.clear()
+                    await self.wakeup.wait()
+                    continue
+                
+                send_start = time.perf_counter()
+                # Audio is a spliced JSON template (a bytes view), sent as a text frame without a str
+                # round-trip. websockets serializes the frame before send() yields, so the buffer is
+                # free to reuse as soon as this returns.
+                await self.websocket.send(message, text=True)
+                blocked = time.perf_counter() - send_start
+                self.blocked_seconds += blocked
+                send_blocked_histogram.observe(blocked * 1000)
+                self.messages_sent += 1
+        except websockets.ConnectionClosed:
+            logger.warning("❌ WebSocket connection closed during send")
+        except Exception as e:
+            logger.error(f"❌ Error sending to Maqsam: {e}")
+    
+    def metrics(self):
+        return {
+            "depth": self.depth(),
+            "peak_depth": self.peak_depth,
+            "coalesced_frames": self.coalesced_frames,
+            "dropped_background_frames": self.dropped_background_frames,
+            "dropped_agent_frames": self.dropped_agent_frames,
+            "blocked_ms": self.blocked_seconds * 1000,
+        }
+
+class BargeInDetector:
+    """Lightweight energy VAD on inbound μ-law, used to catch the caller talking over the agent.
+    
+    A chunk is speech when its RMS clears both BARGE_IN_RMS_THRESHOLD and BARGE_IN_NOISE_RATIO x
+    the line's noise floor (tracked from non-speech chunks). BARGE_IN_MIN_SPEECH_MS of consecutive
+    speech is an onset; process() reports each onset once.
+    """
+    
+    def __init__(self):
+        self.noise_floor = 0.0
+        self.speech_ms = 0.0
+        self.speech_started_at = None  # Arrival of the first chunk of the current speech run
+        self.last_speech_at = 0.0
+    
+    def process(self, mulaw_data):
+        rms = audioop.rms(audioop.ulaw2lin(mulaw_data, 2), 2)
+        chunk_ms = len(mulaw_data) * 1000 / TELEPHONY_SAMPLE_RATE
+        
+        if rms < max(BARGE_IN_RMS_THRESHOLD, self.noise_floor * BARGE_IN_NOISE_RATIO):
+            self.noise_floor += (rms - self.noise_floor) * 0.05
+            self.speech_ms = 0.0
+            self.speech_started_at = None
+            return False
+        
+        now = time.monotonic()
+        if self.speech_started_at is None:
+            self.speech_started_at = now
+        self.last_speech_at = now
+        previous_ms = self.speech_ms
+        self.speech_ms += chunk_ms
+        return previous_ms < BARGE_IN_MIN_SPEECH_MS <= self.speech_ms
+    
+    def caller_speaking(self, within=0.3):
+        """Whether the caller is mid-onset: BARGE_IN_MIN_SPEECH_MS of speech, as in process(), heard within `within` s.
+        
+        A single loud chunk (a cough, a click, the tail of a turn) is not enough.
+        """
+        return self.speech_ms >= BARGE_IN_MIN_SPEECH_MS and time.monotonic() - self.last_speech_at < within
+
+class AudioConversionStage:
+    """μ-law→PCM conversion that stays inline for small frames and offloads only large batches.
+    
+    audioop's table-driven decode of a 10-20ms frame takes a few microseconds, far less than an
+    executor round-trip, so the pool is reserved for batches above INLINE_CONVERSION_MAX_BYTES.
+    """
+    
+    def __init__(self, pool, inline_max_bytes=INLINE_CONVERSION_MAX_BYTES):
+        self.pool = pool
+        self.inline_max_bytes = inline_max_bytes
+        self.inline_conversions = 0
+        self.offloaded_conversions = 0
+        self.pending = 0          # Batches submitted to the pool and not yet finished
+        self.peak_pending = 0
+        self.handoff_times = deque(maxlen=200)  # Submit -> worker start, seconds
+    
+    async def ulaw_to_pcm(self, mulaw_data):
+        """Convert μ-law to 16-bit PCM, offloading only when the batch is large enough to pay for it"""
+        if not ENABLE_AUDIO_OPTIMIZATION or len(mulaw_data) <= self.inline_max_bytes:
+            self.inline_conversions += 1
+            return process_mulaw_to_pcm(mulaw_data)
+        
+        self.offloaded_conversions += 1
+        self.pending += 1
+        self.peak_pending = max(self.peak_pending, self.pending)
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.pool, self._timed_convert, mulaw_data, time.monotonic())
+        finally:
+            self.pending -= 1
+    
+    def _timed_convert(self, mulaw_data, submitted_at):
+        self.handoff_times.append(time.monotonic() - submitted_at)
+        return process_mulaw_to_pcm(mulaw_data)
+    
+    def metrics(self):
+        handoffs = list(self.handoff_times)
+        return {
+            "inline_conversions": self.inline_conversions,
+            "offloaded_conversions": self.offloaded_conversions,
+            "inline_max_bytes": self.inline_max_bytes,
+            "executor_queue_depth": self.pending,
+            "executor_peak_queue_depth": self.peak_pending,
+            "executor_handoff_avg_ms": (sum(handoffs) / len(handoffs) * 1000) if handoffs else 0.0,
+            "executor_handoff_max_ms": max(handoffs, default=0.0) * 1000,
+        }
+
+# Shared by every call so /stats reports pool pressure for the whole process
+audio_conversion_stage = AudioConversionStage(audio_processor_pool)
+
+class PolyphaseUpsampler:
+    """Integer-ratio polyphase FIR upsampler (8kHz -> 48kHz is exactly x6)"""
+    
+    def __init__(self, ratio=LIVEKIT_SAMPLE_RATE // TELEPHONY_SAMPLE_RATE, taps_per_phase=POLYPHASE_TAPS_PER_PHASE):
+        self.ratio = ratio
+        self.taps_per_phase = taps_per_phase
+        
+        # Windowed-sinc low-pass at the input Nyquist, gain `ratio` to make up for zero-stuffing
+        num_taps = ratio * taps_per_phase
+        n = np.arange(num_taps) - (num_taps - 1) / 2
+        taps = np.sinc(n / ratio) * np.hamming(num_taps)
+        taps *= ratio / taps.sum()
+        # phases[p, j] multiplies x[k - j] for output sample k * ratio + p
+        self.phases = taps.reshape(taps_per_phase, ratio).T.astype(np.float32)[:, ::-1].copy()
+        
+        self.history = np.zeros(taps_per_phase - 1, dtype=np.float32)
+    
+    def process(self, pcm_in, out):
+        """Upsample int16 samples `pcm_in` into the int16 array `out` (len(pcm_in) * ratio)"""
+        x = np.concatenate((self.history, pcm_in.astype(np.float32)))
+        windows = np.lib.stride_tricks.sliding_window_view(x, self.taps_per_phase)
+        upsampled = windows @ self.phases.T  # (input samples, ratio) -> interleaved phases
+        np.clip(upsampled.reshape(-1), -32768, 32767, out=upsampled.reshape(-1))
+        out[:] = upsampled.reshape(-1)
+        self.history = x[len(x) - (self.taps_per_phase - 1):]
+
+class TelephonyUpsampler:
+    """Turns 8kHz caller PCM into fixed-size 48kHz LiveKit frames, reusing one input frame per call"""
+    
+    def __init__(self, frame_ms=INBOUND_FRAME_MS):
+        self.frame_samples = TELEPHONY_SAMPLE_RATE * frame_ms // 1000
+        self.frame_bytes = self.frame_samples * 2
+        self.pending = bytearray()  # PCM that does not yet fill a whole frame
+        
+        self.input_frame = rtc.AudioFrame.create(
+            sample_rate=TELEPHONY_SAMPLE_RATE,
+            num_channels=1,
+            samples_per_channel=self.frame_samples
+        )
+        self._input_bytes = self.input_frame.data.cast('B')
+        
+        if USE_POLYPHASE_UPSAMPLER:
+            self.polyphase = PolyphaseUpsampler()
+            self.output_frame = rtc.AudioFrame.create(
+                sample_rate=LIVEKIT_SAMPLE_RATE,
+                num_channels=1,
+                samples_per_channel=self.frame_samples * self.polyphase.ratio
+            )
+            self._input_samples = np.frombuffer(self._input_bytes, dtype=np.int16)
+            self._output_samples = np.frombuffer(self.output_frame.data.cast('B'), dtype=np.int16)
+            self.resampler = None
+        else:
+            # Use fastest resampler settings
+            quality = rtc.AudioResamplerQuality.LOW if USE_FASTER_RESAMPLING else rtc.AudioResamplerQuality.HIGH
+            self.resampler = rtc.AudioResampler(
+                input_rate=TELEPHONY_SAMPLE_RATE,
+                output_rate=LIVEKIT_SAMPLE_RATE,
+                num_channels=1,
+                quality=quality
+            )
+    
+    def push(self, pcm_data):
+        """Yield 48kHz frames for every whole input frame buffered.
+        
+        The polyphase path yields the same reused output frame each time, so callers
+        must finish with (await capture_frame on) each frame before pulling the next.
+        Each input frame leaves `pending` before anything is yielded for it, so a caller
+        that stops early (e.g. capture_frame raised) never gets the same audio again.
+        """
+        self.pending += pcm_data
+        
+        while len(self.pending) >= self.frame_bytes:
+            with memoryview(self.pending) as pending:
+                self._input_bytes[:] = pending[:self.frame_bytes]
+            del self.pending[:self.frame_bytes]
+            
+            if self.resampler is None:
+                self.polyphase.process(self._input_samples, self._output_samples)
+                yield self.output_frame
+            else:
+                yield from self.resampler.push(self.input_frame)
 
 class OptimizedMaqsamAudioSource(rtc.AudioSource):
     """Ultra-optimized audio source for minimal latency"""
@@ -318,14 +1083,8 @@ class OptimizedMaqsamAudioSource(rtc.AudioSource):
             num_channels=1
         )
         
-        # Use fastest resampler settings
-        quality = rtc.AudioResamplerQuality.LOW if USE_FASTER_RESAMPLING else rtc.AudioResamplerQuality.HIGH
-        self.resampler = rtc.AudioResampler(
-            input_rate=TELEPHONY_SAMPLE_RATE,
-            output_rate=LIVEKIT_SAMPLE_RATE,
-            num_channels=1,
-            quality=quality
-        )
+        # Fixed-size 8kHz -> 48kHz frames with reused buffers
+        self.upsampler = TelephonyUpsampler()
         
         # Minimal audio buffer
         self.audio_buffer = OptimizedAudioBuffer()
@@ -340,7 +1099,8 @@ class OptimizedMaqsamAudioSource(rtc.AudioSource):
         self.processing_task = None
         self.should_process = True
         
-        logger.info(f"🎤 Ultra-optimized Audio Source initialized: {TELEPHONY_SAMPLE_RATE}Hz -> {LIVEKIT_SAMPLE_RATE}Hz")
+        logger.info(f"🎤 Ultra-optimized Audio Source initialized: {TELEPHONY_SAMPLE_RATE}Hz -> {LIVEKIT_SAMPLE_RATE}Hz "
+                   f"({INBOUND_FRAME_MS}ms frames, {'polyphase' if USE_POLYPHASE_UPSAMPLER else 'sox'} resampler)")
 
     async def start_processing(self):
         """Start background audio processing"""
@@ -366,24 +1126,20 @@ class OptimizedMaqsamAudioSource(rtc.AudioSource):
         self.processing_times.append(process_time)
 
     async def _process_audio_buffer(self):
-        """Ultra-fast background audio processing loop"""
+        """Event-driven audio pump - sleeps until frames arrive, costs nothing while idle"""
         logger.info("🔄 Starting ultra-fast audio processing")
         
         while self.should_process:
             try:
-                # Get all buffered audio data
-                audio_chunks = self.audio_buffer.pop_all()
+                # Wait for buffered audio data
+                audio_chunks = await self.audio_buffer.wait_pop_all()
                 
                 if not audio_chunks:
-                    await asyncio.sleep(0.001)  # 1ms sleep when no data - reduced from 5ms
                     continue
                 
-                # Process all chunks
-                for mulaw_data in audio_chunks:
-                    await self._process_single_chunk(mulaw_data)
-                
-                # Minimal yield to prevent blocking
-                # await asyncio.sleep(0)  # Immediate yield - removed sleep entirely
+                # Process everything that queued up as one batch
+                mulaw_data = audio_chunks[0] if len(audio_chunks) == 1 else b''.join(audio_chunks)
+                await self._process_single_chunk(mulaw_data)
                 
             except Exception as e:
                 logger.error(f"❌ Error in audio processing loop: {e}")
@@ -396,40 +1152,14 @@ class OptimizedMaqsamAudioSource(rtc.AudioSource):
             self.total_bytes_processed += len(mulaw_data)
             self.last_audio_time = time.time()
 
-            # Convert μ-law to PCM in thread pool for non-blocking operation
-            if ENABLE_AUDIO_OPTIMIZATION:
-                loop = asyncio.get_event_loop()
-                pcm_data = await loop.run_in_executor(
-                    audio_processor_pool, 
-                    process_mulaw_to_pcm, 
-                    mulaw_data
-                )
-            else:
-                pcm_data = audioop.ulaw2lin(mulaw_data, 2)
+            # Small frames convert inline; only large batches are worth the thread-pool handoff
+            pcm_data = await audio_conversion_stage.ulaw_to_pcm(mulaw_data)
             
             if not pcm_data:
                 return
             
-            # Convert to samples array
-            samples = array.array("h")
-            samples.frombytes(pcm_data)
-
-            if len(samples) == 0:
-                return
-
-            # Create input frame for resampling
-            input_frame = rtc.AudioFrame.create(
-                sample_rate=TELEPHONY_SAMPLE_RATE,
-                num_channels=1,
-                samples_per_channel=len(samples)
-            )
-            input_frame.data[:len(samples)] = samples
-
-            # Resample to LiveKit's sample rate
-            resampled_frames = self.resampler.push(input_frame)
-
-            # Push each resampled frame to LiveKit immediately
-            for resampled_frame in resampled_frames:
+            # Resample whole frames to LiveKit's sample rate and push each one immediately
+            for resampled_frame in self.upsampler.push(pcm_data):
                 await self.capture_frame(resampled_frame)
 
         except Exception as e:
@@ -439,6 +1169,7 @@ class OptimizedMaqsamAudioSource(rtc.AudioSource):
         """Clean up audio source"""
         try:
             self.should_process = False
+            self.audio_buffer.close()
             
             if self.processing_task:
                 self.processing_task.cancel()
@@ -454,6 +1185,219 @@ class OptimizedMaqsamAudioSource(rtc.AudioSource):
         except Exception as e:
             logger.error(f"❌ Error cleaning up audio source: {e}")
 
+# Call-setup stages, in the order they normally happen; each is measured from WebSocket accept
+CALL_SETUP_STAGES = (
+    "session_setup",
+    "warm_room_claimed",
+    "room_connected",
+    "track_published",
+    "agent_dispatched",
+    "agent_joined",
+    "first_agent_frame",
+    "first_frame_sent",
+)
+call_setup_histograms = {
+    stage: LatencyHistogram(f"call_setup_{stage}", f"Time from WebSocket accept to {stage}")
+    for stage in CALL_SETUP_STAGES
+}
+call_timeline_lock = threading.Lock()
+
+class CallTimeline:
+    """Per-call setup waterfall: the first time each stage is reached, relative to WebSocket accept"""
+    
+    def __init__(self):
+        self.started_at = time.time()
+        self.start = time.monotonic()
+        self.marks = {}
+    
+    def mark(self, stage):
+        if stage in self.marks:
+            return
+        elapsed_ms = (time.monotonic() - self.start) * 1000
+        self.marks[stage] = round(elapsed_ms, 1)
+        call_setup_histograms[stage].observe(elapsed_ms)
+    
+    def to_record(self, **fields):
+        return {"started_at": self.started_at, **fields, "stages_ms": self.marks}
+
+def write_call_timeline(record):
+    """Append one finished call timeline to CALL_TIMELINE_LOG (runs on the thread pool)"""
+    try:
+        line = json.dumps(record) + "\n"
+        with call_timeline_lock, open(CALL_TIMELINE_LOG, "a") as f:
+            f.write(line)
+    except Exception as e:
+        logger.error(f"❌ Failed to write call timeline: {e}")
+
+class WarmRoom:
+    """A pre-created room: bridge connected, caller track published, idle agent dispatched"""
+    
+    def __init__(self, room_name, room, audio_source, audio_track):
+        self.room_name = room_name
+        self.room = room
+        self.audio_source = audio_source
+        self.audio_track = audio_track
+        self.created_at = time.monotonic()
+    
+    def is_usable(self):
+        return self.room.isconnected() and time.monotonic() - self.created_at < WARM_ROOM_MAX_AGE
+    
+    async def close(self):
+        """Tear the room down; deleting it also ends the idle agent's job"""
+        await self.audio_source.cleanup()
+        try:
+            await asyncio.wait_for(self.room.disconnect(), timeout=1.0)
+        except Exception as e:
+            logger.debug(f"Warm room disconnect: {e}")
+        try:
+            await delete_livekit_room(self.room_name)
+        except Exception as e:
+            logger.debug(f"Warm room delete: {e}")
+
+class WarmRoomPool:
+    """Pool of pre-connected rooms so a call can skip LiveKit setup entirely.
+    
+    The target size covers the calls expected to arrive while a replacement room
+    warms up (observed arrival rate x observed warm-up time, with 2x headroom),
+    clamped to [min_size, max_size]. Refill runs in the background.
+    """
+    
+    def __init__(self, min_size=WARM_ROOM_POOL_MIN, max_size=WARM_ROOM_POOL_MAX):
+        self.min_size = min_size
+        self.max_size = max(min_size, max_size)
+        self.rooms = deque()
+        self.arrivals = deque()
+        self.warming = 0
+        self.warmup_seconds = 3.0  # EWMA of real warm-up times
+        self.refill_event = None
+        self.refill_task = None
+        self.tasks = set()
+        self.stats = {"claimed": 0, "misses": 0, "warmed": 0, "warm_failures": 0, "recycled": 0}
+    
+    def start(self):
+        self.refill_event = asyncio.Event()
+        self.refill_event.set()
+        self.refill_task = asyncio.create_task(self._refill_loop())
+        logger.info(f"🔥 Warm room pool started (min: {self.min_size}, max: {self.max_size})")
+    
+    async def stop(self):
+        if self.refill_task:
+            self.refill_task.cancel()
+        for task in list(self.tasks):
+            task.cancel()
+        while self.rooms:
+            await self.rooms.popleft().close()
+    
+    def target_size(self):
+        now = time.monotonic()
+        while self.arrivals and now - self.arrivals[0] > WARM_POOL_ARRIVAL_WINDOW:
+            self.arrivals.popleft()
+        arrival_rate = len(self.arrivals) / WARM_POOL_ARRIVAL_WINDOW
+        wanted = math.ceil(arrival_rate * self.warmup_seconds * 2)
+        return max(self.min_size, min(self.max_size, wanted))
+    
+    def claim(self):
+        """Pop a ready room, or None if the pool is empty (the caller falls back to a cold setup)"""
+        self.arrivals.append(time.monotonic())
+        if self.refill_event:
+            self.refill_event.set()
+        
+        while self.rooms:
+            warm_room = self.rooms.popleft()
+            if warm_room.is_usable():
+                self.stats["claimed"] += 1
+                return warm_room
+            self.stats["recycled"] += 1
+            self._spawn(warm_room.close())
+        
+        self.stats["misses"] += 1
+        return None
+    
+    def metrics(self):
+        return {
+            "ready": len(self.rooms),
+            "warming": self.warming,
+            "target": self.target_size(),
+            "warmup_ms": self.warmup_seconds * 1000,
+            **self.stats
+        }
+    
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+    
+    async def _refill_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self.refill_event.wait(), timeout=WARM_POOL_CHECK_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self.refill_event.clear()
+            
+            # Recycle rooms that aged out or lost their connection while idle
+            for warm_room in [r for r in self.rooms if not r.is_usable()]:
+                self.rooms.remove(warm_room)
+                self.stats["recycled"] += 1
+                self._spawn(warm_room.close())
+            
+            for _ in range(self.target_size() - len(self.rooms) - self.warming):
+                self.warming += 1
+                self._spawn(self._warm_one())
+    
+    async def _warm_one(self):
+        room_name = f"maqsam_pool_{uuid.uuid4().hex[:12]}"
+        identity = f"maqsam-{uuid.uuid4()}"
+        start = time.monotonic()
+        room = None
+        audio_source = None
+        
+        try:
+            await create_livekit_room(room_name, empty_timeout=WARM_ROOM_MAX_AGE)
+            token = get_participant_token(room_name, identity, PARTICIPANT_NAME,
+                                          LIVEKIT_API_KEY, LIVEKIT_API_SECRET)
+            room = rtc.Room()
+            await asyncio.wait_for(room.connect(LIVEKIT_URL, token), timeout=5.0)
+            
+            audio_source = OptimizedMaqsamAudioSource()
+            await audio_source.start_processing()
+            audio_track = rtc.LocalAudioTrack.create_audio_track("maqsam-audio", audio_source)
+            options = rtc.TrackPublishOptions()
+            options.source = rtc.TrackSource.SOURCE_MICROPHONE
+            await room.local_participant.publish_track(audio_track, options)
+            
+            # The agent idles until the claiming call writes its context into the room metadata,
+            # and gives up after the room's empty_timeout if no call ever does
+            await create_agent_dispatch(room_name, agent_name, json.dumps({
+                "call_type": "inbound",
+                "direction": "inbound",
+                "warm_pool": True,
+                "empty_timeout": WARM_ROOM_MAX_AGE
+            }))
+            
+            self.rooms.append(WarmRoom(room_name, room, audio_source, audio_track))
+            warmup = time.monotonic() - start
+            self.warmup_seconds = 0.8 * self.warmup_seconds + 0.2 * warmup
+            self.stats["warmed"] += 1
+            logger.info(f"🔥 Warm room ready: {room_name} in {warmup * 1000:.0f}ms (pool: {len(self.rooms)})")
+            
+        except Exception as e:
+            self.stats["warm_failures"] += 1
+            logger.error(f"❌ Failed to warm room {room_name}: {e}")
+            if audio_source:
+                await audio_source.cleanup()
+            if room:
+                try:
+                    await asyncio.wait_for(room.disconnect(), timeout=1.0)
+                except Exception:
+                    pass
+            try:
+                await delete_livekit_room(room_name)
+            except Exception:
+                pass
+        finally:
+            self.warming -= 1
+
 class OptimizedMaqsamWebSocketHandler:
     """Ultra-optimized WebSocket handler with minimal latency"""
     
@@ -471,10 +1415,20 @@ class OptimizedMaqsamWebSocketHandler:
         self.agent_participant = None
         self.connection_start_time = time.time()
         self.messages_received = 0
-        self.messages_sent = 0
         self.audio_stream_task = None
-        self.background_stream_task = None  # Add background streaming task
-        self.agent_is_speaking = False     # Track if agent is currently speaking
+        self.output_task = None            # Paced clock producing one outbound audio frame per tick
+        self.send_queue = OutboundSendQueue(websocket)
+        self.send_task = None              # Single writer draining send_queue
+        self.priming_frames_pending = 0
+        self.timeline = CallTimeline()     # Setup waterfall, starts at WebSocket accept
+        self.inbound_jitter = InterArrivalJitter()
+        self.barge_in = BargeInDetector()
+        self.agent_state = None            # Agent's lk.agent.state attribute, when it publishes one
+        self.agent_audio_suppressed_until = 0.0
+        self.agent_audible_until = 0.0     # The agent stream carries silence between turns too
+        self.comfort_noise_position = 0
+        self.output_parked = False         # Idle with nothing to send: the clock waits on output_wakeup
+        self.output_wakeup = asyncio.Event()
         
         # Track participants and audio tracks
         self.participants = {}
@@ -489,22 +1443,26 @@ class OptimizedMaqsamWebSocketHandler:
             quality=quality
         )
         
-        # Minimal audio buffer for return path
-        self.return_audio_buffer = OptimizedAudioBuffer()
+        # Agent audio waiting for the output clock
+        self.agent_audio_buffer = AgentAudioJitterBuffer()
+        self.output_clock = OutputClock()
         
-        # Background audio manager - use global instance
-        self.background_audio_manager = global_background_audio_manager
+        # Per-call playhead over the global background loop
+        default_bed = get_background_bed(DEFAULT_BACKGROUND_BED)
+        self.background_cursor = default_bed.create_cursor() if default_bed else None
         
         # Statistics
         self.stats = {
             "audio_frames_sent_to_livekit": 0,
             "audio_frames_received_from_agent": 0,
             "bytes_from_maqsam": 0,
-            "bytes_to_maqsam": 0,
             "average_processing_time": 0.0,
             "background_audio_mixed_frames": 0,
             "background_only_frames": 0,  # Track background-only frames
             "prewarming_frames": 0,  # Track pre-warming frames
+            "idle_output_frames": 0,  # Frames sent aggregated while the agent was quiet
+            "idle_discarded_frames": 0,  # Silent agent frames skipped while idle
+            "barge_ins": 0,
         }
         
         logger.info(f"🆕 Created ultra-optimized WebSocket handler")
@@ -523,16 +1481,15 @@ class OptimizedMaqsamWebSocketHandler:
         """Main handler for Maqsam WebSocket connection with immediate background audio"""
         try:
             # Start background audio IMMEDIATELY when connection is established
-            if self.background_audio_manager:
-                self.background_audio_manager.start()
-                logger.info("🎵 Background audio started immediately (using global manager)")
-            
-            # Start background audio streaming task immediately (even before session setup)
-            self.background_stream_task = asyncio.create_task(self._stream_background_audio_continuously())
-            logger.info("🚀 Background audio streaming started immediately")
+            if self.background_cursor:
+                self.background_cursor.start()
+                logger.info("🎵 Background audio started immediately (per-call cursor on global loop)")
             
-            # Send immediate pre-warming background audio
-            asyncio.create_task(self._immediate_prewarming())
+            # Start the writer and the output clock immediately (even before session setup) so background pre-warms the line
+            self.send_task = asyncio.create_task(self.send_queue.run())
+            self.output_task = asyncio.create_task(self._run_output_clock())
+            active_handlers.add(self)
+            logger.info("🚀 Output clock started immediately")
             
             # Wait for messages and process them
             async for message in self.websocket:
@@ -553,22 +1510,15 @@ class OptimizedMaqsamWebSocketHandler:
         finally:
             await self.cleanup()
     
-    async def _immediate_prewarming(self):
-        """Send immediate background audio for instant experience"""
-        try:
-            # Send 10 frames immediately for instant audio
-            for i in range(10):
-                success = await self._send_background_only_audio_prewarming()
-                if success:
-                    self.stats["prewarming_frames"] += 1
-                await asyncio.sleep(0.01)  # 10ms between frames
-            logger.info("🚀 Immediate pre-warming completed (10 frames sent)")
-        except Exception as e:
-            logger.debug(f"Immediate pre-warming failed: {e}")
-    
     async def _process_message_async(self, message):
         """Process message asynchronously to avoid blocking the main loop"""
         try:
+            # Audio frames dominate traffic - take them without parsing JSON
+            mulaw_data = parse_audio_input_fast(message)
+            if mulaw_data is not None:
+                await self._push_inbound_audio(mulaw_data)
+                return
+            
             if isinstance(message, str):
                 data = json.loads(message)
                 await self._handle_json_message(data)
@@ -603,6 +1553,7 @@ class OptimizedMaqsamWebSocketHandler:
     async def _handle_session_setup(self, data):
         """Handle session.setup message with ultra-fast response"""
         logger.info("🔧 Handling session.setup")
+        self.timeline.mark("session_setup")
         
         # Extract authentication token
         api_key = data.get("apiKey")
@@ -645,6 +1596,8 @@ class OptimizedMaqsamWebSocketHandler:
                        f"Caller: {self.context.get('caller_number', 'N/A')}, "
                        f"Direction: {self.context.get('direction', 'N/A')}")
         
+        self._select_background_bed()
+        
         # Create room from context
         self.room_name = create_room_from_context(self.context)
         
@@ -656,35 +1609,34 @@ class OptimizedMaqsamWebSocketHandler:
         )
         # Note: Background audio already started in handle_connection, no need to start again
     
+    def _select_background_bed(self):
+        """Switch to the background bed named in the Maqsam context, if it is loaded"""
+        name = self.context.get(BACKGROUND_BED_CONTEXT_KEY) if isinstance(self.context, dict) else None
+        if not name or (self.background_cursor and self.background_cursor.manager.name == name):
+            return
+        
+        if name == "none":
+            self.background_cursor = None
+            logger.info("🔇 Background audio off for this call")
+            return
+        
+        bed = get_background_bed(name)
+        if bed is None:
+            logger.warning(f"⚠️ Background bed '{name}' is not loaded, keeping the current one")
+            return
+        self.background_cursor = bed.create_cursor()
+        self.background_cursor.start()
+        logger.info(f"🎶 Background bed for this call: {name}")
+    
     async def _send_session_ready(self):
         """Send session.ready confirmation to Maqsam and prime audio pipeline"""
         ready_message = {"type": "session.ready"}
-        await self.websocket.send(json.dumps(ready_message))
+        self.send_queue.put_control(json.dumps(ready_message))
         self.session_ready = True
-        self.messages_sent += 1
         logger.info("📤 Sent session.ready - background audio will now stream normally")
         
-        # Send priming audio to start the pipeline immediately
-        asyncio.create_task(self._send_priming_audio())
-    
-    async def _send_priming_audio(self):
-        """Send silent audio to prime the agent pipeline"""
-        await asyncio.sleep(0.05)  # Very small delay
-        try:
-            # Create 10ms of silence at 8kHz μ-law
-            silence_samples = b'\xff' * AUDIO_FRAME_SIZE  # μ-law silence
-            encoded_audio = base64.b64encode(silence_samples).decode('utf-8')
-            
-            message = {
-                "type": "response.stream", 
-                "data": {"audio": encoded_audio}
-            }
-            
-            if self._is_websocket_open():
-                await self.websocket.send(json.dumps(message))
-                logger.debug("🔇 Sent priming audio")
-        except Exception as e:
-            logger.debug(f"Priming audio failed: {e}")
+        # Prime the pipeline with a silent frame on the next clock tick if nothing else is queued
+        self.priming_frames_pending = 1
     
     async def _handle_audio_input_optimized(self, data):
         """Ultra-optimized audio input handling"""
@@ -697,17 +1649,53 @@ class OptimizedMaqsamWebSocketHandler:
         if base64_audio and self.audio_source:
             try:
                 # Decode base64 μ-law audio
-                mulaw_data = base64.b64decode(base64_audio)
-                
-                if self.connected_to_livekit:
-                    # Push to optimized audio source (non-blocking)
-                    await self.audio_source.push_audio_data(mulaw_data)
-                    self.stats["audio_frames_sent_to_livekit"] += 1
-                    self.stats["bytes_from_maqsam"] += len(mulaw_data)
+                await self._push_inbound_audio(base64.b64decode(base64_audio))
                 
             except Exception as e:
                 logger.error(f"❌ Error processing audio: {e}")
     
+    async def _push_inbound_audio(self, mulaw_data):
+        """Forward decoded caller μ-law audio to the LiveKit audio source"""
+        if not self.session_ready or not self.audio_source or not mulaw_data:
+            return
+        
+        self.inbound_jitter.observe(len(mulaw_data))
+        
+        if self.connected_to_livekit:
+            # Push to optimized audio source (non-blocking)
+            await self.audio_source.push_audio_data(mulaw_data)
+            self.stats["audio_frames_sent_to_livekit"] += 1
+            self.stats["bytes_from_maqsam"] += len(mulaw_data)
+        
+        # Caller talking over queued agent audio: cut the agent off right away
+        if self.barge_in.process(mulaw_data) and self._agent_audio_active():
+            await self._handle_barge_in("vad")
+    
+    def _agent_audio_active(self):
+        """Whether agent audio is playing or queued for the caller"""
+        return self.agent_state == "speaking" or time.monotonic() < self.agent_audible_until
+    
+    async def _handle_barge_in(self, source):
+        """Flush queued agent audio and tell Maqsam the caller started speaking"""
+        now = time.monotonic()
+        if now < self.agent_audio_suppressed_until:
+            return  # Already handled this interruption
+        
+        flushed_ms = self.agent_audio_buffer.size_ms()
+        flushed_ms += self.send_queue.flush_agent_audio() * OUTPUT_FRAME_MS
+        self.agent_audio_buffer.clear()
+        self.agent_audio_suppressed_until = now + BARGE_IN_SUPPRESS_MS / 1000
+        self.stats["barge_ins"] += 1
+        
+        await self.send_speech_started()
+        
+        # Interruption latency: first chunk of caller speech -> agent audio cut and Maqsam told
+        onset = self.barge_in.speech_started_at or now
+        latency_ms = (time.monotonic() - onset) * 1000
+        barge_in_histograms[source].observe(latency_ms)
+        logger.info(f"✋ Barge-in ({source}): flushed {flushed_ms:.0f}ms of agent audio, "
+                   f"{latency_ms:.0f}ms after caller speech onset")
+    
     async def _handle_call_mark(self, data):
         """Handle call.mark message"""
         mark_data = data.get("data", {})
@@ -726,25 +1714,25 @@ class OptimizedMaqsamWebSocketHandler:
             logger.error("❌ No room name available for LiveKit connection")
             return
         
+        # A pre-connected pool room skips room creation, connect, publish and dispatch entirely
+        warm_room = warm_room_pool.claim() if warm_room_pool else None
+        if warm_room:
+            await self._adopt_warm_room(warm_room)
+            return
+        
         identity = f"maqsam-{uuid.uuid4()}"
         
         try:
             logger.info(f"🔗 Connecting to LiveKit room: {self.room_name}")
             
-            lkapi = api.LiveKitAPI(LIVEKIT_URL, LIVEKIT_API_KEY, LIVEKIT_API_SECRET)
-            
-            # Create token
-            token = (api.AccessToken(LIVEKIT_API_KEY, LIVEKIT_API_SECRET)
-                    .with_identity(identity)
-                    .with_name(PARTICIPANT_NAME)
-                    .with_grants(api.VideoGrants(
-                        room_join=True,
-                        room=self.room_name,
-                    )))
-            
-            # Start agent dispatch IMMEDIATELY and in parallel
+            # Put room creation and agent dispatch on the wire first; both go over the
+            # shared keep-alive client and run alongside the room connect below
             agent_task = asyncio.create_task(self._trigger_agent_ultra_fast())
-            room_task = asyncio.create_task(self._create_room_safe(lkapi, self.room_name))
+            room_task = asyncio.create_task(self._create_room_safe(self.room_name))
+            
+            # Minting the join token is local (a JWT signature), so it adds no round trip
+            token = get_participant_token(self.room_name, identity, PARTICIPANT_NAME,
+                                          LIVEKIT_API_KEY, LIVEKIT_API_SECRET)
             
             # Connect to room
             self.room = rtc.Room()
@@ -752,10 +1740,11 @@ class OptimizedMaqsamWebSocketHandler:
 
             # Ultra-fast connection with reduced timeout
             await asyncio.wait_for(
-                self.room.connect(LIVEKIT_URL, token.to_jwt()), 
+                self.room.connect(LIVEKIT_URL, token), 
                 timeout=3.0  # Reduced from 5.0
             )
             logger.info(f"✅ LiveKit room connection successful at {time.time()}")
+            self.timeline.mark("room_connected")
             
             self.connected_to_livekit = True
             
@@ -773,18 +1762,48 @@ class OptimizedMaqsamWebSocketHandler:
             
             await self.room.local_participant.publish_track(self.audio_track, options)
             logger.info(f"✅ Audio track published at {time.time()}")
+            self.timeline.mark("track_published")
             
-            await lkapi.aclose()
-            
-            # Don't wait for agent completion to avoid blocking
+            # Dispatch has been running alongside the connect; surface its outcome
+            await room_task
+            if not await agent_task:
+                logger.error(f"❌ Agent dispatch failed for room {self.room_name}")
             
         except Exception as e:
             logger.error(f"❌ Failed to connect to LiveKit: {e}")
     
-    async def _create_room_safe(self, lkapi, room_name):
+    async def _adopt_warm_room(self, warm_room):
+        """Take over a pool room and hand its idle agent this call's context"""
+        # LiveKit room names are fixed, so the context-derived name travels as a label in the metadata
+        room_label = self.room_name
+        self.room_name = warm_room.room_name
+        self.room = warm_room.room
+        self.audio_source = warm_room.audio_source
+        self.audio_track = warm_room.audio_track
+        self.connected_to_livekit = self.room.isconnected()
+        self.timeline.mark("warm_room_claimed")
+        self._setup_room_events()
+        
+        # The agent joined (and may already publish) before these handlers existed
+        for participant in list(self.room.remote_participants.values()):
+            self._handle_participant_joined(participant)
+            for publication in list(participant.track_publications.values()):
+                if publication.track is not None:
+                    self._handle_track_subscribed(publication.track, participant)
+        
+        metadata = self._build_agent_metadata()
+        metadata["room_label"] = room_label
+        try:
+            await update_livekit_room_metadata(self.room_name, json.dumps(metadata))
+            logger.info(f"🔥 Claimed warm room {self.room_name} for {room_label} "
+                       f"(warmed {time.monotonic() - warm_room.created_at:.0f}s ago)")
+        except Exception as e:
+            logger.error(f"❌ Failed to hand call context to warm room {self.room_name}: {e}")
+    
+    async def _create_room_safe(self, room_name):
         """Safely create room with error handling"""
         try:
-            await lkapi.room.create_room(api.CreateRoomRequest(name=room_name))
+            await create_livekit_room(room_name)
             logger.info(f"✅ Created LiveKit room: {room_name}")
         except Exception as e:
             logger.debug(f"Room creation result: {e}")
@@ -807,6 +1826,21 @@ class OptimizedMaqsamWebSocketHandler:
             logger.info(f"👤 Participant joined: {participant.identity} at {time.time()}")
             self._handle_participant_joined(participant)
 
+        @self.room.on("participant_attributes_changed")
+        def on_participant_attributes_changed(changed_attributes, participant):
+            if AGENT_STATE_ATTRIBUTE not in changed_attributes or not self._is_agent_participant(participant):
+                return
+            previous_state = self.agent_state
+            self.agent_state = changed_attributes[AGENT_STATE_ATTRIBUTE]
+            
+            # Agent stopped speaking while the caller is mid-onset: it was interrupted
+            if (previous_state == "speaking" and self.agent_state != "speaking"
+                    and self.barge_in.caller_speaking()):
+                asyncio.create_task(self._handle_barge_in("agent_state"))
+            
+            if self.agent_state in ("thinking", "speaking"):
+                self.output_wakeup.set()
+
         @self.room.on("participant_disconnected")
         def on_participant_disconnected(participant):
             logger.info(f"👋 Participant left: {participant.identity}")
@@ -826,16 +1860,19 @@ class OptimizedMaqsamWebSocketHandler:
         @self.room.on("track_subscribed")
         def on_track_subscribed(track, publication, participant):
             logger.info(f"🎵 Track subscribed from {participant.identity}: {track.kind} at {time.time()}")
+            self._handle_track_subscribed(track, participant)
+
+    def _handle_track_subscribed(self, track, participant):
+        """Track a subscribed audio track and start streaming it if it is the agent's"""
+        if participant.identity not in self.audio_tracks:
+            self.audio_tracks[participant.identity] = []
+        
+        if track.kind == rtc.TrackKind.KIND_AUDIO:
+            self.audio_tracks[participant.identity].append(track)
             
-            if participant.identity not in self.audio_tracks:
-                self.audio_tracks[participant.identity] = []
-            
-            if track.kind == rtc.TrackKind.KIND_AUDIO:
-                self.audio_tracks[participant.identity].append(track)
-                
-                if self._is_agent_participant(participant):
-                    logger.info(f"🤖 AGENT AUDIO TRACK! Starting ultra-fast stream at {time.time()}")
-                    self._start_ultra_fast_agent_audio_stream(participant, track)
+            if self._is_agent_participant(participant):
+                logger.info(f"🤖 AGENT AUDIO TRACK! Starting ultra-fast stream at {time.time()}")
+                self._start_ultra_fast_agent_audio_stream(participant, track)
 
     def _handle_participant_joined(self, participant):
         """Handle participant joining"""
@@ -844,6 +1881,7 @@ class OptimizedMaqsamWebSocketHandler:
         if self._is_agent_participant(participant):
             self.agent_participant = participant
             logger.info(f"🤖 AGENT DETECTED: {participant.identity} at {time.time()}")
+            self.timeline.mark("agent_joined")
 
     def _is_agent_participant(self, participant):
         """Check if participant is an agent"""
@@ -871,28 +1909,26 @@ class OptimizedMaqsamWebSocketHandler:
         )
 
     async def stream_agent_audio_ultra_fast(self, audio_track, participant_identity):
-        """Ultra-fast agent audio streaming with minimal latency and background audio mixing"""
+        """Ultra-fast agent audio streaming into the jitter buffer drained by the output clock"""
         logger.info(f"🔊 Starting ultra-fast agent audio stream from {participant_identity} at {time.time()}")
         
         frame_count = 0
-        bytes_sent = 0
+        bytes_buffered = 0
         processing_times = deque(maxlen=25)  # Reduced from 50
-        first_audio_sent = False
+        first_audio_received = False
         
         try:
             # Create audio stream
             audio_stream = rtc.AudioStream(audio_track)
             
-            # Mark agent as speaking
-            self.agent_is_speaking = True
-            
             async for audio_frame_event in audio_stream:
                 start_time = time.time()
                 
                 # Log first audio frame timing
-                if not first_audio_sent:
+                if not first_audio_received:
                     logger.info(f"🎤 FIRST AUDIO FRAME from agent at {time.time()}")
-                    first_audio_sent = True
+                    self.timeline.mark("first_agent_frame")
+                    first_audio_received = True
                 
                 # Quick connection check using robust method
                 if not self._is_websocket_open() or not self.connected_to_livekit or not self.call_active:
@@ -908,32 +1944,13 @@ class OptimizedMaqsamWebSocketHandler:
                     resampled_frames = self.return_resampler.push(frame)
                     
                     for resampled_frame in resampled_frames:
-                        # Convert to PCM bytes
-                        pcm_bytes = bytes(resampled_frame.data[:resampled_frame.samples_per_channel * 2])
-                        
-                        # Convert PCM to μ-law using thread pool for non-blocking operation
-                        if ENABLE_AUDIO_OPTIMIZATION:
-                            loop = asyncio.get_event_loop()
-                            mulaw_bytes = await loop.run_in_executor(
-                                audio_processor_pool,
-                                process_pcm_to_mulaw,
-                                pcm_bytes
-                            )
-                        else:
-                            mulaw_bytes = audioop.lin2ulaw(pcm_bytes, 2)
-                        
-                        if mulaw_bytes:
-                            # Send to Maqsam with background audio mixing
-                            success = await self.send_audio_to_maqsam_with_background(mulaw_bytes)
-                            
-                            if success:
-                                bytes_sent += len(mulaw_bytes)
-                                self.stats["audio_frames_received_from_agent"] += 1
-                                self.stats["bytes_to_maqsam"] += len(mulaw_bytes)
-                                
-                                # Log first successful send
-                                if frame_count == 1:
-                                    logger.info(f"📤 FIRST AUDIO SENT to Maqsam at {time.time()}")
+                        # Queue PCM for the output clock, which mixes, encodes and sends on its own cadence
+                        # Copied once, from the frame's own memory straight into the playout ring
+                        pcm = resampled_frame.data  # Mono, so exactly samples_per_channel samples
+                        if not self._queue_agent_audio(pcm):
+                            continue
+                        bytes_buffered += pcm.nbytes
+                        self.stats["audio_frames_received_from_agent"] += 1
                         
                 except Exception as e:
                     logger.error(f"❌ Error processing audio frame {frame_count}: {e}")
@@ -952,171 +1969,158 @@ class OptimizedMaqsamWebSocketHandler:
         except Exception as e:
             logger.error(f"❌ Error in ultra-fast agent audio stream: {e}")
         finally:
-            # Mark agent as no longer speaking
-            self.agent_is_speaking = False
-            
             avg_time = sum(processing_times) / len(processing_times) * 1000 if processing_times else 0
             logger.info(f"🔇 Ultra-fast audio stream ended. Frames: {frame_count}, "
-                       f"Bytes: {bytes_sent}, Avg time: {avg_time:.2f}ms, "
+                       f"Bytes: {bytes_buffered}, Avg time: {avg_time:.2f}ms, "
                        f"Background mixed frames: {self.stats['background_audio_mixed_frames']}")
 
-    async def send_audio_to_maqsam_with_background(self, agent_audio_data):
-        """Send agent audio mixed with background audio to Maqsam"""
-        try:
-            # Quick connection check using robust method
-            if not self._is_websocket_open():
-                logger.warning("⚠️ WebSocket closed, cannot send audio")
-                return False
-            
-            final_audio = agent_audio_data
-            
-            # Mix with background audio if available
-            if (self.background_audio_manager and 
-                self.background_audio_manager.is_running and 
-                self.background_audio_manager.background_audio_data):
-                
-                # Get background audio chunk matching agent audio length
-                bg_chunk = self.background_audio_manager.get_audio_chunk(len(agent_audio_data))
-                
-                if bg_chunk:
-                    # Mix agent audio with background
-                    final_audio = mix_audio_samples(agent_audio_data, bg_chunk, BACKGROUND_VOLUME_RATIO)
-                    self.stats["background_audio_mixed_frames"] += 1
-            
-            # Encode audio as base64
-            encoded_audio = base64.b64encode(final_audio).decode('utf-8')
-            
-            # Create minimal message structure
-            message = {
-                "type": "response.stream",
-                "data": {"audio": encoded_audio}
-            }
-            
-            await self.websocket.send(json.dumps(message))
-            self.messages_sent += 1
-            
-            return True
-            
-        except websockets.ConnectionClosed:
-            logger.warning("❌ WebSocket connection closed during send")
-            self.call_active = False
-            return False
-        except Exception as e:
-            logger.error(f"❌ Error sending audio to Maqsam: {e}")
-            return False
+    def _queue_agent_audio(self, pcm):
+        """Hand one resampled agent frame to the playout buffer; False if it was dropped"""
+        if time.monotonic() < self.agent_audio_suppressed_until:
+            return False  # Interrupted speech still in flight
+        if self.output_parked:
+            if audioop.rms(pcm, 2) <= AGENT_AUDIBLE_RMS:
+                return False  # Silence between turns while there is nothing to send
+            self.output_wakeup.set()
+        self.agent_audio_buffer.push(pcm)
+        return True
 
-    async def _stream_background_audio_continuously(self):
-        """Stream background audio continuously from call start with pre-warming"""
-        if not self.background_audio_manager or not self.background_audio_manager.background_audio_data:
-            logger.warning("⚠️ No background audio available for continuous streaming")
-            return
-        
-        logger.info("🎵 Starting continuous background audio stream with pre-warming")
+    async def _run_output_clock(self):
+        """Send exactly one paced frame per tick: agent audio mixed with background, or background alone"""
+        logger.info(f"⏱️ Output clock started ({OUTPUT_FRAME_MS}ms frames)")
         
-        frame_count = 0
-        prewarming_frames = 0
+        frames_sent = 0
+        first_agent_frame_sent = False
         
         try:
-            # PRE-WARMING: Start sending background audio immediately when call connects
-            # Don't wait for session_ready to begin background audio
             while self.call_active and self._is_websocket_open():
-                # If session is not ready yet, send background audio anyway (pre-warming)
-                if not self.session_ready:
-                    # Send background audio during pre-warming phase
-                    success = await self._send_background_only_audio_prewarming()
-                    if success:
-                        frame_count += 1
-                        prewarming_frames += 1
-                        self.stats["prewarming_frames"] += 1
-                    
-                    await asyncio.sleep(0.01)  # 10ms intervals during pre-warming
-                    continue
+                await self.output_clock.wait_next()
                 
-                # Normal operation after session is ready
-                # If agent is speaking, let the mixed audio handle background
-                if self.agent_is_speaking:
-                    await asyncio.sleep(0.02)  # 20ms sleep when agent is speaking
+                if self._output_idle():
+                    frame = self._next_idle_output(IDLE_AGGREGATE_FRAMES)
+                    if frame is None:
+                        await self._park_output()
+                        continue
+                    self.output_clock.advance(IDLE_AGGREGATE_FRAMES - 1)
+                else:
+                    frame = self._next_output_frame()
+                if frame is None:
                     continue
                 
-                # Send background-only audio when agent is not speaking
-                success = await self._send_background_only_audio()
-                
-                if success:
-                    frame_count += 1
-                    self.stats["background_only_frames"] += 1
+                mulaw_frame, has_agent_audio = frame
+                self.send_queue.put_audio(mulaw_frame, has_agent_audio)
                 
-                # Send frames every 10ms to match AUDIO_FRAME_SIZE timing
-                await asyncio.sleep(0.01)  # 10ms = AUDIO_FRAME_SIZE duration
+                frames_sent += 1
+                if has_agent_audio and not first_agent_frame_sent:
+                    logger.info(f"📤 FIRST AUDIO SENT to Maqsam at {time.time()}")
+                    self.timeline.mark("first_frame_sent")
+                    first_agent_frame_sent = True
                 
         except Exception as e:
-            logger.error(f"❌ Error in continuous background audio stream: {e}")
+            logger.error(f"❌ Error in output clock: {e}")
         finally:
-            logger.info(f"🔇 Background audio stream ended. Total frames: {frame_count}, "
-                       f"Pre-warming frames: {prewarming_frames}")
+            logger.info(f"🔇 Output clock stopped. Frames sent: {frames_sent}, "
+                       f"Pacing: {self.output_clock.metrics()}")
 
-    async def _send_background_only_audio_prewarming(self):
-        """Send background audio during pre-warming phase (before session ready)"""
-        try:
-            if not self._is_websocket_open():
-                return False
-            
-            if (self.background_audio_manager and 
-                self.background_audio_manager.is_running and 
-                self.background_audio_manager.background_audio_data):
-                
-                # Send a chunk of background audio (10ms worth)
-                chunk_size = AUDIO_FRAME_SIZE  # 80 bytes for 10ms at 8kHz μ-law
-                bg_chunk = self.background_audio_manager.get_audio_chunk(chunk_size)
-                
-                if bg_chunk:
-                    encoded_audio = base64.b64encode(bg_chunk).decode('utf-8')
-                    message = {
-                        "type": "response.stream",
-                        "data": {"audio": encoded_audio}
-                    }
-                    
-                    # Only send if websocket is open, don't check session_ready
-                    await self.websocket.send(json.dumps(message))
-                    self.messages_sent += 1
-                    return True
-            
-            return False
-            
-        except Exception as e:
-            # During pre-warming, some sends might fail - that's okay
-            logger.debug(f"Pre-warming background audio send failed: {e}")
+    def _output_idle(self):
+        """Whether the agent has been quiet long enough for IDLE_OUTPUT_MODE to take over"""
+        if IDLE_OUTPUT_MODE == "continuous" or not self.session_ready or self.priming_frames_pending:
             return False
-
-    async def _send_background_only_audio(self):
-        """Send background audio when agent is not speaking"""
-        try:
-            if not self._is_websocket_open():
-                return False
-            
-            if (self.background_audio_manager and 
-                self.background_audio_manager.is_running and 
-                self.background_audio_manager.background_audio_data):
-                
-                # Send a chunk of background audio (10ms worth)
-                chunk_size = AUDIO_FRAME_SIZE  # 80 bytes for 10ms at 8kHz μ-law
-                bg_chunk = self.background_audio_manager.get_audio_chunk(chunk_size)
-                
-                if bg_chunk:
-                    encoded_audio = base64.b64encode(bg_chunk).decode('utf-8')
-                    message = {
-                        "type": "response.stream",
-                        "data": {"audio": encoded_audio}
-                    }
-                    
-                    await self.websocket.send(json.dumps(message))
-                    self.messages_sent += 1
-                    return True
-            
+        if self.agent_state in ("thinking", "speaking"):
             return False
-            
-        except Exception as e:
-            logger.error(f"❌ Error sending background-only audio: {e}")
+        if time.monotonic() < self.agent_audible_until + IDLE_OUTPUT_AFTER_MS / 1000:
             return False
+        return self.agent_audio_buffer.peak_frame_rms() <= AGENT_AUDIBLE_RMS
+    
+    async def _park_output(self):
+        """Stop ticking until the agent makes a sound or starts thinking/speaking"""
+        self.output_wakeup.clear()
+        self.output_parked = True
+        try:
+            await self.output_wakeup.wait()
+        finally:
+            self.output_parked = False
+        self.output_clock.restart()
+    
+    def _next_idle_output(self, num_frames):
+        """One message covering num_frames idle ticks: background, comfort noise, or None to send nothing.
+        
+        The agent stream keeps delivering silence between turns; it is dropped here rather than
+        mixed, since the background alone sounds the same. Only called once _output_idle has found
+        no buffered frame above AGENT_AUDIBLE_RMS, so speech is never discarded; audible agent
+        audio ends idle output on the next wakeup, at most num_frames ticks later.
+        """
+        self.stats["idle_discarded_frames"] += self.agent_audio_buffer.size // (OUTPUT_FRAME_SAMPLES * 2)
+        self.agent_audio_buffer.clear()
+        
+        num_samples = OUTPUT_FRAME_SAMPLES * num_frames
+        if self.background_cursor and self.background_cursor.is_running:
+            chunk = self.background_cursor.get_audio_chunk(num_samples)
+            self.stats["background_only_frames"] += num_frames
+        elif IDLE_OUTPUT_MODE == "comfort_noise":
+            chunk = comfort_noise_chunk(self.comfort_noise_position, num_samples)
+            self.comfort_noise_position += num_samples
+        else:
+            return None
+        
+        self.stats["idle_output_frames"] += num_frames
+        return chunk, False
+    
+    def _next_output_frame(self):
+        """Build the μ-law frame for this tick; returns (frame, has_agent_audio) or None"""
+        agent_pcm = None
+        if self.session_ready:
+            agent_pcm = self.agent_audio_buffer.pop_frame(OUTPUT_FRAME_SAMPLES, self.output_clock.period)
+        
+        background_on = self.background_cursor and self.background_cursor.is_running
+        
+        if agent_pcm:
+            mix_start = time.perf_counter()
+            if audioop.rms(agent_pcm, 2) > AGENT_AUDIBLE_RMS:
+                self.agent_audible_until = time.monotonic() + AGENT_AUDIBLE_HOLD_MS / 1000
+            if background_on:
+                bg_pcm = self.background_cursor.get_pcm_chunk(OUTPUT_FRAME_SAMPLES)
+                self.stats["background_audio_mixed_frames"] += 1
+                mulaw_frame = mix_with_attenuated_background(agent_pcm, bg_pcm)
+            else:
+                mulaw_frame = audioop.lin2ulaw(agent_pcm, 2)
+            mix_time_histogram.observe((time.perf_counter() - mix_start) * 1000)
+            return mulaw_frame, True
+        
+        if background_on:
+            if self.session_ready:
+                self.stats["background_only_frames"] += 1
+            else:
+                self.stats["prewarming_frames"] += 1
+            return self.background_cursor.get_audio_chunk(OUTPUT_FRAME_SAMPLES), False
+        
+        if self.priming_frames_pending:
+            self.priming_frames_pending -= 1
+            return b'\xff' * OUTPUT_FRAME_SAMPLES, False  # μ-law silence
+        
+        return None
+
+    def _build_agent_metadata(self):
+        """Agent metadata for this call: caller number, direction and the raw Maqsam context"""
+        # Extract calling number from context
+        calling_number = "unknown"
+        direction = "inbound"
+        
+        if self.context and isinstance(self.context, dict):
+            calling_number = self.context.get('caller_number', 'unknown')
+            direction = self.context.get('direction', 'inbound')
+        
+        logger.info(f"🔍 Extracted calling_number: {calling_number}")
+        
+        # For inbound calls, include direction to help agent identify call type
+        return {
+            "phone": calling_number,
+            "calling_number": calling_number,
+            "direction": direction,
+            "call_type": "inbound",
+            "call_id": self.context.get('id', '') if self.context else '',
+            "context": self.context or {}
+        }
 
     async def _trigger_agent_ultra_fast(self):
         """Launch agent with minimal delay and phone number in metadata"""
@@ -1126,52 +2130,25 @@ class OptimizedMaqsamWebSocketHandler:
         logger.info(f"🔍 Bridge context: {self.context}")
         
         try:
-            # Extract calling number from context
-            calling_number = "unknown"
-            direction = "inbound"
-            
-            if self.context and isinstance(self.context, dict):
-                calling_number = self.context.get('caller_number', 'unknown')
-                direction = self.context.get('direction', 'inbound')
-            
-            logger.info(f"🔍 Extracted calling_number: {calling_number}")
-            
-            # For inbound calls, include direction to help agent identify call type
-            metadata = {
-                "phone": calling_number,
-                "calling_number": calling_number,
-                "direction": direction,
-                "call_type": "inbound",
-                "call_id": self.context.get('id', '') if self.context else '',
-                "context": self.context or {}
-            }
+            metadata = self._build_agent_metadata()
+            calling_number = metadata["phone"]
             
             # DEBUG: Log what we're sending
             logger.info(f"📤 Sending metadata to agent: {metadata}")
             metadata_json = json.dumps(metadata)
             logger.info(f"📤 Metadata JSON: {metadata_json}")
             
-            # Use asyncio subprocess for non-blocking execution with metadata
-            cmd = [
-                "lk", "dispatch", "create",
-                "--room", self.room_name,
-                "--agent-name", agent_name,
-                "--metadata", metadata_json
-            ]
-            logger.info(f"📤 Command: {cmd}")
-            
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.DEVNULL,
-                stderr=asyncio.subprocess.DEVNULL
-            )
+            # Dispatch over the shared, keep-alive LiveKit API client and wait for the result
+            dispatch_start = time.perf_counter()
+            dispatch = await create_agent_dispatch(self.room_name, agent_name, metadata_json)
+            self.timeline.mark("agent_dispatched")
             
-            logger.info(f"✅ Agent dispatch started with phone {calling_number} (PID: {process.pid}) at {time.time()}")
+            logger.info(f"✅ Agent dispatched with phone {calling_number} (dispatch: {dispatch.id}) "
+                       f"in {(time.perf_counter() - dispatch_start) * 1000:.0f}ms at {time.time()}")
             return True
             
         except Exception as e:
             logger.error(f"❌ Error launching agent: {e}")
-            import traceback
             logger.error(f"❌ Traceback: {traceback.format_exc()}")
             return False
 
@@ -1180,9 +2157,8 @@ class OptimizedMaqsamWebSocketHandler:
         """Send speech.started to Maqsam (customer interruption)"""
         try:
             message = {"type": "speech.started"}
-            await self.websocket.send(json.dumps(message))
-            self.messages_sent += 1
-            logger.info("📤 Sent speech.started")
+            self.send_queue.put_control(json.dumps(message))
+            logger.info("📤 Queued speech.started")
             return True
         except Exception as e:
             logger.error(f"❌ Error sending speech.started: {e}")
@@ -1192,9 +2168,8 @@ class OptimizedMaqsamWebSocketHandler:
         """Send call.redirect to Maqsam (redirect to human)"""
         try:
             message = {"type": "call.redirect"}
-            await self.websocket.send(json.dumps(message))
-            self.messages_sent += 1
-            logger.info("📤 Sent call.redirect")
+            self.send_queue.put_control(json.dumps(message))
+            logger.info("📤 Queued call.redirect")
             return True
         except Exception as e:
             logger.error(f"❌ Error sending call.redirect: {e}")
@@ -1207,9 +2182,8 @@ class OptimizedMaqsamWebSocketHandler:
                 "type": "call.mark",
                 "data": {"label": label}
             }
-            await self.websocket.send(json.dumps(message))
-            self.messages_sent += 1
-            logger.info(f"📤 Sent call.mark: {label}")
+            self.send_queue.put_control(json.dumps(message))
+            logger.info(f"📤 Queued call.mark: {label}")
             return True
         except Exception as e:
             logger.error(f"❌ Error sending call.mark: {e}")
@@ -1223,16 +2197,26 @@ class OptimizedMaqsamWebSocketHandler:
         self.call_active = False
         
         # Stop background audio
-        if self.background_audio_manager:
-            self.background_audio_manager.stop()
+        if self.background_cursor:
+            self.background_cursor.stop()
         
-        # Cancel background streaming task
-        if self.background_stream_task and not self.background_stream_task.done():
-            self.background_stream_task.cancel()
+        # Cancel output clock
+        if self.output_task and not self.output_task.done():
+            self.output_task.cancel()
+            try:
+                await asyncio.wait_for(self.output_task, timeout=0.5)
+            except (asyncio.CancelledError, asyncio.TimeoutError):
+                pass
+        # Let the writer drain what is already queued, then stop it
+        if self.send_task and not self.send_task.done():
+            self.send_queue.close()
             try:
-                await asyncio.wait_for(self.background_stream_task, timeout=0.5)
+                await asyncio.wait_for(self.send_task, timeout=0.5)
             except (asyncio.CancelledError, asyncio.TimeoutError):
                 pass
+        if self in active_handlers:
+            active_handlers.discard(self)
+            record_finished_call(self)
         
         # Cancel audio streaming task
         if self.audio_stream_task and not self.audio_stream_task.done():
@@ -1262,41 +2246,285 @@ class OptimizedMaqsamWebSocketHandler:
         elapsed = time.time() - self.connection_start_time
         logger.info(f"📊 Session Summary:")
         logger.info(f"   Duration: {elapsed:.1f}s")
-        logger.info(f"   Messages: {self.messages_received} received, {self.messages_sent} sent")
+        logger.info(f"   Messages: {self.messages_received} received, {self.send_queue.messages_sent} sent")
+        logger.info(f"   Send queue: {self.send_queue.metrics()}")
         logger.info(f"   Audio frames: {self.stats['audio_frames_sent_to_livekit']} to LiveKit, {self.stats['audio_frames_received_from_agent']} from Agent")
-        logger.info(f"   Background audio: {self.stats['background_audio_mixed_frames']} mixed frames, {self.stats['background_only_frames']} background-only frames")
+        logger.info(f"   Background audio: {self.stats['background_audio_mixed_frames']} mixed frames, {self.stats['background_only_frames']} background-only frames, {self.stats['idle_output_frames']} sent as idle output "
+                   f"({self.stats['idle_discarded_frames']} silent agent frames skipped)")
         logger.info(f"   Pre-warming frames: {self.stats['prewarming_frames']}")
+        if self.audio_source:
+            logger.info(f"   Inbound frames dropped: {self.audio_source.audio_buffer.dropped_frames}")
+        logger.info(f"   Output pacing: {self.output_clock.metrics()}, "
+                   f"agent buffer underruns: {self.agent_audio_buffer.underruns}, "
+                   f"overrun drops: {self.agent_audio_buffer.overrun_frames}, "
+                   f"target depth: {self.agent_audio_buffer.target_ms:.0f}ms")
         logger.info(f"   Avg processing time: {self.stats['average_processing_time']:.2f}ms")
+        logger.info(f"   Setup waterfall (ms from accept): {self.timeline.marks}")
+        
+        if CALL_TIMELINE_LOG:
+            record = self.timeline.to_record(
+                room=self.room_name,
+                call_id=self.context.get('id') if isinstance(self.context, dict) else None,
+                duration_s=round(elapsed, 1)
+            )
+            asyncio.get_running_loop().run_in_executor(audio_processor_pool, write_call_timeline, record)
         
         logger.info("✅ Cleanup complete")
 
+class ConnectionRateLimiter:
+    """Per-IP token buckets for connection attempts, in a bounded LRU table.
+    
+    Each IP may burst RATE_LIMIT_PER_IP connections and earns them back at RATE_LIMIT_PER_IP
+    per RATE_LIMIT_WINDOW. Checks, updates and evictions are O(1): a bucket that has refilled
+    completely is indistinguishable from a new one, so it is dropped, and past max_ips the
+    least recently seen IP is dropped (counted in table_evictions).
+    """
+    
+    def __init__(self, max_ips=RATE_LIMIT_MAX_IPS, capacity=RATE_LIMIT_PER_IP, window=RATE_LIMIT_WINDOW):
+        self.buckets = OrderedDict()  # ip -> (tokens, updated_at), least recently updated first
+        self.max_ips = max_ips
+        self.capacity = capacity
+        self.window = window          # An untouched bucket is full again after this long
+        self.refill_per_second = capacity / window
+        self.rejected = 0
+        self.table_evictions = 0
+    
+    def _tokens(self, client_ip, now):
+        bucket = self.buckets.get(client_ip)
+        if bucket is None:
+            return self.capacity
+        tokens, updated_at = bucket
+        return min(self.capacity, tokens + (now - updated_at) * self.refill_per_second)
+    
+    def rate_limited(self, client_ip, now):
+        """Whether this IP is out of tokens (does not consume one)"""
+        self.evict_expired(now, limit=2)
+        if self._tokens(client_ip, now) < 1:
+            self.rejected += 1
+            return True
+        return False
+    
+    def record_attempt(self, client_ip, now):
+        """Spend a token for an accepted connection"""
+        self.buckets[client_ip] = (self._tokens(client_ip, now) - 1, now)
+        self.buckets.move_to_end(client_ip)
+        if len(self.buckets) > self.max_ips:
+            self.buckets.popitem(last=False)
+            self.table_evictions += 1
+    
+    def evict_expired(self, now, limit=None):
+        """Drop buckets that have refilled completely, oldest first; stops at the first live one"""
+        evicted = 0
+        while self.buckets and (limit is None or evicted < limit):
+            client_ip, (_, updated_at) = next(iter(self.buckets.items()))
+            if now - updated_at < self.window:
+                break
+            del self.buckets[client_ip]
+            evicted += 1
+        return evicted
+    
+    def metrics(self):
+        return {
+            "tracked_ips": len(self.buckets),
+            "max_ips": self.max_ips,
+            "rejected": self.rejected,
+            "table_evictions": self.table_evictions,
+        }
+
+class SharedBridgeState:
+    """Connection counters and rate-limit windows shared by forked bridge workers.
+    
+    Created by the supervisor before forking, so every worker maps the same memory. Each
+    worker writes only its own counter slot (no lock); the per-IP rate-limit table is a
+    fixed-size hash table of token buckets (ip key, milli-tokens, updated ms) guarded by one
+    process lock, with the same limits as ConnectionRateLimiter. Each worker also publishes a
+    JSON metrics report (local_metrics_report) into its own slot for the stats process.
+    """
+    
+    WORKER_FIELDS = ("pid", "listening", "active", "peak", "total_handled", "rejected_rate_limit",
+                     "rejected_capacity", "rejected_loop_lag")
+    
+    def __init__(self, num_workers, rate_limit_slots=SHARED_RATE_LIMIT_SLOTS):
+        self.num_workers = num_workers
+        self.rate_limit_slots = rate_limit_slots
+        self.workers = multiprocessing.Array('q', num_workers * len(self.WORKER_FIELDS), lock=False)
+        self.global_peak = multiprocessing.Value('q', 0, lock=False)
+        self.rate_limit = multiprocessing.Array('q', rate_limit_slots * 3, lock=False)
+        self.rate_limit_lock = multiprocessing.Lock()
+        self.rate_limit_evictions = multiprocessing.Value('q', 0, lock=False)  # Live buckets overwritten
+        self.reports = multiprocessing.Array('c', num_workers * METRICS_REPORT_SLOT_BYTES, lock=False)
+        self.report_lengths = multiprocessing.Array('q', num_workers, lock=False)
+        self.report_lock = multiprocessing.Lock()
+        self.worker_index = None  # Set in each worker after fork
+    
+    def _offset(self, worker_index, field):
+        return worker_index * len(self.WORKER_FIELDS) + self.WORKER_FIELDS.index(field)
+    
+    def get(self, worker_index, field):
+        return self.workers[self._offset(worker_index, field)]
+    
+    def set(self, field, value):
+        """Set a counter in this worker's slot"""
+        self.workers[self._offset(self.worker_index, field)] = value
+    
+    def increment(self, field, amount=1):
+        offset = self._offset(self.worker_index, field)
+        self.workers[offset] += amount
+    
+    def reset_worker(self, worker_index, pid):
+        """Zero a worker slot (on (re)start - connections of a dead worker are gone)"""
+        for field in self.WORKER_FIELDS:
+            self.workers[self._offset(worker_index, field)] = 0
+        self.workers[self._offset(worker_index, "pid")] = pid
+        self.report_lengths[worker_index] = 0
+    
+    def total(self, field):
+        return sum(self.get(i, field) for i in range(self.num_workers))
+    
+    def record_active(self, active):
+        """Publish this worker's active count and fold it into the peaks"""
+        self.set("active", active)
+        if active > self.get(self.worker_index, "peak"):
+            self.set("peak", active)
+        self.global_peak.value = max(self.global_peak.value, self.total("active"))
+    
+    RATE_LIMIT_FULL_MILLI = RATE_LIMIT_PER_IP * 1000
+    RATE_LIMIT_WINDOW_MS = RATE_LIMIT_WINDOW * 1000
+    
+    def _rate_limit_slot(self, client_ip, now_ms):
+        """Find the table slot for an IP (linear probe, reusing an empty or refilled bucket, else evicting the home slot)"""
+        key = zlib.crc32(client_ip.encode()) + 1
+        home = key % self.rate_limit_slots
+        for probe in range(4):
+            slot = (home + probe) % self.rate_limit_slots
+            stored_key = self.rate_limit[slot * 3]
+            if stored_key == key:
+                return slot
+            if stored_key == 0 or now_ms - self.rate_limit[slot * 3 + 2] >= self.RATE_LIMIT_WINDOW_MS:
+                self.rate_limit[slot * 3:slot * 3 + 3] = [key, self.RATE_LIMIT_FULL_MILLI, now_ms]
+                return slot
+        self.rate_limit_evictions.value += 1
+        self.rate_limit[home * 3:home * 3 + 3] = [key, self.RATE_LIMIT_FULL_MILLI, now_ms]
+        return home
+    
+    def _bucket_milli_tokens(self, slot, now_ms):
+        tokens, updated_ms = self.rate_limit[slot * 3 + 1], self.rate_limit[slot * 3 + 2]
+        refilled = (now_ms - updated_ms) * self.RATE_LIMIT_FULL_MILLI // self.RATE_LIMIT_WINDOW_MS
+        return min(self.RATE_LIMIT_FULL_MILLI, tokens + refilled)
+    
+    def rate_limited(self, client_ip, now):
+        """Token-bucket check of connections from this IP across all workers (does not consume a token)"""
+        now_ms = int(now * 1000)
+        with self.rate_limit_lock:
+            slot = self._rate_limit_slot(client_ip, now_ms)
+            return self._bucket_milli_tokens(slot, now_ms) < 1000
+    
+    def record_attempt(self, client_ip, now):
+        now_ms = int(now * 1000)
+        with self.rate_limit_lock:
+            slot = self._rate_limit_slot(client_ip, now_ms)
+            self.rate_limit[slot * 3 + 1:slot * 3 + 3] = [self._bucket_milli_tokens(slot, now_ms) - 1000, now_ms]
+    
+    def tracked_ips(self, now):
+        now_ms = int(now * 1000)
+        return sum(1 for slot in range(self.rate_limit_slots)
+                   if self.rate_limit[slot * 3] and now_ms - self.rate_limit[slot * 3 + 2] < self.RATE_LIMIT_WINDOW_MS)
+    
+    def snapshot(self):
+        return [
+            {field: self.get(i, field) for field in self.WORKER_FIELDS}
+            for i in range(self.num_workers)
+        ]
+    
+    def publish_report(self, report):
+        """Store this worker's encoded metrics report; False if it does not fit the slot"""
+        if len(report) > METRICS_REPORT_SLOT_BYTES:
+            return False
+        start = self.worker_index * METRICS_REPORT_SLOT_BYTES
+        with self.report_lock:
+            self.reports[start:start + len(report)] = report
+            self.report_lengths[self.worker_index] = len(report)
+        return True
+    
+    def worker_reports(self):
+        """The latest report of every worker that has published one"""
+        with self.report_lock:
+            encoded = [self.reports[i * METRICS_REPORT_SLOT_BYTES:i * METRICS_REPORT_SLOT_BYTES + self.report_lengths[i]]
+                       for i in range(self.num_workers) if self.report_lengths[i]]
+        return [json.loads(report) for report in encoded]
+
+rate_limiter = ConnectionRateLimiter()  # Used when not sharing the table with other workers
+
+def rate_limit_metrics():
+    """Limiter state for /stats and /metrics (fixed size either way)"""
+    if shared_state:
+        return {
+            "tracked_ips": shared_state.tracked_ips(time.time()),
+            "max_ips": shared_state.rate_limit_slots,
+            "rejected": shared_state.total("rejected_rate_limit"),
+            "table_evictions": shared_state.rate_limit_evictions.value,
+            "shared_across_workers": True,
+        }
+    return rate_limiter.metrics()
+
+def connection_totals():
+    """Active/peak/total connection counts for this process, or summed across workers"""
+    if shared_state:
+        return {
+            "active": shared_state.total("active"),
+            "peak": shared_state.global_peak.value,
+            "total_handled": shared_state.total("total_handled"),
+        }
+    return {
+        "active": active_connections,
+        "peak": max(peak_connections, active_connections),
+        "total_handled": total_connections_handled,
+    }
+
 # Connection management functions
 async def enforce_connection_limits(websocket):
     """Enforce connection limits"""
-    global active_connections
+    global active_connections, total_connections_handled
     
     client_ip = websocket.remote_address[0] if websocket.remote_address else "unknown"
     current_time = time.time()
     
-    # Rate limiting
-    attempts = connection_attempts[client_ip]
-    while attempts and attempts[0] < current_time - RATE_LIMIT_WINDOW:
-        attempts.popleft()
-    
-    if len(attempts) >= RATE_LIMIT_PER_IP:
+    # Rate limiting (per-IP token buckets, shared across workers under the supervisor)
+    limiter = shared_state or rate_limiter
+    if limiter.rate_limited(client_ip, current_time):
         logger.warning(f"🚫 Rate limit exceeded for IP {client_ip}")
+        if shared_state:
+            shared_state.increment("rejected_rate_limit")
         await websocket.close(code=1008, reason="Rate limit exceeded")
         return False
     
-    if active_connections >= MAX_CONNECTIONS:
-        logger.warning(f"🚫 Global connection limit reached: {active_connections}/{MAX_CONNECTIONS}")
+    # An overloaded worker stops taking calls rather than degrading the ones it already has
+    loop_lag_ms = loop_lag_monitor.current_lag_ms()
+    if LOOP_LAG_REJECT_MS and loop_lag_ms > LOOP_LAG_REJECT_MS:
+        logger.warning(f"🚫 Event loop lagging {loop_lag_ms:.0f}ms (limit {LOOP_LAG_REJECT_MS:.0f}ms) - refusing connection")
+        loop_lag_monitor.rejected_connections += 1
+        if shared_state:
+            shared_state.increment("rejected_loop_lag")
+        await websocket.close(code=1013, reason="Server overloaded")
+        return False
+    
+    current_connections = shared_state.total("active") if shared_state else active_connections
+    if current_connections >= MAX_CONNECTIONS:
+        logger.warning(f"🚫 Global connection limit reached: {current_connections}/{MAX_CONNECTIONS}")
+        if shared_state:
+            shared_state.increment("rejected_capacity")
         await websocket.close(code=1008, reason="Server at capacity")
         return False
     
-    attempts.append(current_time)
+    limiter.record_attempt(client_ip, current_time)
     active_connections += 1
+    total_connections_handled += 1
     connections_per_ip[client_ip] += 1
     
+    if shared_state:
+        shared_state.increment("total_handled")
+        shared_state.record_active(active_connections)
+    
     logger.info(f"✅ Connection accepted. Total: {active_connections}")
     return True
 
@@ -1310,15 +2538,20 @@ def cleanup_connection(websocket):
     
     if connections_per_ip[client_ip] <= 0:
         del connections_per_ip[client_ip]
+    
+    if shared_state:
+        shared_state.record_active(active_connections)
 
 async def handle_maqsam_websocket(websocket):
     """Main Maqsam WebSocket handler with ultra-fast optimizations"""
     handler = None
+    accepted = False
     
     try:
         # Enforce connection limits
         if not await enforce_connection_limits(websocket):
             return
+        accepted = True
         
         logger.info(f"🔗 NEW WEBSOCKET CONNECTION from {websocket.remote_address} at {time.time()}")
         
@@ -1345,22 +2578,34 @@ async def handle_maqsam_websocket(websocket):
     except Exception as e:
         logger.error(f"❌ Error in WebSocket handler: {e}")
     finally:
-        cleanup_connection(websocket)
+        if accepted:
+            cleanup_connection(websocket)
         if handler:
             try:
                 await handler.cleanup()
             except Exception as e:
                 logger.error(f"❌ Error in handler cleanup: {e}")
 
-async def start_maqsam_websocket_server():
-    """Start ultra-optimized Maqsam WebSocket server"""
+async def start_maqsam_websocket_server(reuse_port=False):
+    """Start ultra-optimized Maqsam WebSocket server (reuse_port lets forked workers share 8765).
+    
+    Serves until drain_bridge() has let the live calls finish. A successor started by a hot
+    restart finds the inherited listening socket in MAQSAM_LISTEN_FD instead of binding.
+    """
+    global maqsam_server
     logger.info("🌐 Starting ultra-optimized WebSocket server on ws://0.0.0.0:8765")
     
+    inherited_fd = os.environ.pop("MAQSAM_LISTEN_FD", None)
+    if inherited_fd:
+        logger.info(f"♻️ Taking over listening socket (fd {inherited_fd}) from the previous process")
+        listen = {"sock": socket.socket(fileno=int(inherited_fd))}
+    else:
+        listen = {"host": "0.0.0.0", "port": 8765, "reuse_port": reuse_port}
+    
     try:
         async with websockets.serve(
             handle_maqsam_websocket,
-            "0.0.0.0", 
-            8765,
+            **listen,
             # Ultra-optimized settings for minimal latency
             max_size=256*1024,  # Further reduced max message size
             max_queue=8,        # Minimal queue size
@@ -1368,45 +2613,472 @@ async def start_maqsam_websocket_server():
             ping_interval=60,   # Longer ping interval
             ping_timeout=10,    # Faster ping timeout
             close_timeout=3,    # Faster close timeout
-        ):
+        ) as server:
+            maqsam_server = server
             logger.info("✅ Ultra-optimized WebSocket server listening on ws://0.0.0.0:8765")
             logger.info(f"🔒 Auth token required: {VALID_AUTH_TOKEN}")
             logger.info(f"📊 Max connections: {MAX_CONNECTIONS}")
             logger.info(f"⚡ Audio optimizations: {ENABLE_AUDIO_OPTIMIZATION}")
             logger.info(f"🎵 Fast resampling: {USE_FASTER_RESAMPLING}")
             logger.info(f"🎶 Background audio: {ENABLE_BACKGROUND_AUDIO} (ratio: {BACKGROUND_VOLUME_RATIO})")
-            logger.info(f"⏱️ Frame size: {AUDIO_FRAME_SIZE} samples (10ms)")
-            logger.info(f"💾 Buffer size: {MAX_BUFFER_SIZE} frame (minimal)")
-            logger.info(f"🚀 Pre-warmed background audio: ENABLED")
-            if ENABLE_BACKGROUND_AUDIO and global_background_audio_manager and global_background_audio_manager.background_audio_data:
-                logger.info(f"📂 Background file: {BACKGROUND_AUDIO_FILE} (pre-loaded)")
+            logger.info(f"⏱️ Output frame: {OUTPUT_FRAME_SAMPLES} samples ({OUTPUT_FRAME_MS}ms, paced clock)")
+            logger.info(f"💾 Inbound ring: {MAX_BUFFER_SIZE} frames (drop-oldest, event-driven)")
+            logger.info("🚀 Pre-warmed background audio: ENABLED")
+            if background_beds:
+                logger.info("📂 Background beds: " + ", ".join(
+                    f"{name}={'ready' if bed.ready else 'converting'}" for name, bed in background_beds.items()))
             logger.info("⏰ Server ready for ultra-low-latency connections...")
             
-            await asyncio.Future()  # Run forever
+            if shared_state:
+                shared_state.set("listening", 1)
+            else:
+                notify_ready()
+            
+            await shutdown_event.wait()
             
     except Exception as e:
         logger.error(f"❌ Error starting WebSocket server: {e}")
         raise
 
+def notify_ready():
+    """Tell the process that started us for a hot restart that we are serving (no-op otherwise)"""
+    ready_fd = os.environ.pop("MAQSAM_READY_FD", None)
+    if ready_fd:
+        os.write(int(ready_fd), b"1")
+        os.close(int(ready_fd))
+
+def spawn_successor(listen_fds):
+    """Start a new bridge process with the same command line and wait until it is serving.
+    
+    listen_fds maps environment variable -> listening socket fd to hand over (empty under the
+    supervisor, whose workers bind with SO_REUSEPORT). Blocks for up to
+    HOT_RESTART_READY_TIMEOUT; returns the process, or None if it never became ready.
+    """
+    read_fd, write_fd = os.pipe()
+    env = {**os.environ, "MAQSAM_READY_FD": str(write_fd), **{name: str(fd) for name, fd in listen_fds.items()}}
+    try:
+        process = subprocess.Popen([sys.executable, *sys.argv], env=env,
+                                   pass_fds=(write_fd, *listen_fds.values()))
+    finally:
+        os.close(write_fd)
+    
+    try:
+        readable, _, _ = select.select([read_fd], [], [], HOT_RESTART_READY_TIMEOUT)
+        if readable and os.read(read_fd, 1) == b"1":
+            logger.info(f"♻️ Successor (PID: {process.pid}) is serving")
+            return process
+    finally:
+        os.close(read_fd)
+    
+    logger.error(f"❌ Successor (PID: {process.pid}) did not start serving, keeping this process")
+    if process.poll() is None:
+        process.terminate()
+    return None
+
+async def drain_bridge(reason):
+    """Stop accepting calls, let the live ones finish (up to DRAIN_TIMEOUT), then let the server return"""
+    global draining
+    if draining or maqsam_server is None:
+        return
+    draining = True
+    logger.info(f"🚰 Draining ({reason}): no new calls on this process, {active_connections} still live")
+    
+    # Closes the listening socket only; open connections and their handlers carry on
+    maqsam_server.close(close_connections=False)
+    
+    deadline = time.monotonic() + DRAIN_TIMEOUT
+    while active_connections > 0 and time.monotonic() < deadline:
+        try:
+            await asyncio.wait_for(asyncio.shield(maqsam_server.wait_closed()),
+                                   min(DRAIN_LOG_INTERVAL, deadline - time.monotonic()))
+        except asyncio.TimeoutError:
+            logger.info(f"🚰 Still draining: {active_connections} calls live")
+    
+    if active_connections > 0:
+        logger.warning(f"⚠️ Drain timeout after {DRAIN_TIMEOUT:.0f}s, closing {active_connections} calls")
+        await asyncio.gather(*(connection.close(1012, "Service restart") for connection in maqsam_server.connections),
+                             return_exceptions=True)
+    
+    logger.info("✅ Drained, shutting down")
+    shutdown_event.set()
+
+async def hot_restart_bridge():
+    """Hand this process's listening sockets to a fresh process, then drain this one.
+    
+    The sockets never close, so connections keep queueing in the kernel while the successor
+    starts and there is no accept gap. If the successor does not come up, nothing changes.
+    """
+    if draining or maqsam_server is None:
+        return
+    listen_fds = {"MAQSAM_LISTEN_FD": maqsam_server.sockets[0].fileno()}
+    if http_listen_socket is not None:
+        listen_fds["MAQSAM_HTTP_LISTEN_FD"] = http_listen_socket.fileno()
+    
+    logger.info("♻️ Hot restart: starting a successor on the same sockets")
+    successor = await asyncio.get_running_loop().run_in_executor(None, spawn_successor, listen_fds)
+    if successor is None:
+        return
+    
+    # The successor answers /health and /admin from here on
+    if http_site is not None:
+        await http_site.stop()
+    await drain_bridge(f"handed off to PID {successor.pid}")
+
+def install_drain_signal_handlers(hot_restart=True):
+    """SIGTERM drains this process; SIGUSR2 hot-restarts it (single-process mode only)"""
+    loop = asyncio.get_running_loop()
+    loop.add_signal_handler(signal.SIGTERM, lambda: asyncio.create_task(drain_bridge("SIGTERM")))
+    if hot_restart:
+        loop.add_signal_handler(signal.SIGUSR2, lambda: asyncio.create_task(hot_restart_bridge()))
+
+# Counters exported per call and summed across live + finished calls: name -> help text
+CALL_COUNTERS = {
+    "inbound_frames": "Caller audio frames forwarded to LiveKit",
+    "inbound_bytes": "Caller μ-law bytes received from Maqsam",
+    "inbound_frames_dropped": "Caller frames dropped by the inbound ring",
+    "agent_frames": "Agent audio frames received from LiveKit",
+    "agent_audio_dropped_bytes": "Agent PCM bytes dropped because the buffer was over its cap",
+    "agent_audio_underruns": "Times the agent stream was active but the playout buffer ran dry",
+    "agent_audio_overrun_frames": "Agent frames dropped to pull the playout buffer back to its target depth",
+    "outbound_frames": "Frames sent to Maqsam",
+    "outbound_bytes": "μ-law bytes sent to Maqsam",
+    "send_coalesced_frames": "Outbound frames coalesced into another frame's message because the peer was slow",
+    "send_dropped_background_frames": "Background-only frames dropped from a full send queue",
+    "send_dropped_agent_frames": "Agent frames dropped from a full send queue",
+    "background_mixed_frames": "Outbound frames with agent audio mixed over background",
+    "background_only_frames": "Outbound background-only frames",
+    "idle_output_frames": "Frames sent aggregated by the idle output mode while the agent was quiet",
+    "output_late_ticks": "Output clock ticks that woke more than half a frame late",
+    "barge_ins": "Caller interruptions that flushed agent audio",
+}
+
+def call_counters(handler):
+    """Current values of CALL_COUNTERS for one handler (plain reads, no locking)"""
+    audio_buffer = handler.audio_source.audio_buffer if handler.audio_source else None
+    return {
+        "inbound_frames": handler.stats["audio_frames_sent_to_livekit"],
+        "inbound_bytes": handler.stats["bytes_from_maqsam"],
+        "inbound_frames_dropped": audio_buffer.dropped_frames if audio_buffer else 0,
+        "agent_frames": handler.stats["audio_frames_received_from_agent"],
+        "agent_audio_dropped_bytes": handler.agent_audio_buffer.dropped_bytes,
+        "agent_audio_underruns": handler.agent_audio_buffer.underruns,
+        "agent_audio_overrun_frames": handler.agent_audio_buffer.overrun_frames,
+        "outbound_frames": handler.send_queue.frames_sent,
+        "outbound_bytes": handler.send_queue.bytes_sent,
+        "send_coalesced_frames": handler.send_queue.coalesced_frames,
+        "send_dropped_background_frames": handler.send_queue.dropped_background_frames,
+        "send_dropped_agent_frames": handler.send_queue.dropped_agent_frames,
+        "background_mixed_frames": handler.stats["background_audio_mixed_frames"],
+        "background_only_frames": handler.stats["background_only_frames"],
+        "idle_output_frames": handler.stats["idle_output_frames"],
+        "output_late_ticks": handler.output_clock.late_ticks,
+        "barge_ins": handler.stats["barge_ins"],
+    }
+
+def record_finished_call(handler):
+    """Fold an ending call's counters into the process totals so /metrics counters never go backwards"""
+    for name, value in call_counters(handler).items():
+        finished_call_totals[name] += value
+    call_jitter_histogram.observe(handler.inbound_jitter.jitter * 1000)
+
+def send_queue_bytes(handler):
+    """Bytes waiting in the WebSocket transport's write buffer"""
+    try:
+        return handler.websocket.transport.get_write_buffer_size()
+    except Exception:
+        return 0
+
+class LoopLagMonitor:
+    """Event-loop lag sampler plus a watchdog thread that catches slow callbacks in the act.
+    
+    The sampler sleeps LOOP_LAG_SAMPLE_INTERVAL and records how late it wakes; every wake-up
+    is also a heartbeat. If the heartbeat goes stale for SLOW_CALLBACK_MS, the watchdog thread
+    reads the loop thread's stack (sys._current_frames) and the running task while the
+    callback is still blocking, so the culprit is named rather than inferred.
+    """
+    
+    def __init__(self):
+        self.loop = None
+        self.loop_thread_id = None
+        self.heartbeat = time.monotonic()
+        self.recent_lag = deque(maxlen=max(1, int(LOOP_LAG_WINDOW / LOOP_LAG_SAMPLE_INTERVAL)))
+        self.slow_callbacks = deque(maxlen=20)  # Most recent stalls, with stacks
+        self.slow_callback_count = 0
+        self.rejected_connections = 0
+        self.stop_event = threading.Event()
+    
+    async def run(self):
+        self.loop = asyncio.get_running_loop()
+        self.loop_thread_id = threading.get_ident()
+        self.heartbeat = time.monotonic()
+        self.stop_event.clear()
+        threading.Thread(target=self._watchdog, name="loop-lag-watchdog", daemon=True).start()
+        
+        try:
+            while True:
+                start = time.monotonic()
+                await asyncio.sleep(LOOP_LAG_SAMPLE_INTERVAL)
+                now = time.monotonic()
+                lag_ms = max(now - start - LOOP_LAG_SAMPLE_INTERVAL, 0.0) * 1000
+                self.heartbeat = now
+                self.recent_lag.append(lag_ms)
+                loop_lag_histogram.observe(lag_ms)
+        finally:
+            self.stop_event.set()
+    
+    def current_lag_ms(self):
+        """Worst sampled lag over the last LOOP_LAG_WINDOW seconds"""
+        return max(self.recent_lag, default=0.0)
+    
+    def _watchdog(self):
+        reported_heartbeat = None
+        while not self.stop_event.wait(SLOW_CALLBACK_MS / 2000):
+            heartbeat = self.heartbeat
+            stalled_ms = (time.monotonic() - heartbeat - LOOP_LAG_SAMPLE_INTERVAL) * 1000
+            if stalled_ms < SLOW_CALLBACK_MS or heartbeat == reported_heartbeat:
+                continue
+            reported_heartbeat = heartbeat  # One report per stall
+            
+            frame = sys._current_frames().get(self.loop_thread_id)
+            stack = "".join(traceback.format_stack(frame, limit=12)) if frame else ""
+            task = asyncio.current_task(self.loop)
+            coro = task.get_coro() if task else None
+            where = getattr(coro, "__qualname__", None) or (task.get_name() if task else "loop callback")
+            
+            self.slow_callback_count += 1
+            self.slow_callbacks.append({
+                "at": time.time(),
+                "stalled_ms": round(stalled_ms, 1),
+                "task": where,
+                "stack": stack,
+            })
+            logger.warning(f"🐢 Event loop blocked for {stalled_ms:.0f}ms+ in {where}\n{stack}")
+    
+    def metrics(self):
+        """This process's counters (the lag distribution is loop_lag_histogram)"""
+        return {
+            "current_lag_ms": self.current_lag_ms(),
+            "rejected_connections": self.rejected_connections,
+            "slow_callbacks": self.slow_callback_count,
+            "recent_slow_callbacks": list(self.slow_callbacks),
+        }
+
+loop_lag_monitor = LoopLagMonitor()
+
+def exported_histograms():
+    """Every process-wide latency histogram, by name"""
+    histograms = [mix_time_histogram, loop_lag_histogram, call_jitter_histogram, send_blocked_histogram,
+                  *barge_in_histograms.values(), *call_setup_histograms.values(),
+                  dispatch_latency, room_create_latency]
+    return {histogram.name: histogram for histogram in histograms}
+
+def local_metrics_report():
+    """This process's call metrics, kept in forms that add up across workers (histograms are the live objects)"""
+    handlers = list(active_handlers)
+    counters = dict(finished_call_totals)
+    for handler in handlers:
+        for name, value in call_counters(handler).items():
+            counters[name] = counters.get(name, 0) + value
+    
+    clocks = [handler.output_clock.metrics() for handler in handlers]
+    queue_depths = [send_queue_bytes(handler) for handler in handlers]
+    playout_depths = [handler.agent_audio_buffer.size_ms() for handler in handlers]
+    jitters = [handler.inbound_jitter.jitter for handler in handlers]
+    return {
+        "calls": len(handlers),
+        "connections_total": total_connections_handled,
+        "call_counters": counters,
+        "call_gauges": {
+            "send_queue_bytes": sum(queue_depths),
+            "send_queue_max_bytes": max(queue_depths, default=0),
+            "send_queue_frames": sum(handler.send_queue.depth() for handler in handlers),
+            "agent_buffer_depth_ms": sum(playout_depths),
+            "agent_buffer_depth_max_ms": max(playout_depths, default=0.0),
+            "agent_buffer_target_ms_total": sum(handler.agent_audio_buffer.target_ms for handler in handlers),
+            "inbound_jitter_total": sum(jitters),
+            "inbound_jitter_max": max(jitters, default=0.0),
+        },
+        "output_pacing": {
+            "calls": len(clocks),
+            "ticks": sum(m["ticks"] for m in clocks),
+            "late_ticks": sum(m["late_ticks"] for m in clocks),
+            "skipped_ticks": sum(m["skipped_ticks"] for m in clocks),
+            "abs_error_ms_total": sum(m["mean_abs_error_ms"] * m["ticks"] for m in clocks),
+            "max_error_ms": max((m["max_error_ms"] for m in clocks), default=0.0),
+        },
+        "audio_conversion": audio_conversion_stage.metrics(),
+        "livekit_control_plane": control_plane_counters(),
+        "event_loop": loop_lag_monitor.metrics(),
+        "warm_room_pool": warm_room_pool.metrics() if warm_room_pool else None,
+        "histograms": exported_histograms(),
+    }
+
+def encode_metrics_report(report):
+    """JSON for SharedBridgeState.publish_report (histograms as their bucket state)"""
+    encoded = json.dumps({**report, "histograms": {name: histogram.state()
+                                                   for name, histogram in report["histograms"].items()}})
+    return encoded.encode()
+
+def _combine(reports, max_keys=(), mean_keys=()):
+    """Add up per-worker dicts of numbers; max_keys take the largest value and mean_keys the average"""
+    combined = {}
+    for key in reports[0]:
+        values = [report[key] for report in reports if key in report]
+        if key in max_keys:
+            combined[key] = max(values)
+        elif key in mean_keys:
+            combined[key] = sum(values) / len(values)
+        else:
+            combined[key] = sum(values)
+    return combined
+
+def merge_metrics_reports(reports):
+    """One report for the whole bridge from the workers' decoded reports"""
+    histograms = {}
+    for name, template in exported_histograms().items():
+        histograms[name] = template.empty_copy()
+        for report in reports:
+            if name in report["histograms"]:
+                histograms[name].merge(report["histograms"][name])
+    
+    control_planes = [report["livekit_control_plane"] for report in reports]
+    event_loops = [report["event_loop"] for report in reports]
+    pools = [report["warm_room_pool"] for report in reports if report["warm_room_pool"]]
+    return {
+        "calls": sum(report["calls"] for report in reports),
+        "connections_total": sum(report["connections_total"] for report in reports),
+        "call_counters": _combine([report["call_counters"] for report in reports]),
+        "call_gauges": _combine([report["call_gauges"] for report in reports],
+                                max_keys=("send_queue_max_bytes", "agent_buffer_depth_max_ms", "inbound_jitter_max")),
+        "output_pacing": _combine([report["output_pacing"] for report in reports], max_keys=("max_error_ms",)),
+        "audio_conversion": _combine([report["audio_conversion"] for report in reports],
+                                     max_keys=("inline_max_bytes", "executor_peak_queue_depth", "executor_handoff_max_ms"),
+                                     mean_keys=("executor_handoff_avg_ms",)),
+        "livekit_control_plane": {
+            section: _combine([control_plane[section] for control_plane in control_planes])
+            for section in control_planes[0]
+        },
+        "event_loop": {
+            **_combine([{k: v for k, v in event_loop.items() if k != "recent_slow_callbacks"} for event_loop in event_loops],
+                       max_keys=("current_lag_ms",)),
+            "recent_slow_callbacks": sorted((stall for event_loop in event_loops for stall in event_loop["recent_slow_callbacks"]),
+                                            key=lambda stall: stall["at"])[-loop_lag_monitor.slow_callbacks.maxlen:],
+        },
+        "warm_room_pool": _combine(pools, mean_keys=("warmup_ms",)) if pools else None,
+        "histograms": histograms,
+    }
+
+def metrics_report():
+    """Call metrics behind /stats and /metrics: this process's, or every worker's combined under the supervisor"""
+    if shared_state:
+        # Until the first worker report arrives, the stats process's own (all-zero) report stands in
+        return merge_metrics_reports(shared_state.worker_reports() or
+                                     [json.loads(encode_metrics_report(local_metrics_report()))])
+    return local_metrics_report()
+
+async def publish_worker_metrics():
+    """Worker side of metrics_report(): publish this worker's report every METRICS_PUBLISH_INTERVAL"""
+    while True:
+        report = local_metrics_report()
+        if not shared_state.publish_report(encode_metrics_report(report)):
+            # Slow-callback stacks are the only unbounded part
+            report["event_loop"]["recent_slow_callbacks"] = []
+            shared_state.publish_report(encode_metrics_report(report))
+        await asyncio.sleep(METRICS_PUBLISH_INTERVAL)
+
+def output_pacing_summary(pacing):
+    """Output-clock pacing error across live calls, from a report's output_pacing totals"""
+    return {
+        "calls": pacing["calls"],
+        "frame_ms": OUTPUT_FRAME_MS,
+        "ticks": pacing["ticks"],
+        "late_ticks": pacing["late_ticks"],
+        "skipped_ticks": pacing["skipped_ticks"],
+        "mean_abs_error_ms": (pacing["abs_error_ms_total"] / pacing["ticks"]) if pacing["ticks"] else 0.0,
+        "max_error_ms": pacing["max_error_ms"],
+    }
+
+def render_prometheus_metrics(report):
+    """Build the /metrics body from a metrics_report() (every worker's, under the supervisor)"""
+    totals = report["call_counters"]
+    gauges = report["call_gauges"]
+    histograms = report["histograms"]
+    event_loop = report["event_loop"]
+    rate_limit = rate_limit_metrics()
+    
+    parts = [
+        render_gauge("maqsam_active_calls", "Calls currently being bridged", report["calls"]),
+        render_counter("maqsam_connections_total", "WebSocket connections accepted", report["connections_total"]),
+    ]
+    for name, description in CALL_COUNTERS.items():
+        parts.append(render_counter(f"maqsam_{name}_total", description, totals.get(name, 0)))
+    parts += [
+        render_gauge("maqsam_send_queue_bytes", "Bytes queued in WebSocket write buffers across calls",
+                     gauges["send_queue_bytes"]),
+        render_gauge("maqsam_send_queue_max_bytes", "Largest per-call WebSocket write buffer",
+                     gauges["send_queue_max_bytes"]),
+        render_gauge("maqsam_send_queue_frames", "Messages waiting in per-call send queues",
+                     gauges["send_queue_frames"]),
+        render_histogram("maqsam_send_blocked_seconds", "Time a WebSocket send waited on the peer",
+                         histograms[send_blocked_histogram.name]),
+        render_gauge("maqsam_agent_buffer_depth_seconds", "Agent playout buffer depth summed across calls",
+                     f"{gauges['agent_buffer_depth_ms'] / 1000:.6f}"),
+        render_gauge("maqsam_agent_buffer_depth_max_seconds", "Deepest agent playout buffer",
+                     f"{gauges['agent_buffer_depth_max_ms'] / 1000:.6f}"),
+        render_gauge("maqsam_agent_buffer_target_seconds", "Mean adaptive playout target depth across calls",
+                     f"{(gauges['agent_buffer_target_ms_total'] / report['calls'] / 1000) if report['calls'] else 0.0:.6f}"),
+        render_gauge("maqsam_inbound_jitter_seconds", "Mean inbound interarrival jitter across live calls",
+                     f"{(gauges['inbound_jitter_total'] / report['calls']) if report['calls'] else 0.0:.6f}"),
+        render_gauge("maqsam_inbound_jitter_max_seconds", "Worst inbound interarrival jitter across live calls",
+                     f"{gauges['inbound_jitter_max']:.6f}"),
+        render_histogram("maqsam_mix_seconds", "Per-frame outbound mix/encode time", histograms[mix_time_histogram.name]),
+        render_histogram("maqsam_event_loop_lag_seconds", "Event-loop scheduling lag", histograms[loop_lag_histogram.name]),
+        render_gauge("maqsam_event_loop_lag_window_max_seconds", "Worst event-loop lag over the admission window",
+                     f"{event_loop['current_lag_ms'] / 1000:.6f}"),
+        render_counter("maqsam_slow_callbacks_total", f"Event-loop stalls longer than {SLOW_CALLBACK_MS}ms",
+                       event_loop["slow_callbacks"]),
+        render_counter("maqsam_rejected_loop_lag_total", "Connections refused because the event loop was lagging",
+                       event_loop["rejected_connections"]),
+        render_counter("maqsam_rate_limit_rejected_total", "Connections refused by the per-IP rate limiter",
+                       rate_limit["rejected"]),
+        render_counter("maqsam_rate_limit_table_evictions_total",
+                       "Live per-IP buckets dropped because the rate-limit table was full", rate_limit["table_evictions"]),
+        render_gauge("maqsam_rate_limit_tracked_ips", "IPs currently tracked by the rate limiter",
+                     rate_limit["tracked_ips"]),
+        render_histogram("maqsam_call_inbound_jitter_seconds", "Final inbound interarrival jitter per call",
+                         histograms[call_jitter_histogram.name]),
+        render_histogram_family("maqsam_call_setup_seconds", "Time from WebSocket accept to each call-setup stage",
+                                {stage: histograms[f"call_setup_{stage}"] for stage in CALL_SETUP_STAGES}, "stage"),
+        render_histogram_family("maqsam_barge_in_latency_seconds",
+                                "Caller speech onset to agent audio flushed and speech.started sent",
+                                {source: histograms[f"barge_in_{source}"] for source in barge_in_histograms}, "source"),
+        render_histogram("maqsam_livekit_dispatch_seconds", "Agent dispatch request latency",
+                         histograms[dispatch_latency.name]),
+        render_histogram("maqsam_livekit_room_create_seconds", "Room creation request latency",
+                         histograms[room_create_latency.name]),
+    ]
+    return "".join(parts)
+
 async def start_http_server():
     """Start HTTP server for health checks"""
     
     async def handle_health(request):
         """Health check endpoint"""
         return web.json_response({
-            "status": "healthy",
+            "status": "draining" if draining else "healthy",
             "timestamp": time.time(),
             "service": "ultra-optimized-maqsam-livekit-bridge",
             "version": "2.3-prewarmed-background-audio",
             "connections": {
-                "active": active_connections,
+                "active": connection_totals()["active"],
                 "max": MAX_CONNECTIONS,
-                "per_ip": dict(connections_per_ip)
+                "per_ip": dict(connections_per_ip),
+                "workers": shared_state.snapshot() if shared_state else None
             },
             "optimizations": {
                 "audio_optimization": ENABLE_AUDIO_OPTIMIZATION,
                 "fast_resampling": USE_FASTER_RESAMPLING,
-                "audio_frame_size": AUDIO_FRAME_SIZE,
+                "audio_frame_size": OUTPUT_FRAME_SAMPLES,
                 "max_buffer_size": MAX_BUFFER_SIZE,
                 "process_pool_size": PROCESS_POOL_SIZE,
                 "prewarmed_background_audio": True
@@ -1416,11 +3088,13 @@ async def start_http_server():
                 "file": BACKGROUND_AUDIO_FILE,
                 "volume_ratio": BACKGROUND_VOLUME_RATIO,
                 "file_exists": os.path.exists(BACKGROUND_AUDIO_FILE) if ENABLE_BACKGROUND_AUDIO else False,
+                "beds": background_bed_status(),
                 "prewarming_enabled": True
             },
             "latency_optimizations": {
-                "frame_duration_ms": (AUDIO_FRAME_SIZE / TELEPHONY_SAMPLE_RATE) * 1000,
-                "minimal_buffering": MAX_BUFFER_SIZE == 1,
+                "frame_duration_ms": OUTPUT_FRAME_MS,
+                "paced_output_clock": True,
+                "event_driven_inbound": True,
                 "parallel_agent_dispatch": True,
                 "priming_audio_enabled": True,
                 "immediate_background_audio": True
@@ -1434,20 +3108,25 @@ async def start_http_server():
                 "configured": all([LIVEKIT_URL, LIVEKIT_API_KEY, LIVEKIT_API_SECRET]),
                 "url": LIVEKIT_URL
             }
-        })
+        }, status=503 if draining else 200)
 
     async def handle_stats(request):
-        """Statistics endpoint"""
+        """Statistics endpoint (per-call sections cover every worker under the supervisor)"""
         uptime = time.time() - server_start_time
+        totals = connection_totals()
+        report = metrics_report()
+        histograms = report["histograms"]
+        control_plane = report["livekit_control_plane"]
         
         return web.json_response({
             "uptime_seconds": uptime,
             "uptime_hours": uptime / 3600,
             "connections": {
-                "current": active_connections,
-                "peak": peak_connections,
-                "total_handled": total_connections_handled
+                "current": totals["active"],
+                "peak": totals["peak"],
+                "total_handled": totals["total_handled"]
             },
+            "workers": shared_state.snapshot() if shared_state else None,
             "performance": {
                 "thread_pool_size": PROCESS_POOL_SIZE,
                 "audio_optimizations_enabled": ENABLE_AUDIO_OPTIMIZATION,
@@ -1459,121 +3138,210 @@ async def start_http_server():
                 "enabled": ENABLE_BACKGROUND_AUDIO,
                 "volume_ratio": BACKGROUND_VOLUME_RATIO,
                 "file_available": os.path.exists(BACKGROUND_AUDIO_FILE) if ENABLE_BACKGROUND_AUDIO else False,
-                "prewarming_mode": "immediate_start"
+                "prewarming_mode": "immediate_start",
+                "beds": background_bed_status(),
+                "idle_output_mode": IDLE_OUTPUT_MODE
+            },
+            "output_pacing": output_pacing_summary(report["output_pacing"]),
+            "audio_conversion": report["audio_conversion"],
+            "livekit_control_plane": {
+                "agent_dispatch": {**control_plane["agent_dispatch"], **histograms[dispatch_latency.name].snapshot()},
+                "room_create": {**control_plane["room_create"], **histograms[room_create_latency.name].snapshot()},
+            },
+            "call_setup": {stage: histograms[f"call_setup_{stage}"].snapshot() for stage in CALL_SETUP_STAGES},
+            "barge_in": {source: histograms[f"barge_in_{source}"].snapshot() for source in barge_in_histograms},
+            "event_loop": {
+                "reject_threshold_ms": LOOP_LAG_REJECT_MS,
+                **report["event_loop"],
+                **histograms[loop_lag_histogram.name].snapshot()
             },
+            "warm_room_pool": report["warm_room_pool"],
             "rate_limiting": {
                 "max_per_ip": RATE_LIMIT_PER_IP,
                 "window_seconds": RATE_LIMIT_WINDOW,
-                "current_attempts": {ip: len(attempts) for ip, attempts in connection_attempts.items()}
+                **rate_limit_metrics()
             }
         })
 
+    async def handle_metrics(request):
+        """Prometheus text exposition (every worker's calls under the supervisor)"""
+        return web.Response(text=render_prometheus_metrics(metrics_report()), content_type="text/plain")
+
+    async def handle_admin(request):
+        """POST /admin/drain or /admin/restart, authenticated with MAQSAM_ADMIN_TOKEN"""
+        if not validate_admin_token(request.headers.get("Authorization")):
+            return web.json_response({"error": "invalid admin token"}, status=401)
+        
+        action = request.match_info["action"]
+        if action == "drain":
+            if shared_state:
+                os.kill(os.getppid(), signal.SIGTERM)  # Stats process: the supervisor drains its workers
+            else:
+                asyncio.create_task(drain_bridge("admin request"))
+        elif action == "restart":
+            if shared_state:
+                os.kill(os.getppid(), signal.SIGUSR2)
+            else:
+                asyncio.create_task(hot_restart_bridge())
+        else:
+            return web.json_response({"error": f"unknown admin action: {action}"}, status=404)
+        
+        logger.info(f"🛠️ Admin {action} requested by {request.remote}")
+        return web.json_response({"status": action, "active": connection_totals()["active"]}, status=202)
+
     # Create web application
     app = web.Application()
     
     # Health and monitoring endpoints
     app.router.add_get("/health", handle_health)
     app.router.add_get("/stats", handle_stats)
+    app.router.add_get("/metrics", handle_metrics)
+    if ADMIN_TOKEN:
+        app.router.add_post("/admin/{action:drain|restart}", handle_admin)
+    
+    # Start server on a socket we own, so a hot restart can hand it over
+    global http_listen_socket, http_site
+    inherited_fd = os.environ.pop("MAQSAM_HTTP_LISTEN_FD", None)
+    if inherited_fd:
+        http_listen_socket = socket.socket(fileno=int(inherited_fd))
+    else:
+        http_listen_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        http_listen_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if shared_state:
+            # A successor supervisor's stats server binds next to ours
+            http_listen_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        http_listen_socket.bind(("0.0.0.0", 8080))
     
-    # Start server
     runner = web.AppRunner(app)
     await runner.setup()
-    site = web.TCPSite(runner, "0.0.0.0", 8080)
-    await site.start()
+    http_site = web.SockSite(runner, http_listen_socket)
+    await http_site.start()
     
     logger.info("🌐 HTTP server listening on http://0.0.0.0:8080")
     logger.info("📋 Health check: http://0.0.0.0:8080/health")
     logger.info("📊 Statistics: http://0.0.0.0:8080/stats")
+    logger.info("📈 Prometheus metrics: http://0.0.0.0:8080/metrics")
+    if ADMIN_TOKEN:
+        logger.info("🛠️ Drain / hot restart: POST http://0.0.0.0:8080/admin/drain, /admin/restart")
 
 async def monitor_connections():
     """Monitor connections periodically"""
     global peak_connections
     
     while True:
-        await asyncio.sleep(300)  # Every 5 minutes
+        await asyncio.sleep(RATE_LIMIT_EVICT_INTERVAL)
         
         # Update peak connections
         if active_connections > peak_connections:
             peak_connections = active_connections
         
-        # Cleanup old connection attempts
-        current_time = time.time()
-        for ip in list(connection_attempts.keys()):
-            attempts = connection_attempts[ip]
-            while attempts and attempts[0] < current_time - RATE_LIMIT_WINDOW:
-                attempts.popleft()
-            if not attempts:
-                del connection_attempts[ip]
+        # Drop per-IP buckets that have refilled (the shared table reuses such slots in place)
+        rate_limiter.evict_expired(time.time())
 
 # Global statistics
 server_start_time = time.time()
 peak_connections = 0
 total_connections_handled = 0
 
-async def main():
-    """Main function to run ultra-optimized Maqsam integration with pre-warmed background audio"""
-    global total_connections_handled, global_background_audio_manager
-    
-    logger.info("🚀 Starting Ultra-Optimized Maqsam-LiveKit Bridge v2.3 (Pre-warmed Background Audio)...")
-    logger.info("=" * 90)
-    
-    # Validate environment variables
+def check_environment():
+    """Validate required environment variables"""
     required_vars = ["LIVEKIT_URL", "LIVEKIT_API_KEY", "LIVEKIT_API_SECRET"]
     
     logger.info("🔧 Checking environment variables...")
     missing_vars = [var for var in required_vars if not os.environ.get(var)]
     if missing_vars:
         logger.error(f"❌ Missing required environment variables: {missing_vars}")
+        return False
+    return True
+
+def load_global_background_audio():
+    """Map every cached background bed at startup (before forking workers); cold beds are converted later"""
+    if not ENABLE_BACKGROUND_AUDIO:
         return
     
-    # Initialize global background audio manager at startup
-    if ENABLE_BACKGROUND_AUDIO:
-        logger.info("🎵 Pre-loading background audio at startup...")
-        global_background_audio_manager = BackgroundAudioManager(BACKGROUND_AUDIO_FILE)
-        if global_background_audio_manager.background_audio_data:
-            logger.info("✅ Background audio pre-loaded successfully")
-        else:
-            logger.warning("⚠️ Background audio failed to load")
-            global_background_audio_manager = None
-    
-    # Check background audio file
-    if ENABLE_BACKGROUND_AUDIO:
-        if os.path.exists(BACKGROUND_AUDIO_FILE):
-            logger.info(f"✅ Background audio file found: {BACKGROUND_AUDIO_FILE}")
-        else:
-            logger.warning(f"⚠️ Background audio file not found: {BACKGROUND_AUDIO_FILE}")
-            logger.warning("   Background audio will be disabled for this session")
+    logger.info("🎵 Pre-loading background audio at startup...")
+    for name, path in BACKGROUND_BEDS.items():
+        bed = BackgroundAudioManager(path, name)
+        bed.load_cached()
+        background_beds[name] = bed
     
-    # Log configuration
+    ready = [name for name, bed in background_beds.items() if bed.ready]
+    logger.info(f"✅ Background beds ready: {', '.join(ready) or 'none'}")
+
+async def load_cold_background_beds(convert=True):
+    """Fill in beds that were not cached: convert them, or wait for the worker that does (convert=False)"""
+    cold = [bed for bed in background_beds.values() if not bed.ready and bed.cache_path]
+    if cold:
+        await asyncio.gather(*(bed.convert() if convert else bed.wait_for_cache() for bed in cold))
+
+def get_background_bed(name):
+    """The named bed if it is loaded, else None"""
+    bed = background_beds.get(name)
+    return bed if bed and bed.ready else None
+
+def background_bed_status():
+    return {
+        name: {"file": bed.audio_file_path, "ready": bed.ready, "from_cache": bed.loaded_from_cache}
+        for name, bed in background_beds.items()
+    }
+
+def log_configuration():
     logger.info("✅ All environment variables configured")
     logger.info(f"🔗 LiveKit URL: {LIVEKIT_URL}")
     logger.info(f"🔐 Auth Token: {VALID_AUTH_TOKEN}")
     logger.info(f"🎵 Audio: Maqsam({TELEPHONY_SAMPLE_RATE}Hz μ-law) ↔ LiveKit({LIVEKIT_SAMPLE_RATE}Hz)")
     logger.info(f"🤖 Agent: {agent_name}")
     logger.info(f"📊 Limits: {MAX_CONNECTIONS} connections, {RATE_LIMIT_PER_IP}/IP per {RATE_LIMIT_WINDOW}s")
+    logger.info(f"🔥 Warm room pool: {f'{WARM_ROOM_POOL_MIN}-{WARM_ROOM_POOL_MAX} rooms per worker' if WARM_ROOM_POOL_MIN > 0 else 'disabled'}")
+    logger.info(f"🧩 Workers: {BRIDGE_WORKERS} {'(SO_REUSEPORT supervisor)' if BRIDGE_WORKERS > 1 else '(single process)'}")
+    logger.info(f"🚰 Drain: SIGTERM{' or /admin/drain' if ADMIN_TOKEN else ''}, up to {DRAIN_TIMEOUT:.0f}s; "
+                f"hot restart: SIGUSR2{' or /admin/restart' if ADMIN_TOKEN else ''}"
+                f"{'' if ADMIN_TOKEN else ' (set MAQSAM_ADMIN_TOKEN for the /admin routes)'}")
     logger.info(f"⚡ Optimizations: Audio={ENABLE_AUDIO_OPTIMIZATION}, FastResampling={USE_FASTER_RESAMPLING}")
     logger.info(f"🧠 Thread Pool: {PROCESS_POOL_SIZE} workers")
-    logger.info(f"🔧 Buffer: {MAX_BUFFER_SIZE} frame (minimal), Frame: {AUDIO_FRAME_SIZE} samples (10ms)")
+    logger.info(f"🔧 Inbound ring: {MAX_BUFFER_SIZE} frames (event-driven), Output frame: {OUTPUT_FRAME_SAMPLES} samples ({OUTPUT_FRAME_MS}ms)")
     logger.info(f"🎶 Background Audio: {ENABLE_BACKGROUND_AUDIO} (ratio: {BACKGROUND_VOLUME_RATIO})")
+    logger.info(f"🗂️ Call timeline log: {CALL_TIMELINE_LOG or 'disabled (set MAQSAM_CALL_TIMELINE_LOG)'}")
+    logger.info(f"💤 Idle output: {IDLE_OUTPUT_MODE}" + (f" ({IDLE_AGGREGATE_FRAMES} frames/message after {IDLE_OUTPUT_AFTER_MS}ms quiet)" if IDLE_OUTPUT_MODE != "continuous" else ""))
     logger.info(f"🚀 Pre-warmed Background Audio: ENABLED (pre-loaded at startup)")
     logger.info(f"⏱️ Ultra-Low Latency Mode: ENABLED")
     logger.info("=" * 90)
     
+    if OUTPUT_FRAME_MS not in (20, 40, 60):
+        logger.warning(f"⚠️ OUTPUT_FRAME_MS={OUTPUT_FRAME_MS} is not one of 20/40/60ms")
+    if IDLE_OUTPUT_MODE not in ("continuous", "aggregate", "comfort_noise"):
+        logger.warning(f"⚠️ MAQSAM_IDLE_OUTPUT_MODE={IDLE_OUTPUT_MODE} is not continuous/aggregate/comfort_noise; treating it as aggregate")
+
+def start_warm_room_pool():
+    """Start this process's warm room pool if MAQSAM_WARM_ROOM_POOL is set"""
+    global warm_room_pool
+    if WARM_ROOM_POOL_MIN > 0:
+        warm_room_pool = WarmRoomPool()
+        warm_room_pool.start()
+
+async def main():
+    """Main function to run ultra-optimized Maqsam integration with pre-warmed background audio"""
+    logger.info("🚀 Starting Ultra-Optimized Maqsam-LiveKit Bridge v2.3 (Pre-warmed Background Audio)...")
+    logger.info("=" * 90)
+    
+    if not check_environment():
+        return
+    
+    load_global_background_audio()
+    log_configuration()
+    
     try:
-        # Start monitoring task
-        monitor_task = asyncio.create_task(monitor_connections())
+        # Long-lived LiveKit API client, reused for every dispatch
+        await get_livekit_api(LIVEKIT_URL, LIVEKIT_API_KEY, LIVEKIT_API_SECRET)
+        start_warm_room_pool()
         
-        # Track connections globally
-        original_enforce = enforce_connection_limits
-        async def tracked_enforce_limits(websocket):
-            global total_connections_handled
-            result = await original_enforce(websocket)
-            if result:
-                total_connections_handled += 1
-            return result
+        # Beds missing from the cache convert while calls are already being served
+        background_task = asyncio.create_task(load_cold_background_beds())
         
-        # Replace the function
-        globals()['enforce_connection_limits'] = tracked_enforce_limits
+        # Start monitoring tasks
+        monitor_task = asyncio.create_task(monitor_connections())
+        loop_lag_task = asyncio.create_task(loop_lag_monitor.run())
+        install_drain_signal_handlers()
         
         await asyncio.gather(
             start_maqsam_websocket_server(),
@@ -1581,9 +3349,19 @@ async def main():
             return_exceptions=True
         )
         
+        # Drained: every call has ended (or the drain timed out)
+        background_task.cancel()
+        monitor_task.cancel()
+        loop_lag_task.cancel()
+        if warm_room_pool:
+            await warm_room_pool.stop()
+        await close_livekit_api()
+        
     except KeyboardInterrupt:
         logger.info("👋 Received shutdown signal")
+        background_task.cancel()
         monitor_task.cancel()
+        loop_lag_task.cancel()
         
         # Cleanup thread pool
         audio_processor_pool.shutdown(wait=True)
@@ -1591,13 +3369,159 @@ async def main():
     except Exception as e:
         logger.error(f"❌ Server error: {e}")
         if 'monitor_task' in locals():
+            background_task.cancel()
             monitor_task.cancel()
+            loop_lag_task.cancel()
         audio_processor_pool.shutdown(wait=True)
         raise
 
+async def run_bridge_worker():
+    """Worker process: WebSocket server on the shared SO_REUSEPORT port"""
+    await get_livekit_api(LIVEKIT_URL, LIVEKIT_API_KEY, LIVEKIT_API_SECRET)
+    start_warm_room_pool()
+    # Worker 0 converts beds missing from the cache; the others map its result
+    background_task = asyncio.create_task(load_cold_background_beds(convert=shared_state.worker_index == 0))
+    monitor_task = asyncio.create_task(monitor_connections())
+    loop_lag_task = asyncio.create_task(loop_lag_monitor.run())
+    publish_task = asyncio.create_task(publish_worker_metrics())
+    install_drain_signal_handlers(hot_restart=False)  # The supervisor handles SIGUSR2
+    try:
+        await start_maqsam_websocket_server(reuse_port=True)
+    finally:
+        background_task.cancel()
+        monitor_task.cancel()
+        loop_lag_task.cancel()
+        publish_task.cancel()
+        if warm_room_pool:
+            await warm_room_pool.stop()
+        await close_livekit_api()
+
+async def run_stats_server():
+    """Stats process: serves /health and /stats aggregated from shared worker state"""
+    await start_http_server()
+    await asyncio.Future()  # Run forever
+
+def _run_child(role, worker_index):
+    """Entry point of a forked child; never returns"""
+    exit_code = 0
+    try:
+        signal.signal(signal.SIGINT, signal.SIG_IGN)  # The supervisor owns Ctrl-C
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)  # Workers replace this with a drain once their loop runs
+        signal.signal(signal.SIGUSR2, signal.SIG_IGN)
+        if role == "worker":
+            shared_state.worker_index = worker_index
+            shared_state.reset_worker(worker_index, os.getpid())
+            logger.info(f"👷 Bridge worker {worker_index} started (PID: {os.getpid()})")
+            asyncio.run(run_bridge_worker())
+        else:
+            logger.info(f"📊 Stats server started (PID: {os.getpid()})")
+            asyncio.run(run_stats_server())
+    except Exception as e:
+        logger.error(f"❌ {role} {worker_index} crashed: {e}")
+        exit_code = 1
+    finally:
+        os._exit(exit_code)
+
+def run_bridge_supervisor(num_workers):
+    """Fork `num_workers` bridge workers sharing port 8765 via SO_REUSEPORT, plus one stats server.
+    
+    Everything that should be shared (background loop mmap, shared counters) is created
+    before forking. The supervisor itself never runs an event loop; it only restarts
+    children that exit and forwards shutdown signals. SIGTERM drains the workers (a second
+    signal kills them); SIGUSR2 starts a successor supervisor whose workers bind next to
+    ours, and drains ours once all of them are listening.
+    """
+    global shared_state
+    
+    ready_fd = os.environ.pop("MAQSAM_READY_FD", None)  # Set when started by a hot restart
+    
+    logger.info(f"🚀 Starting Maqsam-LiveKit Bridge supervisor with {num_workers} workers...")
+    logger.info("=" * 90)
+    
+    if not check_environment():
+        return
+    
+    load_global_background_audio()
+    log_configuration()
+    shared_state = SharedBridgeState(num_workers)
+    
+    children = {}  # pid -> (role, worker_index)
+    shutting_down = False
+    restart_requested = False
+    
+    def spawn(role, worker_index):
+        pid = os.fork()
+        if pid == 0:
+            _run_child(role, worker_index)
+        children[pid] = (role, worker_index)
+    
+    def shutdown(signum, frame):
+        nonlocal shutting_down
+        stop_signal = signal.SIGKILL if shutting_down else signal.SIGTERM
+        shutting_down = True
+        logger.info(f"👋 Supervisor received signal {signum}, "
+                    f"{'killing' if stop_signal == signal.SIGKILL else 'draining'} workers")
+        for pid in list(children):
+            try:
+                os.kill(pid, stop_signal)
+            except ProcessLookupError:
+                pass
+    
+    def hot_restart(signum, frame):
+        # Only flag it: spawn_successor blocks, so it runs from the main loop below
+        nonlocal restart_requested
+        restart_requested = True
+    
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGUSR2, hot_restart)
+    
+    for worker_index in range(num_workers):
+        spawn("worker", worker_index)
+    spawn("stats", None)
+    
+    if ready_fd:
+        # Tell the previous supervisor to drain once every one of our workers accepts calls
+        deadline = time.monotonic() + HOT_RESTART_READY_TIMEOUT
+        while shared_state.total("listening") < num_workers and time.monotonic() < deadline:
+            time.sleep(0.1)
+        if shared_state.total("listening") >= num_workers:
+            os.write(int(ready_fd), b"1")
+        os.close(int(ready_fd))
+    
+    while children:
+        if restart_requested:
+            restart_requested = False
+            if not shutting_down:
+                logger.info("♻️ Supervisor hot restart: starting a successor supervisor")
+                if spawn_successor({}) is not None:
+                    shutdown(signal.SIGUSR2, None)
+        
+        # Polled rather than a blocking os.wait(), which PEP 475 retries across signals
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            break
+        if pid == 0:
+            time.sleep(SUPERVISOR_POLL_INTERVAL)
+            continue
+        
+        role, worker_index = children.pop(pid, (None, None))
+        if role is None or shutting_down:
+            continue
+        
+        logger.error(f"❌ {role} {worker_index} (PID: {pid}) exited with status {status}, restarting")
+        time.sleep(1)  # Avoid a tight crash loop
+        spawn(role, worker_index)
+    
+    logger.info("✅ All workers stopped")
+
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        if BRIDGE_WORKERS > 1:
+            run_bridge_supervisor(BRIDGE_WORKERS)
+        else:
+            asyncio.run(main())
     except KeyboardInterrupt:
         logger.info("👋 Shutting down service...")
     except Exception as e:
@@ -1606,4 +3530,4 @@ if __name__ == "__main__":
         # Ensure thread pool is cleaned up
         if 'audio_processor_pool' in globals():
             audio_processor_pool.shutdown(wait=True)
-        logger.info("✅ Ultra-Optimized Maqsam-LiveKit Bridge stopped")
\ No newline at end of file
+        logger.info("✅ Ultra-Optimized Maqsam-LiveKit Bridge stopped")
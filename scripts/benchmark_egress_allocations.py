@@ -0,0 +1,203 @@
+"""
+Allocation benchmark for the Maqsam bridge agent-audio egress path.
+
+Runs one second of agent audio at a time through the egress pipeline (resampled
+8kHz LiveKit frames -> playout buffer -> background mix -> μ-law -> base64
+response.stream message) and uses tracemalloc to count the operations that
+allocate and the bytes they allocate. Compares the original copying pipeline (bytes()
+per frame, bytearray playout buffer, concatenated message) with the current one
+(preallocated playout ring, memoryviews, reusable message buffer).
+
+Every step is one primitive operation, and it counts as allocating when the
+traced memory peaks above where it started. Steps that only write into
+preallocated buffers count as zero. Both paths pay the same for LiveKit's
+frame.data view, audioop's result buffers and the base64 output, which have no
+in-place variants.
+
+Usage:
+    python scripts/benchmark_egress_allocations.py
+
+Options:
+    --seconds: Seconds of audio to measure per pipeline (default: 5)
+    --agent-frame-ms: Duration of each resampled agent frame (default: 10)
+"""
+
+import argparse
+import audioop
+import binascii
+import os
+import random
+import sys
+import tracemalloc
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from livekit import rtc
+
+from maqsam_ws import (
+    BACKGROUND_VOLUME_RATIO,
+    OUTPUT_FRAME_MS,
+    OUTPUT_FRAME_SAMPLES,
+    RESPONSE_STREAM_PREFIX,
+    RESPONSE_STREAM_SUFFIX,
+    TELEPHONY_SAMPLE_RATE,
+    AgentAudioJitterBuffer,
+    OutboundSendQueue,
+)
+
+
+class AllocationMeter:
+    """Counts allocating steps and allocated bytes with tracemalloc"""
+
+    def __init__(self):
+        self.allocations = 0  # Steps that allocated
+        self.bytes_allocated = 0
+
+    def step(self, operation, *args):
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        result = operation(*args)
+        _, peak = tracemalloc.get_traced_memory()
+        if peak > current:
+            self.allocations += 1
+            self.bytes_allocated += peak - current
+        return result
+
+
+def make_agent_frames(frame_samples, count, seed=1234):
+    """Build 8kHz rtc.AudioFrames like the ones the return resampler yields"""
+    rng = random.Random(seed)
+    frames = []
+    for _ in range(count):
+        frame = rtc.AudioFrame.create(TELEPHONY_SAMPLE_RATE, 1, frame_samples)
+        samples = frame.data
+        for i in range(frame_samples):
+            samples[i] = rng.randint(-8000, 8000)
+        frames.append(frame)
+    return frames
+
+
+def make_background_loop(seconds=2):
+    """Pre-attenuated background PCM, as BackgroundAudioManager keeps it"""
+    rng = random.Random(99)
+    noise = bytes(rng.getrandbits(8) for _ in range(TELEPHONY_SAMPLE_RATE * seconds * 2))
+    return memoryview(audioop.mul(noise, 2, BACKGROUND_VOLUME_RATIO))
+
+
+class LegacyPlayoutBuffer(AgentAudioJitterBuffer):
+    """The bytearray playout buffer the ring replaced: copies on every push and pop"""
+
+    def __init__(self):
+        super().__init__()
+        self.buffer = bytearray()
+
+    def push(self, pcm_data):
+        self._observe_arrival(len(pcm_data) // 2)
+        self.buffer += pcm_data
+        overflow = len(self.buffer) - self.max_bytes
+        if overflow > 0:
+            del self.buffer[:overflow]
+
+    def pop_frame(self, num_samples, idle_after):
+        frame_bytes = num_samples * 2
+        if len(self.buffer) < frame_bytes:
+            return None
+        frame = bytes(self.buffer[:frame_bytes])
+        del self.buffer[:frame_bytes]
+        return frame
+
+
+def legacy_pipeline(meter, agent_frames, frames_per_tick, background, ticks):
+    """The egress path before this change, one primitive per step"""
+    buffer = LegacyPlayoutBuffer()
+    frame_bytes = OUTPUT_FRAME_SAMPLES * 2
+    position = 0
+
+    for tick in range(ticks):
+        for frame in agent_frames[tick * frames_per_tick:(tick + 1) * frames_per_tick]:
+            data = meter.step(getattr, frame, "data")
+            pcm = meter.step(lambda: bytes(data[:frame.samples_per_channel * 2]))
+            meter.step(buffer.push, pcm)
+
+        agent_pcm = meter.step(buffer.pop_frame, OUTPUT_FRAME_SAMPLES, 1.0)
+        if agent_pcm is None:
+            continue
+
+        meter.step(audioop.rms, agent_pcm, 2)
+        bg_pcm = meter.step(lambda: background[position:position + frame_bytes])
+        position = (position + frame_bytes) % (len(background) - frame_bytes)
+        mixed = meter.step(audioop.add, agent_pcm, bg_pcm, 2)
+        mulaw = meter.step(audioop.lin2ulaw, mixed, 2)
+
+        payload = meter.step(lambda: binascii.b2a_base64(mulaw, newline=False))
+        message = meter.step(lambda: RESPONSE_STREAM_PREFIX + payload)
+        meter.step(lambda: message + RESPONSE_STREAM_SUFFIX)
+
+
+def current_pipeline(meter, agent_frames, frames_per_tick, background, ticks):
+    """The egress path in maqsam_ws.py, one primitive per step"""
+    buffer = AgentAudioJitterBuffer()
+    send_queue = OutboundSendQueue(websocket=None)
+    frame_bytes = OUTPUT_FRAME_SAMPLES * 2
+    position = 0
+
+    for tick in range(ticks):
+        for frame in agent_frames[tick * frames_per_tick:(tick + 1) * frames_per_tick]:
+            data = meter.step(getattr, frame, "data")
+            meter.step(buffer.push, data)
+
+        agent_pcm = meter.step(buffer.pop_frame, OUTPUT_FRAME_SAMPLES, 1.0)
+        if agent_pcm is None:
+            continue
+
+        meter.step(audioop.rms, agent_pcm, 2)
+        bg_pcm = meter.step(lambda: background[position:position + frame_bytes])
+        position = (position + frame_bytes) % (len(background) - frame_bytes)
+        mixed = meter.step(audioop.add, agent_pcm, bg_pcm, 2)
+        mulaw = meter.step(audioop.lin2ulaw, mixed, 2)
+
+        send_queue.audio.append((mulaw, True))
+        mulaw_data, _ = meter.step(send_queue._coalesce_audio)
+        meter.step(send_queue._encode_audio, mulaw_data)
+
+
+def measure(pipeline, agent_frames, frames_per_tick, background, ticks):
+    meter = AllocationMeter()
+    tracemalloc.start()
+    try:
+        pipeline(meter, agent_frames, frames_per_tick, background, ticks)
+    finally:
+        tracemalloc.stop()
+    return meter
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Count allocations on the Maqsam agent-audio egress path')
+    parser.add_argument('--seconds', type=int, default=5, help='Seconds of audio per pipeline')
+    parser.add_argument('--agent-frame-ms', type=int, default=10, help='Resampled agent frame duration in ms')
+    args = parser.parse_args()
+
+    frames_per_tick = max(1, OUTPUT_FRAME_MS // args.agent_frame_ms)
+    ticks = args.seconds * 1000 // OUTPUT_FRAME_MS
+    frame_samples = TELEPHONY_SAMPLE_RATE * args.agent_frame_ms // 1000
+    agent_frames = make_agent_frames(frame_samples, ticks * frames_per_tick)
+    background = make_background_loop()
+
+    # Warm up both paths so one-off interpreter allocations are not counted
+    measure(legacy_pipeline, agent_frames, frames_per_tick, background, 10)
+    measure(current_pipeline, agent_frames, frames_per_tick, background, 10)
+
+    legacy = measure(legacy_pipeline, agent_frames, frames_per_tick, background, ticks)
+    current = measure(current_pipeline, agent_frames, frames_per_tick, background, ticks)
+
+    print(f"Audio: {args.seconds}s, {OUTPUT_FRAME_MS}ms output frames, {args.agent_frame_ms}ms agent frames")
+    for label, meter in (("Legacy copying path:", legacy), ("Zero-copy path:     ", current)):
+        print(f"{label} {meter.allocations / args.seconds:8.1f} allocating ops/s  "
+              f"{meter.bytes_allocated / args.seconds / 1024:8.1f} KiB allocated/s")
+    print(f"Reduction:            {legacy.allocations / max(1, current.allocations):8.1f}x allocating ops  "
+          f"{legacy.bytes_allocated / max(1, current.bytes_allocated):8.1f}x bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Micro-benchmark for the Maqsam bridge background-audio mixer.
+
+Compares the per-frame mix that runs in production (mix_with_attenuated_background:
+agent PCM plus background PCM attenuated once at load, one saturating add, one μ-law
+encode) against the original path (agent PCM encoded to μ-law, then the per-sample
+Python loop decoding and attenuating both streams) on 20ms frames.
+
+Usage:
+    python scripts/benchmark_mixer.py
+
+Options:
+    --frame-ms: Frame duration in milliseconds (default: 20)
+    --iterations: Number of frames to mix per run (default: 20000)
+"""
+
+import argparse
+import array
+import audioop
+import os
+import random
+import sys
+import time
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from maqsam_ws import BACKGROUND_VOLUME_RATIO, TELEPHONY_SAMPLE_RATE, mix_with_attenuated_background
+
+
+def legacy_mix_audio_samples(agent_mulaw, bg_mulaw, bg_volume_ratio=BACKGROUND_VOLUME_RATIO):
+    """Original per-sample mixer, kept here as the benchmark baseline"""
+    agent_pcm = audioop.ulaw2lin(agent_mulaw, 2)
+    bg_pcm = audioop.ulaw2lin(bg_mulaw, 2)
+
+    agent_len = len(agent_pcm)
+    bg_len = len(bg_pcm)
+    if bg_len < agent_len:
+        repetitions = (agent_len // bg_len) + 1
+        bg_pcm = (bg_pcm * repetitions)[:agent_len]
+    elif bg_len > agent_len:
+        bg_pcm = bg_pcm[:agent_len]
+
+    agent_samples = array.array('h')
+    bg_samples = array.array('h')
+    agent_samples.frombytes(agent_pcm)
+    bg_samples.frombytes(bg_pcm)
+
+    mixed_samples = array.array('h')
+    for i in range(len(agent_samples)):
+        agent_sample = agent_samples[i]
+        bg_sample = int(bg_samples[i] * bg_volume_ratio)
+        mixed_sample = agent_sample + bg_sample
+        mixed_sample = max(-32768, min(32767, mixed_sample))
+        mixed_samples.append(mixed_sample)
+
+    return audioop.lin2ulaw(mixed_samples.tobytes(), 2)
+
+
+def make_frames(frame_samples, count, seed=1234):
+    """Build random agent/background PCM frame pairs"""
+    rng = random.Random(seed)
+    return [
+        (audioop.ulaw2lin(bytes(rng.getrandbits(8) for _ in range(frame_samples)), 2),
+         audioop.ulaw2lin(bytes(rng.getrandbits(8) for _ in range(frame_samples)), 2))
+        for _ in range(count)
+    ]
+
+
+def legacy_inputs(frames):
+    """(agent PCM, background μ-law): the original manager kept the background as μ-law"""
+    return [(agent, audioop.lin2ulaw(bg, 2)) for agent, bg in frames]
+
+
+def current_inputs(frames):
+    """(agent PCM, attenuated background PCM): BackgroundAudioManager attenuates once at load"""
+    return [(agent, audioop.mul(bg, 2, BACKGROUND_VOLUME_RATIO)) for agent, bg in frames]
+
+
+def legacy_mix(agent_pcm, bg_mulaw):
+    """Original per-frame work: encode the agent frame, then the per-sample mixer"""
+    return legacy_mix_audio_samples(audioop.lin2ulaw(agent_pcm, 2), bg_mulaw, BACKGROUND_VOLUME_RATIO)
+
+
+def run(mixer, inputs, iterations):
+    start = time.perf_counter()
+    for i in range(iterations):
+        agent, bg = inputs[i % len(inputs)]
+        mixer(agent, bg)
+    return time.perf_counter() - start
+
+
+def ulaw_code(byte):
+    """Signed position of a μ-law byte on the code scale (adjacent codes differ by 1)"""
+    magnitude = ~byte & 0x7f
+    return -magnitude if ~byte & 0x80 else magnitude
+
+
+def max_code_distance(frames):
+    """Largest distance, in μ-law codes, between the two mixers' output samples.
+
+    audioop.mul floors the scaled background where the legacy loop truncated, and the
+    legacy path quantises the background to μ-law before attenuating it, so a sample
+    can land on an adjacent code.
+    """
+    worst = 0
+    for (agent, bg_mulaw), (_, bg_attenuated) in zip(legacy_inputs(frames), current_inputs(frames)):
+        legacy = legacy_mix(agent, bg_mulaw)
+        fast = mix_with_attenuated_background(agent, bg_attenuated)
+        worst = max(worst, max(abs(ulaw_code(a) - ulaw_code(b)) for a, b in zip(legacy, fast)))
+    return worst
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the Maqsam background-audio mixer')
+    parser.add_argument('--frame-ms', type=int, default=20, help='Frame duration in milliseconds')
+    parser.add_argument('--iterations', type=int, default=20000, help='Frames to mix per run')
+    args = parser.parse_args()
+
+    frame_samples = TELEPHONY_SAMPLE_RATE * args.frame_ms // 1000
+    frames = make_frames(frame_samples, 64)
+    legacy = legacy_inputs(frames)
+    current = current_inputs(frames)
+
+    # Warm up both paths
+    run(legacy_mix, legacy, 100)
+    run(mix_with_attenuated_background, current, 100)
+
+    legacy_time = run(legacy_mix, legacy, args.iterations)
+    fast_time = run(mix_with_attenuated_background, current, args.iterations)
+
+    legacy_us = legacy_time / args.iterations * 1e6
+    fast_us = fast_time / args.iterations * 1e6
+    audio_seconds = args.iterations * args.frame_ms / 1000
+
+    print(f"Frame: {args.frame_ms}ms ({frame_samples} samples), {args.iterations} frames")
+    print(f"Legacy per-sample loop: {legacy_us:8.2f} µs/frame  ({legacy_time / audio_seconds * 100:.3f}% of one core per call)")
+    print(f"Production mixer:       {fast_us:8.2f} µs/frame  ({fast_time / audio_seconds * 100:.3f}% of one core per call)")
+    print(f"Speedup:                {legacy_us / fast_us:8.1f}x")
+    print(f"Max difference vs legacy: {max_code_distance(frames[:8])} μ-law code(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,371 @@
+"""
+Offline load generator for the Maqsam-LiveKit bridge.
+
+Starts maqsam_ws.py in a child process with LiveKit replaced by a local echo
+agent, then opens N simulated Maqsam sessions against it. Each session sends
+session.setup and paced 20ms audio.input μ-law frames (synthetic tone bursts,
+or a WAV recording gated into bursts). The echo agent plays the caller's audio
+back through the real return path: resampler, jitter buffer, output clock and
+mixer.
+
+Per call it reports end-to-end latency (burst sent -> burst heard back), the
+interarrival jitter of response.stream frames and missing frames. For the
+bridge process it reports CPU and RSS per call from /proc, and drop/underrun
+counters from /metrics. Nothing leaves the machine, so it can run in CI.
+
+Usage:
+    python scripts/load_test_bridge.py --calls 50 --duration 30
+
+Options:
+    --calls: Concurrent simulated calls (default: 20)
+    --duration: Seconds of audio per call (default: 20)
+    --ramp: Seconds over which calls are started (default: 2)
+    --wav: WAV recording to send instead of synthetic tones (any rate, mono)
+    --agent-delay-ms: Simulated agent turnaround before echoing (default: 0)
+    --background: Load and mix bg.mp3 as in production (needs ffmpeg)
+    --max-p95-latency-ms: Exit with status 1 if p95 latency exceeds this
+    --verbose: Show bridge INFO logs
+"""
+
+import argparse
+import asyncio
+import audioop
+import base64
+import json
+import logging
+import math
+import os
+import socket
+import subprocess
+import sys
+import time
+import wave
+
+import aiohttp
+import websockets
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import maqsam_ws
+
+BRIDGE_URL = "ws://127.0.0.1:8765"
+METRICS_URL = "http://127.0.0.1:8080/metrics"
+FRAME_MS = 20
+FRAME_SAMPLES = maqsam_ws.TELEPHONY_SAMPLE_RATE * FRAME_MS // 1000
+BURST_PERIOD_MS = 1000      # One burst of audio per second...
+BURST_LENGTH_MS = 400       # ...followed by silence, so each onset can be timed on the way back
+ONSET_RMS = 1000            # Decoded RMS above this counts as "echo heard"
+SILENCE = b'\xff' * FRAME_SAMPLES
+
+
+# ---------------------------------------------------------------------------
+# Bridge side (child process): the real server with LiveKit stubbed out
+# ---------------------------------------------------------------------------
+
+class EchoAudioSource(maqsam_ws.OptimizedMaqsamAudioSource):
+    """Caller audio source whose 'agent' answers with the caller's own audio.
+
+    Every 48kHz frame the bridge captures is also run through the handler's return
+    resampler and queued for the output clock after the simulated agent delay, exactly
+    as stream_agent_audio_ultra_fast would queue a frame received from LiveKit.
+    """
+
+    def __init__(self, handler, agent_delay):
+        super().__init__()
+        self.handler = handler
+        self.agent_delay = agent_delay
+
+    async def capture_frame(self, frame):
+        await super().capture_frame(frame)
+        pcm_chunks = [bytes(f.data[:f.samples_per_channel * 2])
+                      for f in self.handler.return_resampler.push(frame)]
+        if pcm_chunks:
+            asyncio.get_running_loop().call_later(self.agent_delay, self._deliver, pcm_chunks)
+
+    def _deliver(self, pcm_chunks):
+        handler = self.handler
+        if not handler.call_active:
+            return
+        handler.timeline.mark("first_agent_frame")
+        for pcm in pcm_chunks:
+            if handler._queue_agent_audio(pcm):
+                handler.stats["audio_frames_received_from_agent"] += 1
+
+
+def install_echo_agent(agent_delay):
+    """Replace the LiveKit connect with a local echo agent"""
+
+    async def connect_to_echo_agent(self):
+        self.audio_source = EchoAudioSource(self, agent_delay)
+        await self.audio_source.start_processing()
+        self.connected_to_livekit = True
+        self.timeline.mark("room_connected")
+        self.timeline.mark("agent_joined")
+
+    maqsam_ws.OptimizedMaqsamWebSocketHandler._connect_to_livekit_ultra_fast = connect_to_echo_agent
+
+
+async def serve_stub_bridge(args):
+    # Every simulated call comes from 127.0.0.1
+    maqsam_ws.rate_limiter = maqsam_ws.ConnectionRateLimiter(capacity=1_000_000)
+    maqsam_ws.CALL_TIMELINE_LOG = ""
+    if args.background:
+        maqsam_ws.load_global_background_audio()
+        await maqsam_ws.load_cold_background_beds()
+    install_echo_agent(args.agent_delay_ms / 1000)
+
+    lag_task = asyncio.create_task(maqsam_ws.loop_lag_monitor.run())
+    try:
+        await asyncio.gather(maqsam_ws.start_maqsam_websocket_server(), maqsam_ws.start_http_server())
+    finally:
+        lag_task.cancel()
+
+
+# ---------------------------------------------------------------------------
+# Caller side (parent process): simulated Maqsam sessions
+# ---------------------------------------------------------------------------
+
+def tone_frames(seconds, freq=440.0, amplitude=8000):
+    """μ-law 20ms frames of a sine tone"""
+    total = int(seconds * maqsam_ws.TELEPHONY_SAMPLE_RATE)
+    samples = [int(amplitude * math.sin(2 * math.pi * freq * n / maqsam_ws.TELEPHONY_SAMPLE_RATE))
+               for n in range(total)]
+    pcm = b''.join(s.to_bytes(2, 'little', signed=True) for s in samples)
+    mulaw = audioop.lin2ulaw(pcm, 2)
+    return [mulaw[i:i + FRAME_SAMPLES] for i in range(0, len(mulaw) - FRAME_SAMPLES + 1, FRAME_SAMPLES)]
+
+
+def wav_frames(path):
+    """μ-law 20ms frames of a WAV recording, downmixed and resampled to 8kHz"""
+    with wave.open(path, 'rb') as wav_file:
+        pcm = wav_file.readframes(wav_file.getnframes())
+        width, channels, rate = wav_file.getsampwidth(), wav_file.getnchannels(), wav_file.getframerate()
+    if width != 2:
+        pcm = audioop.lin2lin(pcm, width, 2)
+    if channels == 2:
+        pcm = audioop.tomono(pcm, 2, 0.5, 0.5)
+    if rate != maqsam_ws.TELEPHONY_SAMPLE_RATE:
+        pcm, _ = audioop.ratecv(pcm, 2, 1, rate, maqsam_ws.TELEPHONY_SAMPLE_RATE, None)
+    mulaw = audioop.lin2ulaw(pcm, 2)
+    return [mulaw[i:i + FRAME_SAMPLES] for i in range(0, len(mulaw) - FRAME_SAMPLES + 1, FRAME_SAMPLES)]
+
+
+def frame_rms(mulaw):
+    return audioop.rms(audioop.ulaw2lin(mulaw, 2), 2)
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def simulate_call(call_index, source_frames, duration, start_delay):
+    """One Maqsam session: returns per-call results"""
+    await asyncio.sleep(start_delay)
+    result = {"call": call_index, "error": None, "latencies_ms": [], "jitter_ms": 0.0,
+              "frames_expected": 0, "frames_received": 0}
+
+    frames_per_burst_period = BURST_PERIOD_MS // FRAME_MS
+    frames_per_burst = BURST_LENGTH_MS // FRAME_MS
+    total_frames = int(duration * 1000 / FRAME_MS)
+    onsets = []  # Send time of each burst's first frame
+
+    try:
+        async with websockets.connect(BRIDGE_URL, max_size=None, compression=None) as websocket:
+            await websocket.send(json.dumps({
+                "type": "session.setup",
+                "apiKey": maqsam_ws.VALID_AUTH_TOKEN,
+                "data": {"context": {"id": f"load-{call_index}", "caller_number": f"9710000{call_index:05d}",
+                                     "direction": "inbound"}}
+            }))
+            while json.loads(await websocket.recv()).get("type") != "session.ready":
+                pass
+
+            async def receive():
+                last_arrival = None
+                jitter = 0.0
+                next_onset = 0
+                async for message in websocket:
+                    now = time.monotonic()
+                    data = json.loads(message)
+                    if data.get("type") != "response.stream":
+                        continue
+                    audio = base64.b64decode(data["data"]["audio"])
+                    result["frames_received"] += len(audio) // FRAME_SAMPLES  # The bridge may coalesce frames
+                    if last_arrival is not None:
+                        jitter += (abs(now - last_arrival - FRAME_MS / 1000) - jitter) / 16
+                    last_arrival = now
+
+                    # Latency: first loud frame back after each burst was sent
+                    if next_onset < len(onsets) and now >= onsets[next_onset]:
+                        if frame_rms(audio) > ONSET_RMS:
+                            result["latencies_ms"].append((now - onsets[next_onset]) * 1000)
+                            next_onset += 1
+                    result["jitter_ms"] = jitter * 1000
+
+            receiver = asyncio.create_task(receive())
+
+            # Paced sender on absolute deadlines, like Maqsam's media clock
+            start = time.monotonic()
+            for n in range(total_frames):
+                delay = start + n * FRAME_MS / 1000 - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                in_burst = n % frames_per_burst_period < frames_per_burst
+                if n % frames_per_burst_period == 0:
+                    onsets.append(time.monotonic())
+                frame = source_frames[n % len(source_frames)] if in_burst else SILENCE
+                await websocket.send(json.dumps({
+                    "type": "audio.input",
+                    "data": {"audio": base64.b64encode(frame).decode()}
+                }))
+
+            await asyncio.sleep(0.5)  # Let the tail of the echo drain
+            result["frames_expected"] = total_frames  # Every caller frame should come back once
+            receiver.cancel()
+    except Exception as e:
+        result["error"] = repr(e)
+    return result
+
+
+def read_process_usage(pid):
+    """(cpu_seconds, rss_bytes) of a process, from /proc"""
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    cpu_seconds = (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    with open(f"/proc/{pid}/status") as f:
+        rss_kb = next(int(line.split()[1]) for line in f if line.startswith("VmRSS:"))
+    return cpu_seconds, rss_kb * 1024
+
+
+async def fetch_bridge_metrics():
+    """Unlabelled samples from the bridge's /metrics"""
+    async with aiohttp.ClientSession() as session:
+        async with session.get(METRICS_URL) as response:
+            text = await response.text()
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#") and "{" not in line:
+            name, value = line.split()
+            samples[name] = float(value)
+    return samples
+
+
+def wait_for_port(port, timeout=15.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return True
+        except OSError:
+            time.sleep(0.1)
+    return False
+
+
+async def run_load(args, bridge_pid):
+    source_frames = wav_frames(args.wav) if args.wav else tone_frames(BURST_LENGTH_MS / 1000)
+
+    cpu_idle, rss_idle = read_process_usage(bridge_pid)
+    run_start = time.monotonic()
+
+    tasks = [asyncio.create_task(simulate_call(i, source_frames, args.duration, args.ramp * i / args.calls))
+             for i in range(args.calls)]
+
+    # Sample the bridge once every call is up
+    await asyncio.sleep(args.ramp + min(args.duration / 2, 5))
+    _, rss_loaded = read_process_usage(bridge_pid)
+
+    results = await asyncio.gather(*tasks)
+    cpu_done, _ = read_process_usage(bridge_pid)
+    elapsed = time.monotonic() - run_start
+    bridge_metrics = await fetch_bridge_metrics()
+    return results, {
+        "cpu_seconds": cpu_done - cpu_idle,
+        "elapsed": elapsed,
+        "rss_idle": rss_idle,
+        "rss_loaded": rss_loaded,
+    }, bridge_metrics
+
+
+def report(args, results, usage, bridge_metrics):
+    ok = [r for r in results if not r["error"]]
+    failed = [r for r in results if r["error"]]
+    latencies = [latency for r in ok for latency in r["latencies_ms"]]
+    jitters = [r["jitter_ms"] for r in ok]
+    missing = [max(0, r["frames_expected"] - r["frames_received"]) for r in ok]
+    per_call_p95 = [percentile(r["latencies_ms"], 0.95) for r in ok if r["latencies_ms"]]
+
+    print(f"Calls: {len(ok)}/{args.calls} completed, {args.duration}s each"
+          f"{' (background mixed)' if args.background else ''}")
+    for r in failed[:5]:
+        print(f"  call {r['call']} failed: {r['error']}")
+    print(f"End-to-end latency ms   p50 {percentile(latencies, 0.50):7.1f}  p95 {percentile(latencies, 0.95):7.1f}"
+          f"  p99 {percentile(latencies, 0.99):7.1f}  (worst per-call p95 {max(per_call_p95, default=0):.1f})")
+    print(f"Outbound jitter ms      p50 {percentile(jitters, 0.50):7.2f}  p95 {percentile(jitters, 0.95):7.2f}"
+          f"  max {max(jitters, default=0):7.2f}")
+    print(f"Missing outbound frames total {sum(missing)}, worst call {max(missing, default=0)}")
+
+    calls = max(len(ok), 1)
+    cpu_percent = usage["cpu_seconds"] / usage["elapsed"] * 100
+    rss_per_call = (usage["rss_loaded"] - usage["rss_idle"]) / calls / 1024
+    print(f"Bridge CPU: {cpu_percent:.1f}% of one core ({cpu_percent / calls:.2f}% per call)")
+    print(f"Bridge RSS: {usage['rss_idle'] / 2**20:.1f} MiB idle, {usage['rss_loaded'] / 2**20:.1f} MiB loaded"
+          f" ({rss_per_call:.0f} KiB per call)")
+
+    counters = ("maqsam_inbound_frames_dropped_total", "maqsam_agent_audio_dropped_bytes_total",
+                "maqsam_agent_audio_underruns_total", "maqsam_output_late_ticks_total",
+                "maqsam_barge_ins_total", "maqsam_slow_callbacks_total", "maqsam_rejected_loop_lag_total")
+    print("Bridge counters: " + ", ".join(
+        f"{name.removeprefix('maqsam_').removesuffix('_total')}={bridge_metrics.get(name, 0):.0f}"
+        for name in counters))
+
+    p95 = percentile(latencies, 0.95)
+    if failed or (args.max_p95_latency_ms and p95 > args.max_p95_latency_ms):
+        return 1
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline load test for the Maqsam-LiveKit bridge')
+    parser.add_argument('--calls', type=int, default=20, help='Concurrent simulated calls')
+    parser.add_argument('--duration', type=float, default=20, help='Seconds of audio per call')
+    parser.add_argument('--ramp', type=float, default=2, help='Seconds over which calls are started')
+    parser.add_argument('--wav', help='WAV recording to send instead of synthetic tones')
+    parser.add_argument('--agent-delay-ms', type=float, default=0, help='Simulated agent turnaround')
+    parser.add_argument('--background', action='store_true', help='Mix bg.mp3 as in production')
+    parser.add_argument('--max-p95-latency-ms', type=float, help='Fail if p95 latency exceeds this')
+    parser.add_argument('--verbose', action='store_true', help='Show bridge INFO logs')
+    parser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)  # Child mode
+    args = parser.parse_args()
+
+    if args.serve:
+        if not args.verbose:
+            logging.getLogger().setLevel(logging.WARNING)
+        asyncio.run(serve_stub_bridge(args))
+        return
+
+    child_args = [sys.executable, os.path.abspath(__file__), '--serve',
+                  '--agent-delay-ms', str(args.agent_delay_ms)]
+    if args.background:
+        child_args.append('--background')
+    if args.verbose:
+        child_args.append('--verbose')
+    bridge = subprocess.Popen(child_args)
+
+    try:
+        if not wait_for_port(8765) or not wait_for_port(8080):
+            print("Bridge did not start")
+            sys.exit(1)
+        results, usage, bridge_metrics = asyncio.run(run_load(args, bridge.pid))
+        exit_code = report(args, results, usage, bridge_metrics)
+    finally:
+        bridge.terminate()
+        bridge.wait(timeout=10)
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Barge-in gating on the agent-state path of the Maqsam bridge.
+
+When the agent's lk.agent.state goes speaking -> listening, the bridge flushes
+queued agent audio only if the caller is mid-onset (BARGE_IN_MIN_SPEECH_MS of
+consecutive speech, the same rule as the VAD path). These tests drive the real
+participant_attributes_changed handler through a stand-in room.
+
+Usage:
+    python -m pytest tests/test_barge_in.py
+"""
+
+import asyncio
+import audioop
+import os
+import sys
+from types import SimpleNamespace
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from maqsam_ws import (
+    AGENT_STATE_ATTRIBUTE,
+    BARGE_IN_MIN_SPEECH_MS,
+    TELEPHONY_SAMPLE_RATE,
+    OptimizedMaqsamWebSocketHandler,
+)
+
+CHUNK_MS = 20
+AGENT = SimpleNamespace(identity="agent-test")
+
+
+class FakeRoom:
+    """Collects the handlers registered with room.on(...)"""
+
+    def __init__(self):
+        self.handlers = {}
+
+    def on(self, event):
+        def register(handler):
+            self.handlers[event] = handler
+            return handler
+        return register
+
+
+def loud_chunk():
+    """20ms of loud caller audio as μ-law"""
+    samples = TELEPHONY_SAMPLE_RATE * CHUNK_MS // 1000
+    pcm = b"".join(int(8000 if n % 16 < 8 else -8000).to_bytes(2, "little", signed=True) for n in range(samples))
+    return audioop.lin2ulaw(pcm, 2)
+
+
+async def agent_stops_speaking_after(caller_chunks):
+    """Feed caller chunks to the VAD, then switch the agent speaking -> listening; returns the barge-in sources"""
+    handler = OptimizedMaqsamWebSocketHandler(websocket=None)
+    handler.room = FakeRoom()
+    handler._setup_room_events()
+
+    barge_ins = []
+
+    async def record_barge_in(source):
+        barge_ins.append(source)
+
+    handler._handle_barge_in = record_barge_in
+
+    for chunk in caller_chunks:
+        handler.barge_in.process(chunk)
+
+    on_attributes_changed = handler.room.handlers["participant_attributes_changed"]
+    on_attributes_changed({AGENT_STATE_ATTRIBUTE: "speaking"}, AGENT)
+    on_attributes_changed({AGENT_STATE_ATTRIBUTE: "listening"}, AGENT)
+    await asyncio.sleep(0)  # Let a scheduled barge-in task run
+    return barge_ins
+
+
+def test_single_loud_chunk_does_not_flush():
+    assert asyncio.run(agent_stops_speaking_after([loud_chunk()])) == []
+
+
+def test_sustained_speech_flushes():
+    chunks = [loud_chunk()] * -(-BARGE_IN_MIN_SPEECH_MS // CHUNK_MS)
+    assert asyncio.run(agent_stops_speaking_after(chunks)) == ["agent_state"]
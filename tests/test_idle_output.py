@@ -0,0 +1,69 @@
+"""
+Idle output of the Maqsam bridge (MAQSAM_IDLE_OUTPUT_MODE aggregate / comfort_noise).
+
+While the agent is quiet the output clock drops the silence the agent stream keeps
+delivering. Whether the agent is quiet is decided per output frame, so a quiet
+onset behind a run of silence still counts as speech and is sent, not discarded.
+
+Usage:
+    python -m pytest tests/test_idle_output.py
+"""
+
+import asyncio
+import audioop
+import os
+import sys
+from types import SimpleNamespace
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import maqsam_ws
+from maqsam_ws import (
+    AGENT_AUDIBLE_RMS,
+    OUTPUT_FRAME_MS,
+    OUTPUT_FRAME_SAMPLES,
+    OptimizedMaqsamWebSocketHandler,
+)
+
+OPEN = SimpleNamespace(state=maqsam_ws.websockets.protocol.State.OPEN)
+
+
+def tone(amplitude):
+    """One output frame of 16-bit PCM square wave at the given amplitude"""
+    return b"".join(int(amplitude if n % 16 < 8 else -amplitude).to_bytes(2, "little", signed=True)
+                    for n in range(OUTPUT_FRAME_SAMPLES))
+
+
+async def frames_sent_for(agent_frames):
+    """Buffer agent PCM for a listening agent, run the output clock briefly and return the queued μ-law frames"""
+    handler = OptimizedMaqsamWebSocketHandler(websocket=OPEN)
+    handler.background_cursor = None
+    handler.session_ready = True
+    handler.agent_state = "listening"
+    for pcm in agent_frames:
+        handler.agent_audio_buffer.push(pcm)
+
+    clock = asyncio.create_task(handler._run_output_clock())
+    await asyncio.sleep(OUTPUT_FRAME_MS * (len(agent_frames) + 3) / 1000)
+    handler.call_active = False
+    clock.cancel()
+    return [bytes(mulaw) for mulaw, has_agent_audio in handler.send_queue.audio if has_agent_audio]
+
+
+def test_quiet_onset_after_silence_reaches_the_send_queue(monkeypatch):
+    monkeypatch.setattr(maqsam_ws, "IDLE_OUTPUT_MODE", "aggregate")
+    onset = tone(500)
+    agent_frames = [bytes(OUTPUT_FRAME_SAMPLES * 2)] * 3 + [onset]
+    # Averaged over the whole buffer the onset would look like silence
+    assert audioop.rms(b"".join(agent_frames), 2) <= AGENT_AUDIBLE_RMS < audioop.rms(onset, 2)
+
+    sent = asyncio.run(frames_sent_for(agent_frames))
+
+    assert audioop.lin2ulaw(onset, 2) in sent
+
+
+def test_silence_alone_is_dropped_while_idle(monkeypatch):
+    monkeypatch.setattr(maqsam_ws, "IDLE_OUTPUT_MODE", "aggregate")
+
+    assert asyncio.run(frames_sent_for([bytes(OUTPUT_FRAME_SAMPLES * 2)] * 4)) == []
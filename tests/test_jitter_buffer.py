@@ -0,0 +1,119 @@
+"""
+Agent playout buffer (AgentAudioJitterBuffer) of the Maqsam bridge.
+
+Covers reads and writes across the end of the preallocated ring, the adaptive
+target depth growing with interarrival jitter and shrinking back once arrivals
+steady, and underrun / re-buffering. Arrival times come from a fake clock.
+
+Usage:
+    python -m pytest tests/test_jitter_buffer.py
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import maqsam_ws
+from maqsam_ws import (
+    JITTER_BUFFER_MAX_MS,
+    JITTER_BUFFER_MIN_MS,
+    OUTPUT_FRAME_MS,
+    OUTPUT_FRAME_SAMPLES,
+    AgentAudioJitterBuffer,
+)
+
+FRAME_BYTES = OUTPUT_FRAME_SAMPLES * 2
+IDLE_AFTER = 0.1
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def advance(self, ms):
+        self.now += ms / 1000
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(maqsam_ws.time, "monotonic", fake.monotonic)
+    return fake
+
+
+def frame(value):
+    """One output frame of PCM whose bytes are all `value`"""
+    return bytes([value]) * FRAME_BYTES
+
+
+def test_frames_read_back_in_order_across_the_ring_wrap(clock):
+    # 2.5 frames of ring: the third frame is written and read across the wrap
+    buffer = AgentAudioJitterBuffer(max_ms=OUTPUT_FRAME_MS * 5 // 2)
+    buffer.push(frame(1))
+    buffer.push(frame(2))
+    assert bytes(buffer.pop_frame(OUTPUT_FRAME_SAMPLES, IDLE_AFTER)) == frame(1)
+
+    buffer.push(frame(3))
+    assert buffer.read_pos + buffer.size > buffer.max_bytes
+    assert bytes(buffer.pop_frame(OUTPUT_FRAME_SAMPLES, IDLE_AFTER)) == frame(2)
+    assert bytes(buffer.pop_frame(OUTPUT_FRAME_SAMPLES, IDLE_AFTER)) == frame(3)
+    assert buffer.size == 0
+
+
+def test_push_past_the_cap_drops_the_oldest_audio(clock):
+    buffer = AgentAudioJitterBuffer(max_ms=OUTPUT_FRAME_MS * 2)
+    for value in (1, 2, 3):
+        buffer.push(frame(value))
+
+    assert buffer.dropped_bytes == FRAME_BYTES
+    assert bytes(buffer.pop_frame(OUTPUT_FRAME_SAMPLES, IDLE_AFTER)) == frame(2)
+    assert bytes(buffer.pop_frame(OUTPUT_FRAME_SAMPLES, IDLE_AFTER)) == frame(3)
+
+
+def test_target_depth_grows_with_jitter_and_shrinks_when_arrivals_steady(clock):
+    buffer = AgentAudioJitterBuffer()
+    assert buffer.target_ms == JITTER_BUFFER_MIN_MS
+
+    # Bursty arrivals: 20ms frames landing 0ms and 200ms apart
+    for n in range(100):
+        clock.advance(0 if n % 2 else 200)
+        buffer.push(frame(0))
+        buffer.clear()
+    assert buffer.target_ms == JITTER_BUFFER_MAX_MS
+
+    # Arrivals paced at the media rate let the estimate decay back to the floor
+    for _ in range(200):
+        clock.advance(OUTPUT_FRAME_MS)
+        buffer.push(frame(0))
+        buffer.clear()
+    assert buffer.target_ms == JITTER_BUFFER_MIN_MS
+
+
+def test_underrun_returns_none_and_rebuffers(clock):
+    buffer = AgentAudioJitterBuffer()
+    buffer.push(frame(1))
+    assert bytes(buffer.pop_frame(OUTPUT_FRAME_SAMPLES, IDLE_AFTER)) == frame(1)
+
+    # Stream still active but nothing buffered: an underrun, not the end of the utterance
+    assert buffer.pop_frame(OUTPUT_FRAME_SAMPLES, IDLE_AFTER) is None
+    assert buffer.underruns == 1
+    assert not buffer.playing
+
+    # Less than the target depth is held back until the talkspurt is buffered again
+    half = frame(2)[:FRAME_BYTES // 2]
+    buffer.push(half)
+    assert buffer.pop_frame(OUTPUT_FRAME_SAMPLES, IDLE_AFTER) is None
+    assert buffer.underruns == 1
+
+    # Once the stream goes idle the remainder plays out padded with silence
+    clock.advance(IDLE_AFTER * 1000)
+    assert bytes(buffer.pop_frame(OUTPUT_FRAME_SAMPLES, IDLE_AFTER)) == half + bytes(FRAME_BYTES // 2)
+    assert buffer.pop_frame(OUTPUT_FRAME_SAMPLES, IDLE_AFTER) is None
+    assert buffer.underruns == 1
@@ -0,0 +1,74 @@
+"""
+Per-IP connection rate limiting (ConnectionRateLimiter) of the Maqsam bridge.
+
+Covers the token bucket (burst, rejection, refill over the window) and the bounded
+LRU table: past max_ips the least recently seen IP is dropped, and buckets that
+have refilled completely are swept. Times are passed in explicitly.
+
+Usage:
+    python -m pytest tests/test_rate_limiter.py
+"""
+
+import os
+import sys
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from maqsam_ws import ConnectionRateLimiter
+
+CAPACITY = 4
+WINDOW = 8  # One token back every 2 seconds
+
+
+def connect(limiter, client_ip, now):
+    """One connection attempt the way the server makes it; True if accepted"""
+    if limiter.rate_limited(client_ip, now):
+        return False
+    limiter.record_attempt(client_ip, now)
+    return True
+
+
+def test_burst_up_to_capacity_then_reject():
+    limiter = ConnectionRateLimiter(capacity=CAPACITY, window=WINDOW)
+
+    assert [connect(limiter, "10.0.0.1", 0.0) for _ in range(CAPACITY + 1)] == [True] * CAPACITY + [False]
+    assert limiter.rejected == 1
+    assert connect(limiter, "10.0.0.2", 0.0)  # Buckets are per IP
+
+
+def test_tokens_refill_at_capacity_per_window():
+    limiter = ConnectionRateLimiter(capacity=CAPACITY, window=WINDOW)
+    for _ in range(CAPACITY):
+        connect(limiter, "10.0.0.1", 0.0)
+
+    assert not connect(limiter, "10.0.0.1", 1.9)
+    assert connect(limiter, "10.0.0.1", 2.0)
+    assert not connect(limiter, "10.0.0.1", 2.0)
+
+    # A long pause refills to capacity, never beyond it
+    now = 2.0 + WINDOW * 10
+    assert [connect(limiter, "10.0.0.1", now) for _ in range(CAPACITY + 1)] == [True] * CAPACITY + [False]
+
+
+def test_table_at_the_ip_cap_evicts_the_least_recently_seen():
+    limiter = ConnectionRateLimiter(max_ips=3, capacity=CAPACITY, window=WINDOW)
+    for n, client_ip in enumerate(["10.0.0.1", "10.0.0.2", "10.0.0.3"]):
+        connect(limiter, client_ip, n * 0.1)
+    connect(limiter, "10.0.0.1", 0.3)  # Seen again: now the most recent
+
+    connect(limiter, "10.0.0.4", 0.4)
+
+    assert list(limiter.buckets) == ["10.0.0.3", "10.0.0.1", "10.0.0.4"]
+    assert limiter.table_evictions == 1
+    assert limiter.metrics()["tracked_ips"] == 3
+
+
+def test_refilled_buckets_are_swept():
+    limiter = ConnectionRateLimiter(capacity=CAPACITY, window=WINDOW)
+    connect(limiter, "10.0.0.1", 0.0)
+    connect(limiter, "10.0.0.2", 5.0)
+
+    assert limiter.evict_expired(WINDOW) == 1
+    assert list(limiter.buckets) == ["10.0.0.2"]
+    assert limiter.table_evictions == 0
@@ -0,0 +1,94 @@
+"""
+Outbound send queue (OutboundSendQueue) of the Maqsam bridge.
+
+Covers what is dropped when the queue is full (background before agent speech,
+oldest first) and that frames coalesced into one response.stream message keep
+their order, with control messages going out ahead of audio.
+
+Usage:
+    python -m pytest tests/test_send_queue.py
+"""
+
+import asyncio
+import base64
+import json
+import os
+import sys
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from maqsam_ws import (
+    OUTPUT_FRAME_SAMPLES,
+    SEND_COALESCE_MAX_FRAMES,
+    OutboundSendQueue,
+)
+
+
+class FakeWebSocket:
+    """Records every sent message, copied because audio messages reuse one buffer"""
+
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, message, text=False):
+        self.sent.append(bytes(message) if not isinstance(message, str) else message.encode())
+
+
+def frame(value):
+    """One outbound μ-law frame whose bytes are all `value`"""
+    return bytes([value]) * OUTPUT_FRAME_SAMPLES
+
+
+def queued_frames(queue):
+    return [mulaw[0] for mulaw, _ in queue.audio]
+
+
+async def drain(queue):
+    """Run the writer until everything queued is sent; returns the sent messages as dicts"""
+    queue.close()
+    await queue.run()
+    return [json.loads(message) for message in queue.websocket.sent]
+
+
+def audio_payload(message):
+    return base64.b64decode(message["data"]["audio"])
+
+
+def test_full_queue_drops_the_oldest_background_frame_first():
+    queue = OutboundSendQueue(FakeWebSocket(), max_frames=3)
+    queue.put_audio(frame(1), has_agent_audio=True)
+    queue.put_audio(frame(2), has_agent_audio=False)
+    queue.put_audio(frame(3), has_agent_audio=False)
+    queue.put_audio(frame(4), has_agent_audio=True)
+
+    assert queued_frames(queue) == [1, 3, 4]
+    assert queue.dropped_background_frames == 1
+    assert queue.dropped_agent_frames == 0
+
+
+def test_full_queue_of_agent_speech_drops_the_oldest_frame():
+    queue = OutboundSendQueue(FakeWebSocket(), max_frames=3)
+    for value in range(1, 6):
+        queue.put_audio(frame(value), has_agent_audio=True)
+
+    assert queued_frames(queue) == [3, 4, 5]
+    assert queue.dropped_agent_frames == 2
+    assert queue.dropped_background_frames == 0
+
+
+def test_coalesced_frames_keep_their_order():
+    queue = OutboundSendQueue(FakeWebSocket(), max_frames=SEND_COALESCE_MAX_FRAMES * 2)
+    values = list(range(1, SEND_COALESCE_MAX_FRAMES + 3))
+    for value in values:
+        queue.put_audio(frame(value), has_agent_audio=value % 2 == 0)
+    queue.put_control('{"type": "response.interrupt"}')
+
+    messages = asyncio.run(drain(queue))
+
+    assert messages[0] == {"type": "response.interrupt"}
+    payload = b"".join(audio_payload(message) for message in messages[1:])
+    assert payload == b"".join(frame(value) for value in values)
+    assert len(messages) == 3  # One full coalesced message and the remainder
+    assert queue.frames_sent == len(values)
+    assert queue.coalesced_frames == len(values) - 2
@@ -1,38 +1,39 @@
-import subprocess
 import argparse
-import json
+import asyncio
+import os
+import secrets
+import string
 
-def run_livekit_dispatch(metadata, contact_number, agent_name):
-    """Run the LiveKit dispatch command with the provided inputs."""
+from utils.livekit_client import get_livekit_api, create_agent_dispatch
+
+LIVEKIT_URL = os.environ.get("LIVEKIT_URL")
+LIVEKIT_API_KEY = os.environ.get("LIVEKIT_API_KEY")
+LIVEKIT_API_SECRET = os.environ.get("LIVEKIT_API_SECRET")
+
+
+def new_room_name():
+    """Random room name in the same form `lk dispatch create --new-room` uses"""
+    alphabet = string.ascii_letters + string.digits
+    return "room-" + "".join(secrets.choice(alphabet) for _ in range(12))
+
+
+async def run_livekit_dispatch(metadata, contact_number, agent_name):
+    """Dispatch the agent into a new room through the shared LiveKit API client."""
 
     # print("Running LiveKit dispatch command...")
     # print(f"Metadata: {metadata}")
     # Ensure contact number has "+" prefix
     if not contact_number.startswith('+'):
         contact_number = '+' + contact_number
-    
-    command = [
-        "lk",
-        "dispatch",
-        "create",
-        "--new-room",
-        "--agent-name",
-        agent_name,
-        "--metadata",
-        json.dumps(metadata),
-        "--api-key",
-        "APIoLr2sRCRJWY5",
-        "--api-secret",
-        "yE3wUkoQxjWjhteMAed9ubm5mYg3iOfPT6qBQfffzgJC",
-        "--url",
-        "wss://setupforretell-hk7yl5xf.livekit.cloud",
-    ]
-    
+
+    room_name = new_room_name()
+
     try:
-        result = subprocess.run(command, capture_output=True, text=True, check=True)
-        return {"success": True, "output": result.stdout, "error": None}
-    except subprocess.CalledProcessError as e:
-        return {"success": False, "output": None, "error": e.stderr}
+        await get_livekit_api(LIVEKIT_URL, LIVEKIT_API_KEY, LIVEKIT_API_SECRET)
+        dispatch = await create_agent_dispatch(room_name, agent_name, metadata)
+        return {"success": True, "output": str(dispatch), "error": None, "room": dispatch.room or room_name}
+    except Exception as e:
+        return {"success": False, "output": None, "error": str(e), "room": None}
 
 if __name__ == "__main__":
     # Set up argument parser
@@ -44,11 +45,11 @@ if __name__ == "__main__":
     # Parse arguments
     args = parser.parse_args()
     
-    # Run the dispatch command
-    result = run_livekit_dispatch(args.name, args.contact, args.agent)
+    # Run the dispatch
+    result = asyncio.run(run_livekit_dispatch(args.name, args.contact, args.agent))
     
     if result["success"]:
         print("Command executed successfully!")
         print("Output:", result["output"])
     else:
-        print("Error executing command:", result["error"])
\ No newline at end of file
+        print("Error executing command:", result["error"])
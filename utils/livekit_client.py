@@ -0,0 +1,146 @@
+import asyncio
+import json
+import logging
+import time
+from datetime import timedelta
+
+import aiohttp
+from livekit import api
+
+from utils.metrics import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+# One LiveKitAPI (and so one keep-alive aiohttp session) per process and event loop
+_livekit_api = None
+_livekit_api_loop = None
+_livekit_api_credentials = None
+
+LIVEKIT_API_TIMEOUT = aiohttp.ClientTimeout(total=10)
+
+# Participant tokens are short-lived: they are only needed to join
+PARTICIPANT_TOKEN_TTL = timedelta(minutes=10)
+
+dispatch_latency = LatencyHistogram("livekit_agent_dispatch", "Agent dispatch request latency")
+dispatch_stats = {"requests": 0, "errors": 0}
+room_create_latency = LatencyHistogram("livekit_room_create", "Room creation request latency")
+room_create_stats = {"requests": 0, "errors": 0}
+
+
+async def get_livekit_api(url=None, api_key=None, api_secret=None):
+    """
+    Return the process-wide LiveKit API client, creating it on first use.
+
+    Missing credentials fall back to the LIVEKIT_URL / LIVEKIT_API_KEY /
+    LIVEKIT_API_SECRET environment variables. The client is rebuilt if it was
+    created on a different event loop (e.g. in a forked worker) or with
+    different explicit credentials; the previous client is closed first.
+    """
+    global _livekit_api, _livekit_api_loop, _livekit_api_credentials
+
+    loop = asyncio.get_running_loop()
+    credentials = (url, api_key, api_secret)
+    new_credentials = any(credentials) and credentials != _livekit_api_credentials
+    if _livekit_api is None or _livekit_api_loop is not loop or new_credentials:
+        if _livekit_api is not None:
+            try:
+                await _livekit_api.aclose()
+            except Exception as e:
+                # A client from a closed loop cannot always be closed cleanly
+                logger.warning(f"⚠️ Error closing previous LiveKit API client: {e}")
+        _livekit_api = api.LiveKitAPI(url, api_key, api_secret, timeout=LIVEKIT_API_TIMEOUT)
+        _livekit_api_loop = loop
+        _livekit_api_credentials = credentials
+        logger.info("🔌 Created shared LiveKit API client")
+    return _livekit_api
+
+
+async def close_livekit_api():
+    """Close the shared client (call on shutdown)"""
+    global _livekit_api, _livekit_api_loop, _livekit_api_credentials
+
+    if _livekit_api is not None:
+        await _livekit_api.aclose()
+        _livekit_api = None
+        _livekit_api_loop = None
+        _livekit_api_credentials = None
+
+
+async def create_agent_dispatch(room_name, agent_name, metadata):
+    """
+    Dispatch an agent into a room over the shared client and wait for the result.
+
+    Raises on failure; latency of every attempt is recorded in dispatch_latency.
+    """
+    lkapi = await get_livekit_api()
+    if not isinstance(metadata, str):
+        metadata = json.dumps(metadata)
+
+    dispatch_stats["requests"] += 1
+    start = time.perf_counter()
+    try:
+        return await lkapi.agent_dispatch.create_dispatch(
+            api.CreateAgentDispatchRequest(agent_name=agent_name, room=room_name, metadata=metadata)
+        )
+    except Exception:
+        dispatch_stats["errors"] += 1
+        raise
+    finally:
+        dispatch_latency.observe((time.perf_counter() - start) * 1000)
+
+
+async def create_room(room_name, empty_timeout=None):
+    """Create a room over the shared client; raises on failure (e.g. it already exists)"""
+    lkapi = await get_livekit_api()
+    request = api.CreateRoomRequest(name=room_name)
+    if empty_timeout is not None:
+        request.empty_timeout = empty_timeout
+
+    room_create_stats["requests"] += 1
+    start = time.perf_counter()
+    try:
+        return await lkapi.room.create_room(request)
+    except Exception:
+        room_create_stats["errors"] += 1
+        raise
+    finally:
+        room_create_latency.observe((time.perf_counter() - start) * 1000)
+
+
+async def update_room_metadata(room_name, metadata):
+    """Replace a room's metadata (used to hand a call's context to an already-dispatched agent)"""
+    lkapi = await get_livekit_api()
+    if not isinstance(metadata, str):
+        metadata = json.dumps(metadata)
+    return await lkapi.room.update_room_metadata(
+        api.UpdateRoomMetadataRequest(room=room_name, metadata=metadata)
+    )
+
+
+async def delete_room(room_name):
+    """Delete a room, disconnecting everyone in it"""
+    lkapi = await get_livekit_api()
+    return await lkapi.room.delete_room(api.DeleteRoomRequest(room=room_name))
+
+
+def get_participant_token(room_name, identity, name, api_key=None, api_secret=None):
+    """
+    Mint a short-lived join token scoped to room_name.
+
+    Minting is a local JWT signature with no network round trip, so there is
+    nothing to gain from caching (every call has a fresh room and identity).
+    """
+    return (api.AccessToken(api_key, api_secret)
+            .with_identity(identity)
+            .with_name(name)
+            .with_ttl(PARTICIPANT_TOKEN_TTL)
+            .with_grants(api.VideoGrants(room_join=True, room=room_name))
+            .to_jwt())
+
+
+def control_plane_counters():
+    """Request counters; the latencies are in dispatch_latency and room_create_latency"""
+    return {
+        "agent_dispatch": dict(dispatch_stats),
+        "room_create": dict(room_create_stats),
+    }
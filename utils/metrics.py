@@ -0,0 +1,100 @@
+import bisect
+
+# Default latency buckets in milliseconds (upper bounds; a final +Inf bucket is implicit)
+DEFAULT_LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram in milliseconds.
+
+    Meant to be updated from a single event loop: observe() is a bisect and a few
+    integer adds, with no locks or allocation, so it is safe on hot paths.
+    """
+
+    def __init__(self, name, description, buckets_ms=DEFAULT_LATENCY_BUCKETS_MS):
+        self.name = name
+        self.description = description
+        self.buckets = tuple(buckets_ms)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value_ms):
+        self.counts[bisect.bisect_left(self.buckets, value_ms)] += 1
+        self.count += 1
+        self.sum += value_ms
+
+    def state(self):
+        """Bucket counts, count and sum as plain JSON values (for combining histograms across processes)"""
+        return {"counts": list(self.counts), "count": self.count, "sum": self.sum}
+
+    def merge(self, state):
+        """Add another process's state() of a histogram with the same buckets"""
+        for i, bucket_count in enumerate(state["counts"]):
+            self.counts[i] += bucket_count
+        self.count += state["count"]
+        self.sum += state["sum"]
+
+    def empty_copy(self):
+        return LatencyHistogram(self.name, self.description, self.buckets)
+
+    def quantile(self, q):
+        """Estimate a quantile by linear interpolation inside the bucket that holds it"""
+        if not self.count:
+            return 0.0
+
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return float(self.buckets[-1])
+
+    def prometheus_lines(self, name, labels=""):
+        """Prometheus text-format histogram samples, converted to seconds"""
+        prefix = f"{labels}," if labels else ""
+        lines = []
+        cumulative = 0
+        for upper, bucket_count in zip(self.buckets, self.counts):
+            cumulative += bucket_count
+            lines.append(f'{name}_bucket{{{prefix}le="{upper / 1000:g}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{prefix}le="+Inf"}} {self.count}')
+        label_set = f"{{{labels}}}" if labels else ""
+        lines.append(f"{name}_sum{label_set} {self.sum / 1000:.6f}")
+        lines.append(f"{name}_count{label_set} {self.count}")
+        return lines
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "mean_ms": (self.sum / self.count) if self.count else 0.0,
+            "p50_ms": self.quantile(0.50),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+        }
+
+
+def render_counter(name, description, value):
+    return f"# HELP {name} {description}\n# TYPE {name} counter\n{name} {value}\n"
+
+
+def render_gauge(name, description, value):
+    return f"# HELP {name} {description}\n# TYPE {name} gauge\n{name} {value}\n"
+
+
+def render_histogram(name, description, histogram):
+    lines = [f"# HELP {name} {description}", f"# TYPE {name} histogram"]
+    lines.extend(histogram.prometheus_lines(name))
+    return "\n".join(lines) + "\n"
+
+
+def render_histogram_family(name, description, histograms, label):
+    """Prometheus text for several histograms sharing one metric name, keyed by label value"""
+    lines = [f"# HELP {name} {description}", f"# TYPE {name} histogram"]
+    for label_value, histogram in histograms.items():
+        lines.extend(histogram.prometheus_lines(name, f'{label}="{label_value}"'))
+    return "\n".join(lines) + "\n"